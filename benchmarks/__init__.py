@@ -0,0 +1,4 @@
+"""Benchmarks package - Mesures de performance sur données synthétiques
+
+Usage : python -m benchmarks.run --help
+"""
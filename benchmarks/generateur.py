@@ -0,0 +1,95 @@
+"""
+Générateur de données synthétiques
+Les données passent par les modèles, comme celles saisies dans l'application
+(prix figés, synthèse journalière, caches)
+"""
+
+import random
+from calendar import monthrange
+from datetime import date, timedelta
+
+from config.database import DatabaseConnection
+from models import ArticleModel, VenteModel, ChargeModel, ChargeFixeModel, SalaireModel
+
+
+DESCRIPTIONS_CHARGES = ['Lait', 'Sucre', 'Pain', 'Gaz', 'Glace', 'Fruits', 'Nettoyage', 'Transport']
+
+
+def generer(annees=2, articles=40, charges_par_jour=2, salaries=4, fin=None, graine=42):
+    """Remplir la base avec un historique synthétique reproductible
+
+    Args:
+        annees: Nombre d'années d'historique
+        articles: Nombre d'articles au catalogue
+        charges_par_jour: Nombre moyen de dépenses par jour
+        salaries: Nombre d'employés payés chaque mois
+        fin: Dernier jour généré (aujourd'hui par défaut)
+        graine: Graine du générateur aléatoire
+
+    Returns:
+        Dictionnaire des volumes générés
+    """
+    rng = random.Random(graine)
+    fin = fin or date.today()
+    debut = fin - timedelta(days=int(365 * annees) - 1)
+
+    db = DatabaseConnection()
+    article_model, vente_model = ArticleModel(), VenteModel()
+    charge_model, charge_fixe_model, salaire_model = ChargeModel(), ChargeFixeModel(), SalaireModel()
+
+    catalogue = {}
+    for numero in range(1, articles + 1):
+        prix_achat = round(rng.uniform(0.3, 5), 2)
+        prix_vente = round(prix_achat * rng.uniform(1.5, 3), 2)
+        article_id = article_model.create(f"Article {numero:03d}", prix_achat, prix_vente)
+        catalogue[article_id] = (f"Article {numero:03d}", prix_achat, prix_vente)
+
+    volumes = {'articles': articles, 'jours': 0, 'ventes': 0, 'charges': 0, 'salaires': 0, 'mois': 0}
+    mois = debut.replace(day=1)
+
+    while mois <= fin:
+        premier = max(mois, debut)
+        dernier = min(mois.replace(day=monthrange(mois.year, mois.month)[1]), fin)
+
+        # Un mois par transaction : chargement rapide, comme une grosse saisie
+        with db.transaction():
+            charge_fixe_model.save(
+                mois,
+                rng.choice([800, 900, 1000]), round(rng.uniform(80, 200), 2),
+                round(rng.uniform(20, 60), 2), 50, 30, 100, 45, 0, ''
+            )
+            for numero in range(1, salaries + 1):
+                salaire_model.create(mois, f"Employé {numero}", rng.choice([500, 600, 700]))
+                volumes['salaires'] += 1
+
+            jour = premier
+            while jour <= dernier:
+                lignes = [
+                    (jour, article_id, rng.randint(1, 60))
+                    for article_id in catalogue
+                    if rng.random() < 0.7
+                ]
+                vente_model.save_many(lignes)
+                volumes['ventes'] += len(lignes)
+
+                for _ in range(rng.randint(0, 2 * charges_par_jour)):
+                    charge_model.create(jour, rng.choice(DESCRIPTIONS_CHARGES), round(rng.uniform(2, 40), 2))
+                    volumes['charges'] += 1
+
+                volumes['jours'] += 1
+                jour += timedelta(days=1)
+
+        # Révision de prix trimestrielle : les ventes passées gardent leurs prix
+        if mois.month % 3 == 0:
+            for article_id in rng.sample(sorted(catalogue), max(1, articles // 5)):
+                nom, prix_achat, prix_vente = catalogue[article_id]
+                prix_achat, prix_vente = round(prix_achat * 1.05, 2), round(prix_vente * 1.05, 2)
+                article_model.update(article_id, nom, prix_achat, prix_vente)
+                catalogue[article_id] = (nom, prix_achat, prix_vente)
+
+        volumes['mois'] += 1
+        mois = (mois + timedelta(days=32)).replace(day=1)
+
+    volumes['debut'] = debut.isoformat()
+    volumes['fin'] = fin.isoformat()
+    return volumes
@@ -0,0 +1,242 @@
+"""
+Banc d'essai des chemins critiques
+Génère une base synthétique, chronomètre les lectures réelles de l'application
+et écrit un rapport JSON comparable d'une exécution à l'autre
+
+    python -m benchmarks.run --engine sqlite --annees 2
+    python -m benchmarks.run --comparer benchmarks/resultats/precedent.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+
+RESULTATS_FOLDER = Path(__file__).parent / 'resultats'
+
+
+def parse_args():
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Banc d'essai Sultan Ahmed")
+    parser.add_argument('--engine', choices=('sqlite', 'mysql'), default='sqlite',
+                        help="Moteur mesuré (mysql : base locale dédiée, recréée)")
+    parser.add_argument('--mysql-database', default='sultanahmed_bench',
+                        help="Base MySQL dédiée au banc d'essai (supprimée puis recréée)")
+    parser.add_argument('--annees', type=float, default=2, help="Années d'historique générées")
+    parser.add_argument('--articles', type=int, default=40, help="Articles au catalogue")
+    parser.add_argument('--charges-par-jour', type=int, default=2, help="Dépenses moyennes par jour")
+    parser.add_argument('--salaries', type=int, default=4, help="Employés payés chaque mois")
+    parser.add_argument('--repetitions', type=int, default=7, help="Mesures par scénario")
+    parser.add_argument('--sortie', help="Fichier JSON du rapport (par défaut dans benchmarks/resultats/)")
+    parser.add_argument('--comparer', help="Rapport JSON précédent à comparer")
+    return parser.parse_args()
+
+
+def preparer_base(args, dossier):
+    """Diriger l'application vers une base dédiée (avant tout import de config)"""
+    os.environ['SULTAN_DB_ENGINE'] = args.engine
+    os.environ['SULTAN_DATA_DIR'] = dossier
+
+    if args.engine == 'mysql':
+        if args.mysql_database == 'sultanahmed':
+            raise ValueError("Le banc d'essai ne doit pas utiliser la base de production")
+        os.environ['SULTAN_DB_NAME'] = args.mysql_database
+
+        import mysql.connector
+        from config.settings import DB_CONFIG
+
+        serveur = {cle: valeur for cle, valeur in DB_CONFIG.items() if cle != 'database'}
+        connection = mysql.connector.connect(**serveur)
+        cursor = connection.cursor()
+        cursor.execute(f"DROP DATABASE IF EXISTS `{args.mysql_database}`")
+        cursor.execute(f"CREATE DATABASE `{args.mysql_database}` CHARACTER SET utf8mb4")
+        cursor.close()
+        connection.close()
+
+
+def scenarios(dossier, volumes):
+    """Chemins critiques mesurés : nom -> (préparation, appel)"""
+    from controllers import BilanController, VenteController
+    from models import VenteModel, ArticleModel
+    from utils.export import ecrire_historique_csv, construire_bilan_pdf
+
+    vente_model = VenteModel()
+    bilan_controller = BilanController()
+    vente_controller = VenteController()
+
+    fin = date.fromisoformat(volumes['fin'])
+    debut = date.fromisoformat(volumes['debut'])
+    mois = fin.replace(day=1)
+    quantites = {
+        article['id']: {'quantite': 10, 'prix_achat': article['prix_achat'], 'prix_vente': article['prix_vente']}
+        for article in ArticleModel().get_all()
+    }
+
+    def vider_caches():
+        BilanController._cache.invalidate()
+        VenteController._charges_mensuelles_cache.invalidate()
+        VenteController._charges_jours_cache.invalidate()
+
+    def export_pdf():
+        bilan = bilan_controller.get_bilan_complet(mois)
+        financier = bilan_controller.calculate_bilan_financier(bilan)
+        charges_fixes = bilan_controller.get_charges_fixes_mois(mois)
+        construire_bilan_pdf(
+            os.path.join(dossier, 'bilan.pdf'), mois,
+            [(a['nom'], a['quantite_totale'], '', a['total_vente']) for a in bilan['quantites_articles']],
+            [(d['date_charge'], d['description'], d['montant']) for d in bilan['depenses_journalieres']],
+            financier,
+            charges_fixes
+        )
+
+    liste = {
+        'historique_90_jours': (None, lambda: vente_model.get_historique(90)),
+        'historique_page_profonde': (None, lambda: vente_controller.get_historique_page(
+            debut, fin, max(debut, fin - timedelta(days=365)), 100
+        )),
+        'feuille_jour': (None, lambda: vente_controller.get_feuille_jour(fin)),
+        'bilan_mois_froid': (vider_caches, lambda: bilan_controller.get_bilan_complet(mois)),
+        'bilan_mois_cache': (None, lambda: bilan_controller.get_bilan_complet(mois)),
+        'totaux_jour_froid': (vider_caches, lambda: vente_controller.calculate_totaux_jour(fin, quantites)),
+        'totaux_jour_cache': (None, lambda: vente_controller.calculate_totaux_jour(fin, quantites)),
+        'export_historique_csv': (None, lambda: ecrire_historique_csv(
+            os.path.join(dossier, 'historique.csv'), debut, fin, vente_controller.iter_historique_lots(debut, fin)
+        )),
+    }
+
+    try:
+        import reportlab  # noqa: F401 - export PDF optionnel
+        liste['export_bilan_pdf'] = (None, export_pdf)
+    except ImportError:
+        print("reportlab absent : scénario export_bilan_pdf ignoré")
+
+    from controllers import AnalyticsController, PrevisionController
+    if AnalyticsController.disponible():
+        analytics_controller = AnalyticsController()
+        prevision_controller = PrevisionController()
+
+        def vider_caches_analyses():
+            AnalyticsController._cache.invalidate()
+            PrevisionController._cache.invalidate()
+
+        liste['tendances_articles_froid'] = (
+            AnalyticsController._cache.invalidate,
+            lambda: analytics_controller.get_tendances_articles(fin.replace(day=1), fin)
+        )
+        liste['evolution_mensuelle'] = (
+            AnalyticsController._cache.invalidate,
+            lambda: analytics_controller.get_evolution_mensuelle(debut, fin)
+        )
+        liste['previsions_jour_froid'] = (
+            vider_caches_analyses,
+            lambda: prevision_controller.get_previsions_jour(fin)
+        )
+    else:
+        print("numpy absent : scénarios d'analyse ignorés")
+
+    return liste
+
+
+def mesurer_scenario(preparation, appel, repetitions):
+    """Chronométrer un scénario (une exécution d'échauffement non comptée)"""
+    from utils.instrumentation import QueryStats
+
+    if preparation:
+        preparation()
+    appel()
+
+    durees, requetes = [], []
+    for _ in range(repetitions):
+        if preparation:
+            preparation()
+        with QueryStats().capture() as capture:
+            debut = time.perf_counter()
+            appel()
+            durees.append((time.perf_counter() - debut) * 1000)
+        requetes.append(len(capture))
+
+    durees_triees = sorted(durees)
+    return {
+        'repetitions': repetitions,
+        'min_ms': durees_triees[0],
+        'mediane_ms': statistics.median(durees),
+        'p95_ms': durees_triees[min(len(durees) - 1, int(round(0.95 * len(durees))) - 1)],
+        'moyenne_ms': statistics.mean(durees),
+        'requetes': max(requetes),
+    }
+
+
+def comparer(rapport, precedent):
+    """Tableau des écarts de médiane avec un rapport précédent"""
+    lignes = [f"{'Scénario':<26} {'Avant (ms)':>11} {'Après (ms)':>11} {'Écart':>8} {'Requêtes':>10}"]
+    for nom, mesure in rapport['resultats'].items():
+        ancien = precedent['resultats'].get(nom)
+        if ancien is None:
+            lignes.append(f"{nom:<26} {'-':>11} {mesure['mediane_ms']:>11.2f} {'nouveau':>8}")
+            continue
+        ecart = (mesure['mediane_ms'] - ancien['mediane_ms']) / ancien['mediane_ms'] * 100 if ancien['mediane_ms'] else 0
+        lignes.append(
+            f"{nom:<26} {ancien['mediane_ms']:>11.2f} {mesure['mediane_ms']:>11.2f} {ecart:>+7.1f}% "
+            f"{ancien['requetes']:>4} → {mesure['requetes']:<4}"
+        )
+    if precedent['volumes'] != rapport['volumes'] or precedent['engine'] != rapport['engine']:
+        lignes.append("⚠️  Volumes ou moteur différents : comparaison indicative")
+    return '\n'.join(lignes)
+
+
+def main():
+    """Point d'entrée du banc d'essai"""
+    args = parse_args()
+    dossier = tempfile.mkdtemp(prefix='sultan_bench_')
+    preparer_base(args, dossier)
+
+    from benchmarks.generateur import generer
+
+    print(f"Génération des données ({args.engine}, {args.annees} an(s))...")
+    debut = time.perf_counter()
+    volumes = generer(
+        annees=args.annees,
+        articles=args.articles,
+        charges_par_jour=args.charges_par_jour,
+        salaries=args.salaries,
+    )
+    chargement_s = time.perf_counter() - debut
+    print(f"{volumes['ventes']} ventes, {volumes['charges']} charges en {chargement_s:.1f} s")
+
+    resultats = {}
+    for nom, (preparation, appel) in scenarios(dossier, volumes).items():
+        resultats[nom] = mesurer_scenario(preparation, appel, args.repetitions)
+        print(f"  {nom:<26} médiane {resultats[nom]['mediane_ms']:>9.2f} ms  "
+              f"p95 {resultats[nom]['p95_ms']:>9.2f} ms  {resultats[nom]['requetes']} requête(s)")
+
+    rapport = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'engine': args.engine,
+        'python': platform.python_version(),
+        'plateforme': platform.platform(),
+        'volumes': {cle: valeur for cle, valeur in volumes.items() if cle not in ('debut', 'fin')},
+        'chargement_s': chargement_s,
+        'resultats': resultats,
+    }
+
+    sortie = Path(args.sortie) if args.sortie else (
+        RESULTATS_FOLDER / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{args.engine}.json"
+    )
+    sortie.parent.mkdir(parents=True, exist_ok=True)
+    sortie.write_text(json.dumps(rapport, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"Rapport : {sortie}")
+
+    if args.comparer:
+        precedent = json.loads(Path(args.comparer).read_text(encoding='utf-8'))
+        print(comparer(rapport, precedent))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,4 +2,4 @@
 from .database import DatabaseConnection
 from .settings import *
 
-__all__ = ['DatabaseConnection', 'DB_CONFIG', 'APP_CONFIG', 'CURRENCY']
\ No newline at end of file
+__all__ = ['DatabaseConnection', 'DB_ENGINE', 'DB_CONFIG', 'SQLITE_CONFIG', 'DB_POOL_CONFIG', 'APP_CONFIG', 'CURRENCY']
\ No newline at end of file
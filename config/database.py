@@ -1,128 +1,266 @@
 """
 Gestion de la connexion à la base de données
-Pattern Singleton pour une connexion unique
+Pattern Singleton + pool de connexions thread-safe
 """
 
-import mysql.connector
-from mysql.connector import Error
-from .settings import DB_CONFIG
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from .engines import get_engine
+from .migrations import run_migrations
+from .settings import DB_ENGINE, DB_CONFIG, SQLITE_CONFIG, DB_POOL_CONFIG
+from utils.profiling import StartupProfiler
+
+
+class ConnectionPool:
+    """Pool de connexions thread-safe (emprunt / restitution)"""
+    
+    def __init__(self, factory, is_alive, pool_size, timeout, idle_check):
+        self._factory = factory
+        self._is_alive = is_alive
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.idle_check = idle_check
+        
+        self._idle = deque()   # (connexion, dernière utilisation)
+        self._created = 0
+        self._cond = threading.Condition()
+    
+    def acquire(self):
+        """Emprunter une connexion (attend si le pool est plein)"""
+        deadline = time.monotonic() + self.timeout
+        
+        with self._cond:
+            while True:
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+                if self._created < self.pool_size:
+                    self._created += 1
+                    connection, last_used = None, None
+                    break
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Exception(
+                        f"Aucune connexion disponible après {self.timeout}s "
+                        f"(pool de {self.pool_size} connexions)"
+                    )
+                self._cond.wait(remaining)
+        
+        # Test de vie uniquement pour les connexions restées inactives
+        if connection is not None and time.monotonic() - last_used > self.idle_check:
+            if not self._is_alive(connection):
+                self._close_quietly(connection)
+                connection = None
+        
+        if connection is None:
+            try:
+                connection = self._factory()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        
+        return connection
+    
+    def release(self, connection):
+        """Restituer une connexion au pool"""
+        with self._cond:
+            self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+    
+    def discard(self, connection):
+        """Retirer définitivement une connexion défectueuse"""
+        self._close_quietly(connection)
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+    
+    def close_all(self):
+        """Fermer toutes les connexions inactives"""
+        with self._cond:
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._close_quietly(connection)
+                self._created -= 1
+            self._cond.notify_all()
+    
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
 
 
 class DatabaseConnection:
-    """Singleton pour la connexion MySQL"""
+    """Singleton d'accès au pool de connexions du moteur configuré
+    
+    Chaque thread reçoit sa propre connexion : le thread de l'interface et les
+    traitements en arrière-plan ne partagent jamais un curseur.
+    """
     
     _instance = None
-    _connection = None
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._pool = None
+                    instance._local = threading.local()
+                    instance.engine = get_engine(
+                        DB_ENGINE, SQLITE_CONFIG if DB_ENGINE == 'sqlite' else DB_CONFIG
+                    )
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
-        if self._connection is None or not self._connection.is_connected():
-            self.connect()
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self.connect()
     
     def connect(self):
-        """Établir la connexion"""
+        """Créer le pool et appliquer les migrations en attente (une fois par processus)"""
+        pool = ConnectionPool(
+            factory=self.engine.connect,
+            is_alive=self.engine.is_alive,
+            pool_size=DB_POOL_CONFIG['pool_size'],
+            timeout=DB_POOL_CONFIG['timeout'],
+            idle_check=DB_POOL_CONFIG['idle_check'],
+        )
+        profiler = StartupProfiler()
+        with profiler.etape(f"Connexion {self.engine.label}"):
+            connection = pool.acquire()
         try:
-            self._connection = mysql.connector.connect(**DB_CONFIG)
-            if self._connection.is_connected():
-                self._create_tables()
-                return True
-        except Error as e:
-            raise Exception(f"Erreur connexion MySQL: {e}")
+            with profiler.etape("Schéma (migrations)"):
+                run_migrations(self.engine, connection)
+        finally:
+            pool.release(connection)
+        self._pool = pool
+        return True
     
     def get_connection(self):
-        """Retourner la connexion active"""
-        if not self._connection or not self._connection.is_connected():
-            self.connect()
-        return self._connection
-    
-    def test_connection(self):
-        """Tester la connexion"""
-        try:
-            conn = self.get_connection()
-            return conn.is_connected()
-        except:
-            return False
-    
-    def _create_tables(self):
-        """Créer les tables si elles n'existent pas"""
-        cursor = self._connection.cursor()
+        """Retourner la connexion du thread courant"""
+        connection = getattr(self._local, 'connection', None)
         
-        # Table articles
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                nom VARCHAR(255) NOT NULL,
-                prix_achat DECIMAL(10, 2) NOT NULL,
-                prix_vente DECIMAL(10, 2) NOT NULL,
-                actif BOOLEAN DEFAULT TRUE,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        if connection is not None:
+            # Test de vie seulement si la connexion est restée inactive
+            if time.monotonic() - self._local.last_used > self._pool.idle_check:
+                if not self.engine.is_alive(connection):
+                    self._pool.discard(connection)
+                    connection = None
         
-        # Table ventes
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ventes (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                date_vente DATE NOT NULL,
-                article_id INT NOT NULL,
-                quantite INT NOT NULL DEFAULT 0,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
-                UNIQUE KEY unique_vente (date_vente, article_id)
-            )
-        """)
+        if connection is None:
+            connection = self._pool.acquire()
+            self._local.connection = connection
         
-        # Table charges journalières
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS charges (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                date_charge DATE NOT NULL,
-                description VARCHAR(255) NOT NULL,
-                montant DECIMAL(10, 2) NOT NULL,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_date (date_charge)
-            )
-        """)
+        self._local.last_used = time.monotonic()
+        return connection
+    
+    def release_connection(self):
+        """Rendre au pool la connexion du thread courant"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            self._local.connection = None
+            self._pool.release(connection)
+    
+    @contextmanager
+    def connection(self):
+        """Emprunter une connexion pour la durée d'un traitement
         
-        # Table charges fixes mensuelles
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS charges_fixes_mensuelles (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                mois DATE NOT NULL,
-                loyer DECIMAL(10, 2) DEFAULT 0,
-                electricite DECIMAL(10, 2) DEFAULT 0,
-                eau DECIMAL(10, 2) DEFAULT 0,
-                impot DECIMAL(10, 2) DEFAULT 0,
-                municipalite DECIMAL(10, 2) DEFAULT 0,
-                terrasse DECIMAL(10, 2) DEFAULT 0,
-                internet DECIMAL(10, 2) DEFAULT 0,
-                autres DECIMAL(10, 2) DEFAULT 0,
-                autres_description TEXT,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_mois (mois)
-            )
-        """)
+        Les modèles utilisés dans le bloc partagent cette connexion ; elle est
+        rendue au pool à la sortie (sauf si le thread en possédait déjà une).
+        """
+        owned = getattr(self._local, 'connection', None) is None
+        connection = self.get_connection()
+        try:
+            yield connection
+        finally:
+            if owned:
+                self.release_connection()
+    
+    @contextmanager
+    def transaction(self):
+        """Regrouper plusieurs écritures dans une seule transaction
         
-        # Table salaires
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS salaires_mensuels (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                mois DATE NOT NULL,
-                nom_employe VARCHAR(255) NOT NULL,
-                montant DECIMAL(10, 2) NOT NULL,
-                date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                INDEX idx_mois (mois)
-            )
-        """)
+        Validation unique à la sortie du bloc, annulation complète en cas
+        d'exception. Les blocs imbriqués rejoignent la transaction englobante.
+        """
+        with self.connection() as connection:
+            depth = getattr(self._local, 'depth', 0)
+            if depth == 0:
+                self.engine.begin(connection)
+                self._local.after_commit = []
+            self._local.depth = depth + 1
+            try:
+                yield connection
+            except Exception:
+                self._local.depth = depth
+                if depth == 0:
+                    self._local.after_commit = []
+                    connection.rollback()
+                raise
+            self._local.depth = depth
+            if depth == 0:
+                connection.commit()
+                callbacks, self._local.after_commit = self._local.after_commit, []
+                for callback in callbacks:
+                    callback()
+    
+    @contextmanager
+    def dedicated_connection(self):
+        """Emprunter une connexion distincte de celle du thread
         
-        self._connection.commit()
-        cursor.close()
+        Pour les lectures en flux : la connexion reste occupée tant que le
+        résultat n'est pas lu, les autres requêtes du thread n'y passent pas.
+        Les écritures non validées du thread n'y sont pas visibles.
+        """
+        connection = self._pool.acquire()
+        defectueuse = False
+        try:
+            yield connection
+        except Exception:
+            defectueuse = True
+            raise
+        finally:
+            # Une erreur peut laisser un résultat non lu : la connexion est écartée
+            if defectueuse:
+                self._pool.discard(connection)
+            else:
+                self._pool.release(connection)
+    
+    def in_transaction(self):
+        """Le thread courant est-il dans un bloc transaction() ?"""
+        return getattr(self._local, 'depth', 0) > 0
+    
+    def after_commit(self, callback):
+        """Exécuter callback une fois les écritures en cours validées
+        
+        Immédiatement hors transaction, sinon après le commit de la
+        transaction englobante (abandonné en cas d'annulation).
+        """
+        if self.in_transaction():
+            self._local.after_commit.append(callback)
+        else:
+            callback()
+    
+    def test_connection(self):
+        """Tester la connexion"""
+        try:
+            with self.connection() as conn:
+                return self.engine.is_alive(conn)
+        except:
+            return False
     
     def close(self):
-        """Fermer la connexion"""
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
\ No newline at end of file
+        """Fermer les connexions"""
+        self.release_connection()
+        if self._pool is not None:
+            self._pool.close_all()
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+Moteurs de stockage - MySQL (serveur) ou SQLite (fichier local)
+Pattern Strategy : les modèles ne dépendent que de cette interface
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+
+class StorageEngine:
+    """Interface commune des moteurs de stockage"""
+    
+    name = None
+    label = None
+    
+    def connect(self):
+        """Ouvrir une nouvelle connexion physique"""
+        raise NotImplementedError
+    
+    def is_alive(self, connection):
+        """Vérifier qu'une connexion est toujours utilisable"""
+        raise NotImplementedError
+    
+    def cursor(self, connection, dictionary=False):
+        """Créer un curseur (lignes en dict si dictionary=True)"""
+        raise NotImplementedError
+    
+    def upsert_query(self, table, columns, keys, updates, nb_lignes=1, ligne=None):
+        """Requête INSERT ou mise à jour si la clé unique existe déjà
+        
+        Args:
+            table: Nom de la table
+            columns: Colonnes insérées (une valeur %s par colonne)
+            keys: Colonnes de la contrainte d'unicité
+            updates: Colonnes mises à jour en cas de doublon
+            nb_lignes: Nombre de lignes insérées par la même requête
+            ligne: Expressions d'une ligne si ce ne sont pas uniquement des %s
+        """
+        raise NotImplementedError
+    
+    @staticmethod
+    def _values_clause(columns, nb_lignes, ligne=None):
+        ligne = ligne or '(' + ', '.join(['%s'] * len(columns)) + ')'
+        return ', '.join([ligne] * nb_lignes)
+    
+    def begin(self, connection):
+        """Démarrer une transaction explicite"""
+        raise NotImplementedError
+    
+    @contextmanager
+    def sans_cles_etrangeres(self, connection):
+        """Suspendre le contrôle des clés étrangères (reconstruction de tables)"""
+        yield
+    
+    def erreur_de_donnees(self, erreur):
+        """Vrai si la base refuse les valeurs écrites (contrainte, type)
+        
+        Réessayer la même écriture échouera encore ; les autres erreurs
+        (connexion perdue, base verrouillée) peuvent être passagères.
+        """
+        return False
+    
+    def explain(self, connection, query, params):
+        """Plan d'exécution d'une requête
+        
+        Returns:
+            Liste de dict {'table': nom ou alias (None pour une étape sans table),
+            'scan': parcours complet, 'index': un index est utilisé, 'detail': description}
+        """
+        raise NotImplementedError
+    
+    def stream_cursor(self, connection):
+        """Curseur non bufferisé : les lignes restent côté serveur jusqu'à leur lecture"""
+        return self.cursor(connection)
+    
+    def close_stream(self, connection, cursor):
+        """Fermer un curseur de flux, même s'il n'a pas été lu jusqu'au bout"""
+        cursor.close()
+    
+    def execute_batch(self, connection, requetes):
+        """Exécuter plusieurs SELECT en un seul aller-retour si le moteur le permet
+        
+        Args:
+            requetes: Liste de tuples (requête, paramètres)
+        
+        Returns:
+            Liste des lignes (dict) de chaque requête, dans l'ordre
+        """
+        resultats = []
+        for query, params in requetes:
+            cursor = self.cursor(connection, dictionary=True)
+            cursor.execute(query, params)
+            resultats.append(cursor.fetchall())
+            cursor.close()
+        return resultats
+
+
+# ==================== MYSQL ====================
+
+class MySQLEngine(StorageEngine):
+    """Serveur MySQL / MariaDB (XAMPP)"""
+    
+    name = 'mysql'
+    label = 'MySQL'
+    
+    def __init__(self, config):
+        self.config = config
+    
+    def connect(self):
+        import mysql.connector
+        from mysql.connector import Error
+        
+        try:
+            connection = mysql.connector.connect(**self.config)
+            # Chaque écriture est validée explicitement : en autocommit, les
+            # lectures voient aussi les écritures des autres threads
+            connection.autocommit = True
+            return connection
+        except Error as e:
+            raise Exception(f"Erreur connexion MySQL: {e}")
+    
+    def is_alive(self, connection):
+        return connection.is_connected()
+    
+    def erreur_de_donnees(self, erreur):
+        from mysql.connector import errors
+        return isinstance(erreur, (errors.IntegrityError, errors.DataError))
+    
+    def begin(self, connection):
+        connection.start_transaction()
+    
+    def cursor(self, connection, dictionary=False):
+        return connection.cursor(dictionary=dictionary)
+    
+    def explain(self, connection, query, params):
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute("EXPLAIN " + query, params)
+        plan = cursor.fetchall()
+        cursor.close()
+        return [
+            {
+                'table': ligne['table'],
+                # ALL : table lue en entier ; index : index lu en entier
+                'scan': ligne['type'] in ('ALL', 'index'),
+                'index': ligne['key'] is not None,
+                'detail': f"{ligne['table']}: type={ligne['type']} key={ligne['key']} {ligne['Extra'] or ''}".strip()
+            }
+            for ligne in plan
+        ]
+    
+    def stream_cursor(self, connection):
+        return connection.cursor(buffered=False)
+    
+    def close_stream(self, connection, cursor):
+        # Les lignes non lues bloqueraient la connexion : elles sont consommées
+        if connection.unread_result:
+            connection.consume_results()
+        cursor.close()
+    
+    def execute_batch(self, connection, requetes):
+        # Requêtes multiples : un seul envoi au serveur, un jeu de résultats par requête
+        query = ';\n'.join(query.strip().rstrip(';') for query, _ in requetes)
+        params = tuple(param for _, params in requetes for param in params)
+        
+        cursor = connection.cursor(dictionary=True)
+        try:
+            return [
+                result.fetchall()
+                for result in cursor.execute(query, params, multi=True)
+                if result.with_rows
+            ]
+        finally:
+            cursor.close()
+    
+    def upsert_query(self, table, columns, keys, updates, nb_lignes=1, ligne=None):
+        values = self._values_clause(columns, nb_lignes, ligne)
+        assignments = ', '.join(f"{col} = VALUES({col})" for col in updates)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} "
+            f"ON DUPLICATE KEY UPDATE {assignments}"
+        )
+
+
+# ==================== SQLITE ====================
+
+# Conversions Python <-> SQLite alignées sur ce que renvoie mysql.connector
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' '))
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter('DATE', lambda b: date.fromisoformat(b.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter('DECIMAL', lambda b: Decimal(b.decode()))
+
+
+def _dict_factory(cursor, row):
+    """Ligne SQLite -> dict (équivalent de cursor(dictionary=True))"""
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+
+class _SQLiteCursor:
+    """Curseur SQLite acceptant les requêtes écrites avec des %s"""
+    
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._insert = False
+    
+    def execute(self, query, params=()):
+        self._insert = query.lstrip().upper().startswith('INSERT')
+        self._cursor.execute(query.replace('%s', '?'), params)
+        return self
+    
+    def executemany(self, query, data_list):
+        self._cursor.executemany(query.replace('%s', '?'), data_list)
+        return self
+    
+    @property
+    def lastrowid(self):
+        # SQLite conserve le dernier id inséré sur la connexion : comme MySQL,
+        # on ne le renvoie que pour un INSERT
+        return self._cursor.lastrowid if self._insert else 0
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+    
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class SQLiteEngine(StorageEngine):
+    """Fichier SQLite local (aucun serveur requis)"""
+    
+    name = 'sqlite'
+    label = 'SQLite'
+    
+    def __init__(self, config):
+        self.path = config['path']
+        self.pragmas = config.get('pragmas', {})
+        self.timeout = config.get('timeout', 5)
+    
+    def connect(self):
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                # Le pool garantit qu'un seul thread utilise la connexion à la fois
+                check_same_thread=False,
+                # Autocommit, comme MySQL : les commits explicites restent valides
+                isolation_level=None,
+            )
+            for pragma, value in self.pragmas.items():
+                connection.execute(f"PRAGMA {pragma} = {value}")
+            return connection
+        except sqlite3.Error as e:
+            raise Exception(f"Erreur ouverture SQLite ({self.path}): {e}")
+    
+    def is_alive(self, connection):
+        try:
+            connection.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def begin(self, connection):
+        connection.execute("BEGIN")
+    
+    def erreur_de_donnees(self, erreur):
+        return isinstance(erreur, (sqlite3.IntegrityError, sqlite3.DataError))
+    
+    @contextmanager
+    def sans_cles_etrangeres(self, connection):
+        # Sans effet dans une transaction : à appeler avant begin()
+        actives = connection.execute("PRAGMA foreign_keys").fetchone()[0]
+        connection.execute("PRAGMA foreign_keys = OFF")
+        try:
+            yield
+            violations = connection.execute("PRAGMA foreign_key_check").fetchall()
+            if violations:
+                raise Exception(f"Clés étrangères invalides après migration: {violations[:5]}")
+        finally:
+            connection.execute(f"PRAGMA foreign_keys = {'ON' if actives else 'OFF'}")
+    
+    def explain(self, connection, query, params):
+        plan = connection.execute("EXPLAIN QUERY PLAN " + query.replace('%s', '?'), params).fetchall()
+        etapes = []
+        for ligne in plan:
+            detail = ligne[-1]
+            mots = detail.split()
+            etapes.append({
+                'table': mots[1] if mots[0] in ('SCAN', 'SEARCH') else None,
+                'scan': mots[0] == 'SCAN',
+                'index': 'INDEX' in detail or 'PRIMARY KEY' in detail,
+                'detail': detail
+            })
+        return etapes
+    
+    def cursor(self, connection, dictionary=False):
+        cursor = connection.cursor()
+        if dictionary:
+            cursor.row_factory = _dict_factory
+        return _SQLiteCursor(cursor)
+    
+    def upsert_query(self, table, columns, keys, updates, nb_lignes=1, ligne=None):
+        values = self._values_clause(columns, nb_lignes, ligne)
+        assignments = ', '.join(f"{col} = excluded.{col}" for col in updates)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {assignments}"
+        )
+
+
+ENGINES = {
+    MySQLEngine.name: MySQLEngine,
+    SQLiteEngine.name: SQLiteEngine,
+}
+
+
+def get_engine(name, config):
+    """Instancier le moteur de stockage configuré"""
+    if name not in ENGINES:
+        raise ValueError(f"Moteur de stockage inconnu: {name} (choix: {', '.join(ENGINES)})")
+    return ENGINES[name](config)
\ No newline at end of file
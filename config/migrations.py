@@ -0,0 +1,543 @@
+"""
+Migrations versionnées du schéma
+Chaque migration n'est exécutée qu'une seule fois : la table schema_version
+garde la trace des versions appliquées.
+"""
+
+from utils.logger import get_logger
+
+
+MYSQL_SCHEMA = [
+    # Table articles
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        nom VARCHAR(255) NOT NULL,
+        prix_achat DECIMAL(10, 2) NOT NULL,
+        prix_vente DECIMAL(10, 2) NOT NULL,
+        actif BOOLEAN DEFAULT TRUE,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Table ventes
+    """
+    CREATE TABLE IF NOT EXISTS ventes (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        date_vente DATE NOT NULL,
+        article_id INT NOT NULL,
+        quantite INT NOT NULL DEFAULT 0,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+        UNIQUE KEY unique_vente (date_vente, article_id)
+    )
+    """,
+    # Table charges journalières
+    """
+    CREATE TABLE IF NOT EXISTS charges (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        date_charge DATE NOT NULL,
+        description VARCHAR(255) NOT NULL,
+        montant DECIMAL(10, 2) NOT NULL,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_date (date_charge)
+    )
+    """,
+    # Table charges fixes mensuelles
+    """
+    CREATE TABLE IF NOT EXISTS charges_fixes_mensuelles (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        mois DATE NOT NULL,
+        loyer DECIMAL(10, 2) DEFAULT 0,
+        electricite DECIMAL(10, 2) DEFAULT 0,
+        eau DECIMAL(10, 2) DEFAULT 0,
+        impot DECIMAL(10, 2) DEFAULT 0,
+        municipalite DECIMAL(10, 2) DEFAULT 0,
+        terrasse DECIMAL(10, 2) DEFAULT 0,
+        internet DECIMAL(10, 2) DEFAULT 0,
+        autres DECIMAL(10, 2) DEFAULT 0,
+        autres_description TEXT,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY unique_mois (mois)
+    )
+    """,
+    # Table salaires
+    """
+    CREATE TABLE IF NOT EXISTS salaires_mensuels (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        mois DATE NOT NULL,
+        nom_employe VARCHAR(255) NOT NULL,
+        montant DECIMAL(10, 2) NOT NULL,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_mois (mois)
+    )
+    """,
+]
+
+
+SQLITE_SCHEMA = [
+    # Table articles
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nom VARCHAR(255) NOT NULL,
+        prix_achat DECIMAL(10, 2) NOT NULL,
+        prix_vente DECIMAL(10, 2) NOT NULL,
+        actif BOOLEAN DEFAULT TRUE,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Table ventes
+    """
+    CREATE TABLE IF NOT EXISTS ventes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date_vente DATE NOT NULL,
+        article_id INTEGER NOT NULL,
+        quantite INTEGER NOT NULL DEFAULT 0,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+        CONSTRAINT unique_vente UNIQUE (date_vente, article_id)
+    )
+    """,
+    # Table charges journalières
+    """
+    CREATE TABLE IF NOT EXISTS charges (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date_charge DATE NOT NULL,
+        description VARCHAR(255) NOT NULL,
+        montant DECIMAL(10, 2) NOT NULL,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_date ON charges (date_charge)",
+    # Table charges fixes mensuelles
+    """
+    CREATE TABLE IF NOT EXISTS charges_fixes_mensuelles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mois DATE NOT NULL,
+        loyer DECIMAL(10, 2) DEFAULT 0,
+        electricite DECIMAL(10, 2) DEFAULT 0,
+        eau DECIMAL(10, 2) DEFAULT 0,
+        impot DECIMAL(10, 2) DEFAULT 0,
+        municipalite DECIMAL(10, 2) DEFAULT 0,
+        terrasse DECIMAL(10, 2) DEFAULT 0,
+        internet DECIMAL(10, 2) DEFAULT 0,
+        autres DECIMAL(10, 2) DEFAULT 0,
+        autres_description TEXT,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT unique_mois UNIQUE (mois)
+    )
+    """,
+    # Table salaires
+    """
+    CREATE TABLE IF NOT EXISTS salaires_mensuels (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mois DATE NOT NULL,
+        nom_employe VARCHAR(255) NOT NULL,
+        montant DECIMAL(10, 2) NOT NULL,
+        date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_mois ON salaires_mensuels (mois)",
+]
+
+
+RESUME_JOURNALIER_TABLE = """
+    CREATE TABLE IF NOT EXISTS resume_journalier (
+        date_jour DATE NOT NULL PRIMARY KEY,
+        recette_brute DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        cout_achat DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        benefice_brut DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        total_charges DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        quantite_totale INT NOT NULL DEFAULT 0
+    )
+"""
+
+# Remplissage précédé d'un vidage : sous MySQL le CREATE TABLE valide à part,
+# une migration interrompue après le remplissage peut être relancée
+RESUME_JOURNALIER_VIDAGE = "DELETE FROM resume_journalier"
+
+RESUME_JOURNALIER_REMPLISSAGE = """
+    INSERT INTO resume_journalier
+        (date_jour, recette_brute, cout_achat, benefice_brut, total_charges, quantite_totale)
+    SELECT
+        j.date_jour,
+        COALESCE(v.recette_brute, 0),
+        COALESCE(v.cout_achat, 0),
+        COALESCE(v.benefice_brut, 0),
+        COALESCE(c.total_charges, 0),
+        COALESCE(v.quantite_totale, 0)
+    FROM (
+        SELECT date_vente as date_jour FROM ventes
+        UNION
+        SELECT date_charge FROM charges
+    ) j
+    LEFT JOIN (
+        SELECT
+            v.date_vente,
+            SUM(v.quantite * a.prix_vente) as recette_brute,
+            SUM(v.quantite * a.prix_achat) as cout_achat,
+            SUM(v.quantite * (a.prix_vente - a.prix_achat)) as benefice_brut,
+            SUM(v.quantite) as quantite_totale
+        FROM ventes v
+        JOIN articles a ON v.article_id = a.id
+        GROUP BY v.date_vente
+    ) v ON v.date_vente = j.date_jour
+    LEFT JOIN (
+        SELECT date_charge, SUM(montant) as total_charges
+        FROM charges
+        GROUP BY date_charge
+    ) c ON c.date_charge = j.date_jour
+"""
+
+
+# Sous MySQL chaque instruction DDL valide implicitement la transaction : une
+# migration interrompue garde ses premières étapes. Les étapes DDL vérifient donc
+# information_schema avant d'agir, pour que la migration puisse être relancée.
+
+def _valeur_texte(valeur):
+    # information_schema peut renvoyer des octets selon le connecteur
+    return valeur.decode() if isinstance(valeur, (bytes, bytearray)) else valeur
+
+
+def _type_colonne(cursor, table, colonne):
+    """Type d'une colonne MySQL en minuscules (None si elle n'existe pas)"""
+    cursor.execute(
+        "SELECT DATA_TYPE FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, colonne)
+    )
+    lignes = cursor.fetchall()
+    return _valeur_texte(lignes[0][0]).lower() if lignes else None
+
+
+def _index_existe(cursor, table, index):
+    """Vrai si l'index MySQL existe sur la table"""
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (table, index)
+    )
+    return cursor.fetchall()[0][0] > 0
+
+
+def _ajouter_colonne_mysql(table, colonne, definition):
+    """Étape ADD COLUMN ignorée si la colonne existe déjà"""
+    def instruction(cursor):
+        if _type_colonne(cursor, table, colonne) is None:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {colonne} {definition}")
+    return instruction
+
+
+def _creer_index_mysql(table, index, colonnes):
+    """Étape CREATE INDEX ignorée si l'index existe déjà"""
+    def instruction(cursor):
+        if not _index_existe(cursor, table, index):
+            cursor.execute(f"CREATE INDEX {index} ON {table} ({colonnes})")
+    return instruction
+
+
+def _supprimer_index_mysql(table, index):
+    """Étape DROP INDEX ignorée si l'index n'existe plus"""
+    def instruction(cursor):
+        if _index_existe(cursor, table, index):
+            cursor.execute(f"DROP INDEX {index} ON {table}")
+    return instruction
+
+
+# Prix unitaires figés sur chaque ligne de vente, initialisés avec les prix actuels
+VENTES_PRIX_MYSQL = [
+    _ajouter_colonne_mysql('ventes', 'prix_achat', "DECIMAL(10, 2) NOT NULL DEFAULT 0"),
+    _ajouter_colonne_mysql('ventes', 'prix_vente', "DECIMAL(10, 2) NOT NULL DEFAULT 0"),
+    """
+    UPDATE ventes v
+    JOIN articles a ON v.article_id = a.id
+    SET v.prix_achat = a.prix_achat, v.prix_vente = a.prix_vente
+    """,
+]
+
+VENTES_PRIX_SQLITE = [
+    "ALTER TABLE ventes ADD COLUMN prix_achat DECIMAL(10, 2) NOT NULL DEFAULT 0",
+    "ALTER TABLE ventes ADD COLUMN prix_vente DECIMAL(10, 2) NOT NULL DEFAULT 0",
+    """
+    UPDATE ventes SET
+        prix_achat = (SELECT prix_achat FROM articles WHERE articles.id = ventes.article_id),
+        prix_vente = (SELECT prix_vente FROM articles WHERE articles.id = ventes.article_id)
+    """,
+]
+
+
+# Index des requêtes de rapport (vérifiés par main.py --check-index)
+#  - ventes par période : agrégats du mois et recalcul de la synthèse sans lire la table
+#  - ventes par article : suppression d'un article, quantités d'un article
+#  - charges par jour : totaux sans lire la table (remplace idx_date)
+INDEX_RAPPORTS_MYSQL = [
+    _creer_index_mysql('ventes', 'idx_ventes_periode', "date_vente, article_id, quantite, prix_vente, prix_achat"),
+    _creer_index_mysql('ventes', 'idx_ventes_article', "article_id, date_vente, quantite"),
+    _creer_index_mysql('charges', 'idx_charges_date_montant', "date_charge, montant"),
+    _supprimer_index_mysql('charges', 'idx_date'),
+]
+
+INDEX_RAPPORTS_SQLITE = [
+    "CREATE INDEX IF NOT EXISTS idx_ventes_periode ON ventes (date_vente, article_id, quantite, prix_vente, prix_achat)",
+    "CREATE INDEX IF NOT EXISTS idx_ventes_article ON ventes (article_id, date_vente, quantite)",
+    "CREATE INDEX IF NOT EXISTS idx_charges_date_montant ON charges (date_charge, montant)",
+    "DROP INDEX IF EXISTS idx_date",
+    "ANALYZE",
+]
+
+
+# Montants en millimes (entiers) : 1 dinar = 1000 millimes
+# table -> (colonne, contrainte)
+MONTANTS_MILLIMES = {
+    'articles': [('prix_achat', 'NOT NULL'), ('prix_vente', 'NOT NULL')],
+    'ventes': [('prix_achat', 'NOT NULL DEFAULT 0'), ('prix_vente', 'NOT NULL DEFAULT 0')],
+    'charges': [('montant', 'NOT NULL')],
+    'charges_fixes_mensuelles': [
+        (colonne, 'DEFAULT 0')
+        for colonne in ('loyer', 'electricite', 'eau', 'impot', 'municipalite', 'terrasse', 'internet', 'autres')
+    ],
+    'salaires_mensuels': [('montant', 'NOT NULL')],
+    'resume_journalier': [
+        (colonne, 'NOT NULL DEFAULT 0')
+        for colonne in ('recette_brute', 'cout_achat', 'benefice_brut', 'total_charges')
+    ],
+}
+
+
+# Étapes déjà validées d'une migration MySQL en cours (reprise après interruption)
+MIGRATION_ETAPES_TABLE = """
+    CREATE TABLE IF NOT EXISTS migration_etapes (
+        version INT NOT NULL,
+        etape VARCHAR(64) NOT NULL,
+        PRIMARY KEY (version, etape)
+    )
+"""
+
+
+def _montants_millimes_mysql(cursor):
+    """Élargir à 3 décimales, multiplier par 1000 puis passer en BIGINT, table par table
+    
+    Chaque ALTER TABLE valide la transaction : une migration interrompue est
+    reprise table par table. Une table déjà en BIGINT est ignorée, et la
+    multiplication d'une table est validée avec l'enregistrement de son étape,
+    pour n'être jamais refaite.
+    """
+    cursor.execute(MIGRATION_ETAPES_TABLE)
+    cursor.execute("SELECT etape FROM migration_etapes WHERE version = %s", (5,))
+    converties = {_valeur_texte(ligne[0]) for ligne in cursor.fetchall()}
+    
+    for table, colonnes in MONTANTS_MILLIMES.items():
+        if all(_type_colonne(cursor, table, colonne) == 'bigint' for colonne, _ in colonnes):
+            continue
+        
+        if table not in converties:
+            cursor.execute(f"ALTER TABLE {table} " + ', '.join(
+                f"MODIFY {colonne} DECIMAL(18, 3) {contrainte}" for colonne, contrainte in colonnes
+            ))
+            # L'ALTER a validé la transaction : la multiplication et son étape en ouvrent une
+            cursor.execute("START TRANSACTION")
+            cursor.execute(f"UPDATE {table} SET " + ', '.join(
+                f"{colonne} = ROUND({colonne} * 1000)" for colonne, _ in colonnes
+            ))
+            cursor.execute("INSERT INTO migration_etapes (version, etape) VALUES (%s, %s)", (5, table))
+            cursor.execute("COMMIT")
+        
+        cursor.execute(f"ALTER TABLE {table} " + ', '.join(
+            f"MODIFY {colonne} BIGINT {contrainte}" for colonne, contrainte in colonnes
+        ))
+
+
+# SQLite ne modifie pas le type d'une colonne : chaque table est reconstruite
+# (clés étrangères suspendues par run_migrations)
+MONTANTS_MILLIMES_SQLITE_TABLES = {
+    'articles': """
+        CREATE TABLE articles_millimes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nom VARCHAR(255) NOT NULL,
+            prix_achat INTEGER NOT NULL,
+            prix_vente INTEGER NOT NULL,
+            actif BOOLEAN DEFAULT TRUE,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'ventes': """
+        CREATE TABLE ventes_millimes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date_vente DATE NOT NULL,
+            article_id INTEGER NOT NULL,
+            quantite INTEGER NOT NULL DEFAULT 0,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            prix_achat INTEGER NOT NULL DEFAULT 0,
+            prix_vente INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (article_id) REFERENCES articles(id) ON DELETE CASCADE,
+            CONSTRAINT unique_vente UNIQUE (date_vente, article_id)
+        )
+    """,
+    'charges': """
+        CREATE TABLE charges_millimes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date_charge DATE NOT NULL,
+            description VARCHAR(255) NOT NULL,
+            montant INTEGER NOT NULL,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'charges_fixes_mensuelles': """
+        CREATE TABLE charges_fixes_mensuelles_millimes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mois DATE NOT NULL,
+            loyer INTEGER DEFAULT 0,
+            electricite INTEGER DEFAULT 0,
+            eau INTEGER DEFAULT 0,
+            impot INTEGER DEFAULT 0,
+            municipalite INTEGER DEFAULT 0,
+            terrasse INTEGER DEFAULT 0,
+            internet INTEGER DEFAULT 0,
+            autres INTEGER DEFAULT 0,
+            autres_description TEXT,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT unique_mois UNIQUE (mois)
+        )
+    """,
+    'salaires_mensuels': """
+        CREATE TABLE salaires_mensuels_millimes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mois DATE NOT NULL,
+            nom_employe VARCHAR(255) NOT NULL,
+            montant INTEGER NOT NULL,
+            date_creation TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'resume_journalier': """
+        CREATE TABLE resume_journalier_millimes (
+            date_jour DATE NOT NULL PRIMARY KEY,
+            recette_brute INTEGER NOT NULL DEFAULT 0,
+            cout_achat INTEGER NOT NULL DEFAULT 0,
+            benefice_brut INTEGER NOT NULL DEFAULT 0,
+            total_charges INTEGER NOT NULL DEFAULT 0,
+            quantite_totale INTEGER NOT NULL DEFAULT 0
+        )
+    """,
+}
+
+MONTANTS_MILLIMES_SQLITE_INDEX = [
+    "CREATE INDEX IF NOT EXISTS idx_ventes_periode ON ventes (date_vente, article_id, quantite, prix_vente, prix_achat)",
+    "CREATE INDEX IF NOT EXISTS idx_ventes_article ON ventes (article_id, date_vente, quantite)",
+    "CREATE INDEX IF NOT EXISTS idx_charges_date_montant ON charges (date_charge, montant)",
+    "CREATE INDEX IF NOT EXISTS idx_mois ON salaires_mensuels (mois)",
+    "ANALYZE",
+]
+
+
+def _montants_millimes_sqlite(cursor):
+    """Reconstruire les tables avec des montants entiers"""
+    for table, creation in MONTANTS_MILLIMES_SQLITE_TABLES.items():
+        montants = {colonne for colonne, _ in MONTANTS_MILLIMES[table]}
+        cursor.execute(f"SELECT * FROM {table} LIMIT 0")
+        colonnes = [col[0] for col in cursor.description]
+        valeurs = [
+            f"CAST(ROUND({colonne} * 1000) AS INTEGER)" if colonne in montants else colonne
+            for colonne in colonnes
+        ]
+        cursor.execute(creation)
+        cursor.execute(
+            f"INSERT INTO {table}_millimes ({', '.join(colonnes)}) "
+            f"SELECT {', '.join(valeurs)} FROM {table}"
+        )
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_millimes RENAME TO {table}")
+    for instruction in MONTANTS_MILLIMES_SQLITE_INDEX:
+        cursor.execute(instruction)
+
+
+# (version, description, instructions par moteur)
+# Une instruction est une requête SQL ou une fonction recevant le curseur.
+# Ne jamais modifier une migration publiée : en ajouter une nouvelle.
+MIGRATIONS = [
+    (1, "Schéma initial", {
+        'mysql': MYSQL_SCHEMA,
+        'sqlite': SQLITE_SCHEMA,
+    }),
+    (2, "Table de synthèse resume_journalier", {
+        'mysql': [RESUME_JOURNALIER_TABLE, RESUME_JOURNALIER_VIDAGE, RESUME_JOURNALIER_REMPLISSAGE],
+        'sqlite': [RESUME_JOURNALIER_TABLE, RESUME_JOURNALIER_VIDAGE, RESUME_JOURNALIER_REMPLISSAGE],
+    }),
+    (3, "Prix figés sur les lignes de vente", {
+        'mysql': VENTES_PRIX_MYSQL,
+        'sqlite': VENTES_PRIX_SQLITE,
+    }),
+    (4, "Index des requêtes de rapport", {
+        'mysql': INDEX_RAPPORTS_MYSQL,
+        'sqlite': INDEX_RAPPORTS_SQLITE,
+    }),
+    (5, "Montants en millimes (entiers)", {
+        'mysql': [_montants_millimes_mysql],
+        'sqlite': [_montants_millimes_sqlite],
+    }),
+]
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        date_application TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def get_schema_version(engine, connection):
+    """Version actuelle du schéma (0 si aucune migration appliquée)"""
+    cursor = engine.cursor(connection)
+    try:
+        cursor.execute("SELECT MAX(version) FROM schema_version")
+        version = cursor.fetchone()[0] or 0
+    except Exception:
+        # Première exécution : la table de suivi n'existe pas encore
+        cursor.execute(SCHEMA_VERSION_TABLE)
+        connection.commit()
+        version = 0
+    cursor.close()
+    return version
+
+
+def run_migrations(engine, connection):
+    """Appliquer les migrations en attente
+    
+    Returns:
+        Liste des versions appliquées (vide si le schéma est à jour)
+    """
+    version_actuelle = get_schema_version(engine, connection)
+    en_attente = [m for m in MIGRATIONS if m[0] > version_actuelle]
+    if not en_attente:
+        return []
+    
+    logger = get_logger()
+    appliquees = []
+    cursor = engine.cursor(connection)
+    
+    # Les reconstructions de tables (SQLite) exigent des clés étrangères suspendues
+    with engine.sans_cles_etrangeres(connection):
+        for version, description, instructions in en_attente:
+            logger.info(f"Migration {version}: {description}")
+            # Sous MySQL, le DDL valide implicitement la transaction ; sous SQLite
+            # la migration entière est atomique
+            engine.begin(connection)
+            try:
+                for instruction in instructions[engine.name]:
+                    if callable(instruction):
+                        instruction(cursor)
+                    else:
+                        cursor.execute(instruction)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (version, description)
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                cursor.close()
+                raise
+            appliquees.append(version)
+    
+    cursor.close()
+    return appliquees
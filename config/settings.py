@@ -2,15 +2,59 @@
 Configuration globale de l'application
 """
 
+import os
+
+# Les variables SULTAN_* permettent de pointer vers une autre base
+# (bancs d'essai, base de test) sans modifier ce fichier
+
+# Moteur de stockage : 'mysql' (serveur XAMPP) ou 'sqlite' (fichier local, sans serveur)
+DB_ENGINE = os.environ.get('SULTAN_DB_ENGINE', 'mysql')
+
+# Dossier des données locales (base SQLite, journal des ventes en attente)
+DATA_FOLDER = os.environ.get('SULTAN_DATA_DIR', 'data')
+
 # Configuration MySQL
 DB_CONFIG = {
     'host': 'localhost',
     'user': 'root',
     'password': '',
-    'database': 'sultanahmed',
+    'database': os.environ.get('SULTAN_DB_NAME', 'sultanahmed'),
     'port': 3306
 }
 
+# Configuration SQLite
+SQLITE_CONFIG = {
+    'path': os.path.join(DATA_FOLDER, 'sultanahmed.db'),
+    'timeout': 5,                   # Attente (s) si la base est verrouillée en écriture
+    'pragmas': {
+        'journal_mode': 'WAL',      # Lectures concurrentes pendant les écritures
+        'synchronous': 'NORMAL',    # Sûr en WAL, bien plus rapide que FULL
+        'foreign_keys': 'ON',       # ON DELETE CASCADE comme MySQL
+        'cache_size': -16000,       # 16 Mo de cache de pages
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,     # 256 Mo lus via mmap
+    },
+}
+
+# Écriture différée des quantités vendues
+WRITE_BUFFER_CONFIG = {
+    'flush_interval': 2.0,                      # Délai (s) avant écriture groupée
+    'journal': os.path.join(DATA_FOLDER, 'ventes_en_attente.jsonl'),  # Journal de secours (rejoué au démarrage)
+}
+
+# Pool de connexions
+DB_POOL_CONFIG = {
+    'pool_size': 5,      # Connexions simultanées maximum
+    'timeout': 10,       # Attente max (s) d'une connexion libre
+    'idle_check': 30,    # Inactivité (s) au-delà de laquelle on teste la connexion
+}
+
+# Instrumentation des requêtes SQL
+INSTRUMENTATION_CONFIG = {
+    'enabled': True,        # Mesurer chaque requête (coût négligeable)
+    'slow_query_ms': 200,   # Seuil (ms) de journalisation des requêtes lentes
+}
+
 # Paramètres de l'application
 APP_CONFIG = {
     'title': '☕ Sultan Ahmed - Gestion Salon de Thé',
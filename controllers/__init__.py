@@ -4,10 +4,16 @@ from .article_controller import ArticleController
 from .vente_controller import VenteController
 from .charge_controller import ChargeController
 from .bilan_controller import BilanController
+from .analytics_controller import AnalyticsController
+from .prevision_controller import PrevisionController
+from .services import ServiceContainer
 
 __all__ = [
     'ArticleController',
     'VenteController',
     'ChargeController',
-    'BilanController'
+    'BilanController',
+    'AnalyticsController',
+    'PrevisionController',
+    'ServiceContainer'
 ]
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Contrôleur Analyses - Tendances des ventes sur plusieurs mois ou années
+Calculs NumPy (optionnel) sur la matrice jour x article de la période
+"""
+
+from datetime import timedelta
+from math import isnan
+
+from models import VenteModel, ArticleModel
+from utils.analytics import (
+    NUMPY_DISPONIBLE, SEMAINE, ANNEE, MatriceVentes,
+    moyenne_mobile, variations, totaux_mensuels
+)
+from utils.cache import PeriodCache
+from utils.money import Money
+from .services import ServiceContainer
+from .vente_buffer import VenteWriteBuffer
+
+
+def _montant(millimes):
+    """Money d'un résultat en millimes (None si non défini)"""
+    return None if isnan(millimes) else Money(round(millimes))
+
+
+def _nombre(valeur, facteur=1):
+    """float d'un résultat (None si non défini)"""
+    return None if isnan(valeur) else float(valeur) * facteur
+
+
+class AnalyticsController:
+    """Indicateurs par article : recette, marge, moyenne mobile, variations
+    d'une semaine à l'autre et d'une année à l'autre"""
+    
+    # Matrices des dernières périodes analysées {(debut, fin): MatriceVentes}
+    _cache = PeriodCache(tables=('ventes', 'articles'), maxsize=4)
+    
+    def __init__(self):
+        services = ServiceContainer()
+        self.vente_model = services.get(VenteModel)
+        self.article_model = services.get(ArticleModel)
+        self.buffer = VenteWriteBuffer()
+    
+    @staticmethod
+    def disponible():
+        """Les analyses demandent numpy"""
+        return NUMPY_DISPONIBLE
+    
+    def get_matrice(self, debut, fin):
+        """Matrice des ventes de la période (en cache jusqu'à la prochaine écriture de la période)"""
+        # Les quantités saisies doivent être en base avant d'agréger
+        self.buffer.flush()
+        
+        periode = (debut, fin)
+        matrice = self._cache.get(periode)
+        if matrice is None:
+            generation = self._cache.generation()
+            matrice = MatriceVentes(debut, fin, self.article_model.get_all())
+            for lot in self.vente_model.iter_lignes_periode(debut, fin):
+                matrice.ajouter(lot)
+            self._cache.put(periode, matrice.figer(), generation)
+        return matrice
+    
+    def get_tendances_articles(self, debut, fin, fenetre=SEMAINE):
+        """Indicateurs de chaque article vendu sur la période, par recette décroissante
+        
+        Les variations comparent les `fenetre` derniers jours jusqu'à fin avec
+        la semaine précédente et avec la même période un an plus tôt (52 semaines).
+        
+        Returns:
+            Liste de dict : id, nom, quantite, recette, marge, taux_marge,
+            moyenne_jour (quantité moyenne sur la fenêtre), semaine_ecart,
+            semaine_taux, annee_ecart, annee_taux (écarts de recette, taux en %)
+        """
+        if fin < debut:
+            raise ValueError("La date de fin précède la date de début")
+        
+        # L'historique d'un an avant la fenêtre est chargé pour les comparaisons
+        matrice = self.get_matrice(min(debut, fin - timedelta(days=ANNEE + fenetre - 1)), fin)
+        periode = slice(matrice.index_jour(debut), None)
+        
+        quantites = matrice.quantites[periode].sum(axis=0)
+        recettes = matrice.recettes[periode].sum(axis=0)
+        marges = recettes - matrice.couts[periode].sum(axis=0)
+        
+        # Dernière ligne de chaque indicateur glissant : valeurs à la date de fin
+        moyennes = moyenne_mobile(matrice.quantites, fenetre)[-1]
+        semaine_ecart, semaine_taux = (valeurs[-1] for valeurs in variations(matrice.recettes, SEMAINE, fenetre))
+        annee_ecart, annee_taux = (valeurs[-1] for valeurs in variations(matrice.recettes, ANNEE, fenetre))
+        
+        tendances = []
+        for j in (-recettes).argsort(kind='stable'):
+            if not quantites[j]:
+                continue
+            tendances.append({
+                'id': int(matrice.article_ids[j]),
+                'nom': matrice.noms[j],
+                'quantite': int(quantites[j]),
+                'recette': Money(recettes[j]),
+                'marge': Money(marges[j]),
+                'taux_marge': float(marges[j] / recettes[j] * 100) if recettes[j] else 0.0,
+                'moyenne_jour': _nombre(moyennes[j]),
+                'semaine_ecart': _montant(semaine_ecart[j]),
+                'semaine_taux': _nombre(semaine_taux[j], 100),
+                'annee_ecart': _montant(annee_ecart[j]),
+                'annee_taux': _nombre(annee_taux[j], 100),
+            })
+        return tendances
+    
+    def get_evolution_mensuelle(self, debut, fin):
+        """Totaux de chaque mois de la période, comparés au même mois de l'année précédente
+        
+        Returns:
+            Liste de dict : mois, quantite, recette, marge, annee_taux (recette, en %)
+        """
+        matrice = self.get_matrice(debut, fin)
+        mois, quantites = totaux_mensuels(matrice, matrice.quantites.sum(axis=1))
+        _, recettes = totaux_mensuels(matrice, matrice.recettes.sum(axis=1))
+        _, marges = totaux_mensuels(matrice, matrice.marges.sum(axis=1))
+        
+        evolution = []
+        for i, premier_jour in enumerate(mois):
+            reference = recettes[i - 12] if i >= 12 else 0
+            evolution.append({
+                'mois': premier_jour,
+                'quantite': int(quantites[i]),
+                'recette': Money(recettes[i]),
+                'marge': Money(marges[i]),
+                'annee_taux': float((recettes[i] - reference) / reference * 100) if reference else None,
+            })
+        return evolution
@@ -3,6 +3,9 @@ Contrôleur Article - Logique métier des articles
 """
 
 from models import ArticleModel
+from .services import ServiceContainer
+from .vente_buffer import VenteWriteBuffer
+from utils.money import Money
 from utils.validators import validate_price, validate_non_empty
 
 
@@ -10,7 +13,8 @@ class ArticleController:
     """Gestion de la logique métier des articles"""
     
     def __init__(self):
-        self.model = ArticleModel()
+        self.model = ServiceContainer().get(ArticleModel)
+        self.buffer = VenteWriteBuffer()
     
     def create_article(self, nom, prix_achat, prix_vente):
         """Créer un article avec validation"""
@@ -33,6 +37,8 @@ class ArticleController:
     
     def delete_article(self, article_id):
         """Supprimer un article"""
+        # Écrire les ventes en attente tant que l'article existe encore
+        self.buffer.flush()
         return self.model.delete(article_id)
     
     def get_all_articles(self):
@@ -43,12 +49,19 @@ class ArticleController:
         """Récupérer un article"""
         return self.model.get_by_id(article_id)
     
+    def get_catalogue_version(self):
+        """Version du catalogue : change à chaque création, modification ou suppression"""
+        return self.model.get_catalogue_version()
+    
     def delete_all_articles(self):
-        """Supprimer tous les articles"""
+        """Supprimer tous les articles (et leurs ventes, en une transaction)"""
+        # Les ventes en attente seraient supprimées avec les articles
+        self.buffer.discard_all()
         return self.model.delete_all()
     
     def calculate_margin(self, prix_achat, prix_vente):
         """Calculer la marge"""
+        prix_achat, prix_vente = Money.from_dinars(prix_achat), Money.from_dinars(prix_vente)
         marge = prix_vente - prix_achat
         marge_pct = (marge / prix_achat * 100) if prix_achat > 0 else 0
         return marge, marge_pct
@@ -4,15 +4,17 @@ Contrôleur Charge - Logique métier des charges
 
 from models import ChargeModel, ChargeFixeModel, SalaireModel
 from utils.validators import validate_non_empty, validate_price
+from .services import ServiceContainer
 
 
 class ChargeController:
     """Gestion de la logique métier des charges"""
     
     def __init__(self):
-        self.charge_model = ChargeModel()
-        self.charge_fixe_model = ChargeFixeModel()
-        self.salaire_model = SalaireModel()
+        services = ServiceContainer()
+        self.charge_model = services.get(ChargeModel)
+        self.charge_fixe_model = services.get(ChargeFixeModel)
+        self.salaire_model = services.get(SalaireModel)
     
     def add_charge_journaliere(self, date_charge, description, montant):
         """Ajouter une charge journalière"""
@@ -0,0 +1,109 @@
+"""
+Contrôleur Prévision - Quantités attendues par article
+Prévisions calculées d'après les semaines précédant le jour (numpy, optionnel)
+"""
+
+from datetime import timedelta
+from calendar import monthrange
+
+from utils.analytics import NUMPY_DISPONIBLE, np
+from utils.cache import PeriodCache
+from utils.prevision import METHODES, HISTORIQUE, fenetres, prevoir, prevoir_fenetres, erreurs
+from .analytics_controller import AnalyticsController
+from .services import ServiceContainer
+from .vente_buffer import VenteWriteBuffer
+
+
+class PrevisionController:
+    """Prévision de la demande de chaque article pour un jour
+    
+    La prévision d'un jour ne dépend que des HISTORIQUE jours qui le
+    précèdent : la saisie des ventes du jour ne l'invalide pas.
+    """
+    
+    # {(premier, dernier jour de l'historique, méthode): {article_id: quantité}}
+    _cache = PeriodCache(tables=('ventes', 'articles'), maxsize=14)
+    
+    def __init__(self):
+        services = ServiceContainer()
+        self.analytics_controller = services.get(AnalyticsController)
+        self.buffer = VenteWriteBuffer()
+    
+    @staticmethod
+    def disponible():
+        """Les prévisions demandent numpy"""
+        return NUMPY_DISPONIBLE
+    
+    def get_previsions_jour(self, jour, methode='lissage', charger=True):
+        """Quantité prévue de chaque article pour un jour
+        
+        Args:
+            charger: Calculer la prévision si elle n'est pas en cache (sinon None)
+        
+        Returns:
+            dict {article_id: quantité prévue (float)}
+        """
+        cle = (jour - timedelta(days=HISTORIQUE), jour - timedelta(days=1), methode)
+        previsions = self._cache.get(cle)
+        if previsions is None and charger:
+            # Écritures en attente appliquées avant de relever la génération
+            self.buffer.flush()
+            generation = self._cache.generation()
+            matrice = self.analytics_controller.get_matrice(cle[0], cle[1])
+            quantites = prevoir(matrice.quantites, methode)[0]
+            previsions = dict(zip(matrice.article_ids.tolist(), quantites.tolist()))
+            self._cache.put(cle, previsions, generation)
+        return previsions
+    
+    def prefetch_jours(self, *jours):
+        """Calculer à l'avance les prévisions de jours (hors du thread de l'interface)"""
+        for jour in jours:
+            self.get_previsions_jour(jour)
+    
+    def backtest(self, debut, fin, methodes=METHODES):
+        """Erreur des prévisions sur une période passée, mois par mois
+        
+        Chaque jour est prévu avec les HISTORIQUE jours qui le précèdent,
+        exactement comme pendant la saisie, puis comparé aux ventes réelles.
+        
+        Returns:
+            dict : 'mois' (liste) et 'global', chacun avec 'libelle' et
+            'methodes' {méthode: erreurs (utils.prevision.erreurs)}
+        """
+        if fin < debut:
+            raise ValueError("La date de fin précède la date de début")
+        
+        matrice = self.analytics_controller.get_matrice(debut - timedelta(days=HISTORIQUE), fin)
+        resultats = {'mois': [], 'global': None}
+        toutes = {methode: [] for methode in methodes}
+        reels_tous = []
+        
+        mois = debut.replace(day=1)
+        while mois <= fin:
+            premier = max(debut, mois)
+            dernier = min(fin, mois.replace(day=monthrange(mois.year, mois.month)[1]))
+            i0, i1 = matrice.index_jour(premier), matrice.index_jour(dernier) + 1
+            
+            # La fenêtre i prévoit la ligne i + HISTORIQUE : une fenêtre par jour du mois
+            vues = fenetres(matrice.quantites[i0 - HISTORIQUE:i1 - 1], HISTORIQUE)
+            reels = matrice.quantites[i0:i1]
+            reels_tous.append(reels)
+            
+            ligne = {'libelle': mois.strftime('%m/%Y'), 'methodes': {}}
+            for methode in methodes:
+                previsions = prevoir_fenetres(vues, methode)[:, 0, :]
+                toutes[methode].append(previsions)
+                ligne['methodes'][methode] = erreurs(previsions, reels)
+            resultats['mois'].append(ligne)
+            
+            mois = (mois + timedelta(days=32)).replace(day=1)
+        
+        reels = np.concatenate(reels_tous)
+        resultats['global'] = {
+            'libelle': 'Total',
+            'methodes': {
+                methode: erreurs(np.concatenate(previsions), reels)
+                for methode, previsions in toutes.items()
+            },
+        }
+        return resultats
@@ -0,0 +1,39 @@
+"""
+Conteneur de services - Instances partagées des contrôleurs et des modèles
+"""
+
+import threading
+
+
+class ServiceContainer:
+    """Singleton : une seule instance par classe de contrôleur ou de modèle
+
+    Les vues et les contrôleurs demandent leurs dépendances au conteneur
+    au lieu de les construire : chaque classe n'est instanciée qu'une fois,
+    à la première demande.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._services = {}
+                    # Réentrant : un contrôleur demande ses modèles pendant sa construction
+                    instance._services_lock = threading.RLock()
+                    cls._instance = instance
+        return cls._instance
+
+    def get(self, classe):
+        """Instance partagée de classe (créée au premier appel)"""
+        service = self._services.get(classe)
+        if service is None:
+            with self._services_lock:
+                service = self._services.get(classe)
+                if service is None:
+                    service = classe()
+                    self._services[classe] = service
+        return service
@@ -0,0 +1,260 @@
+"""
+Tampon d'écriture différée des ventes (write-behind)
+Regroupe les quantités saisies et les écrit en une seule requête
+"""
+
+import atexit
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+
+from config.database import DatabaseConnection
+from config.settings import WRITE_BUFFER_CONFIG
+from models import VenteModel
+from utils.logger import get_logger
+
+
+class VenteWriteBuffer:
+    """Singleton regroupant les quantités en attente par (date, article)
+    
+    Chaque saisie est d'abord ajoutée à un journal sur disque (fsync) : en cas
+    de coupure avant l'écriture en base, le journal est rejoué au démarrage.
+    
+    Une saisie refusée par la base (article supprimé entre-temps, entrée de
+    journal périmée) est écartée dans un fichier de quarantaine et signalée
+    par prendre_rejetees() ; seules les erreurs passagères sont réessayées.
+    """
+    
+    _instance = None
+    _lock = threading.Lock()
+    
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
+        return cls._instance
+    
+    def __init__(self):
+        with self._lock:
+            if self._initialized:
+                return
+            self._initialized = True
+            
+            self.model = VenteModel()
+            self.logger = get_logger()
+            self.flush_interval = WRITE_BUFFER_CONFIG['flush_interval']
+            self.journal_path = Path(WRITE_BUFFER_CONFIG['journal'])
+            self.quarantaine_path = self.journal_path.with_name(self.journal_path.stem + '_rejetees.jsonl')
+            
+            self._pending = {}                  # (date_vente, article_id) -> quantite
+            self._en_cours = {}                 # Lot en cours d'écriture (encore visible)
+            self._rejetees = []                 # Saisies refusées non encore signalées
+            self._state_lock = threading.Lock()
+            self._flush_lock = threading.Lock()  # Une seule écriture à la fois
+            self._timer = None
+            
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._replay_journal()
+            atexit.register(self.flush)
+        
+        # Écrire immédiatement ce qui restait d'une session interrompue
+        if self._pending:
+            self.flush()
+    
+    def add(self, date_vente, article_id, quantite):
+        """Mettre une quantité en attente (la dernière saisie l'emporte)"""
+        with self._state_lock:
+            self._pending[(date_vente, article_id)] = quantite
+            self._append_journal(date_vente, article_id, quantite)
+            self._schedule()
+    
+    def get(self, date_vente, article_id):
+        """Quantité en attente ou en cours d'écriture (None si aucune)"""
+        cle = (date_vente, article_id)
+        with self._state_lock:
+            if cle in self._pending:
+                return self._pending[cle]
+            return self._en_cours.get(cle)
+    
+    def pending_for(self, date_vente):
+        """Quantités en attente ou en cours d'écriture pour une date {article_id: quantite}
+        
+        Le lot en cours d'écriture reste visible jusqu'à sa validation : la
+        base et les feuilles en cache peuvent encore avoir les anciennes valeurs.
+        """
+        with self._state_lock:
+            return {
+                article_id: quantite
+                for saisies in (self._en_cours, self._pending)
+                for (jour, article_id), quantite in saisies.items()
+                if jour == date_vente
+            }
+    
+    def discard_date(self, date_vente):
+        """Oublier les saisies en attente d'une date (avant sa suppression)"""
+        with self._flush_lock, self._state_lock:
+            for cle in [cle for cle in self._pending if cle[0] == date_vente]:
+                del self._pending[cle]
+            self._rewrite_journal()
+    
+    def discard_all(self):
+        """Oublier toutes les saisies en attente (avant la suppression des ventes)"""
+        with self._flush_lock, self._state_lock:
+            self._pending.clear()
+            self._rewrite_journal()
+    
+    def prendre_rejetees(self):
+        """Saisies refusées par la base depuis le dernier appel
+        
+        Returns:
+            Liste de dict {'date_vente', 'article_id', 'quantite', 'erreur'}
+        """
+        with self._state_lock:
+            rejetees, self._rejetees = self._rejetees, []
+            return rejetees
+    
+    def flush(self):
+        """Écrire toutes les quantités en attente en une seule requête
+        
+        Si la base refuse le lot, les lignes sont réécrites une à une : les
+        lignes refusées sont écartées (voir prendre_rejetees), les autres
+        sont enregistrées.
+        
+        Returns:
+            True si tout est en base, False si une saisie a été refusée ou si
+            l'écriture a échoué (les saisies restent en attente et dans le journal)
+        """
+        with self._flush_lock:
+            with self._state_lock:
+                self._cancel_timer()
+                if not self._pending:
+                    return True
+                lot = self._en_cours = self._pending
+                self._pending = {}
+            
+            lignes = [(jour, article_id, quantite) for (jour, article_id), quantite in lot.items()]
+            rejetees = []
+            try:
+                with DatabaseConnection().connection():
+                    self.model.save_many(lignes)
+                restantes = []
+            except Exception as e:
+                if DatabaseConnection().engine.erreur_de_donnees(e):
+                    # Une ligne refusée ne doit pas bloquer les autres
+                    self.logger.warning(f"Lot de {len(lignes)} vente(s) refusé ({e}) : écriture ligne par ligne")
+                    restantes, rejetees = self._ecrire_ligne_par_ligne(lignes)
+                else:
+                    self.logger.error(f"Écriture différée des ventes impossible: {e}")
+                    restantes = lignes
+            
+            if rejetees:
+                self._mettre_en_quarantaine(rejetees)
+            
+            with self._state_lock:
+                self._en_cours = {}
+                if restantes:
+                    # Les saisies arrivées pendant l'écriture sont plus récentes
+                    for jour, article_id, quantite in restantes:
+                        self._pending.setdefault((jour, article_id), quantite)
+                    self._schedule()
+                self._rejetees.extend(rejetees)
+                self._rewrite_journal()
+            return not restantes and not rejetees
+    
+    def _ecrire_ligne_par_ligne(self, lignes):
+        """Écrire les lignes une à une après le refus du lot
+        
+        Returns:
+            (lignes restant à écrire après une erreur passagère, lignes refusées)
+        """
+        engine = DatabaseConnection().engine
+        rejetees = []
+        for position, (jour, article_id, quantite) in enumerate(lignes):
+            try:
+                with DatabaseConnection().connection():
+                    self.model.save_many([(jour, article_id, quantite)])
+            except Exception as e:
+                if not engine.erreur_de_donnees(e):
+                    self.logger.error(f"Écriture différée des ventes impossible: {e}")
+                    return lignes[position:], rejetees
+                self.logger.error(f"Vente refusée ({jour}, article {article_id}, quantité {quantite}): {e}")
+                rejetees.append({
+                    'date_vente': jour,
+                    'article_id': article_id,
+                    'quantite': quantite,
+                    'erreur': str(e)
+                })
+        return [], rejetees
+    
+    def _mettre_en_quarantaine(self, rejetees):
+        """Garder une trace des saisies refusées (elles quittent le journal)"""
+        with open(self.quarantaine_path, 'a', encoding='utf-8') as f:
+            for rejet in rejetees:
+                f.write(json.dumps(dict(rejet, date_vente=rejet['date_vente'].isoformat())) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _schedule(self):
+        """Programmer une écriture groupée (verrou d'état déjà pris)"""
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def _append_journal(self, date_vente, article_id, quantite):
+        ligne = json.dumps({
+            'date_vente': date_vente.isoformat(),
+            'article_id': article_id,
+            'quantite': quantite
+        })
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(ligne + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _rewrite_journal(self):
+        """Ne garder dans le journal que les saisies encore en attente"""
+        if not self._pending:
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            return
+        
+        tmp_path = self.journal_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for (jour, article_id), quantite in self._pending.items():
+                f.write(json.dumps({
+                    'date_vente': jour.isoformat(),
+                    'article_id': article_id,
+                    'quantite': quantite
+                }) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+    
+    def _replay_journal(self):
+        """Recharger les saisies non écrites d'une session précédente"""
+        if not self.journal_path.exists():
+            return
+        
+        with open(self.journal_path, encoding='utf-8') as f:
+            for ligne in f:
+                try:
+                    entree = json.loads(ligne)
+                    cle = (date.fromisoformat(entree['date_vente']), entree['article_id'])
+                    self._pending[cle] = entree['quantite']
+                except (ValueError, KeyError):
+                    # Dernière ligne tronquée par une coupure : ignorée
+                    continue
+        
+        if self._pending:
+            self.logger.info(f"{len(self._pending)} vente(s) en attente rechargée(s) depuis le journal")
\ No newline at end of file
@@ -3,7 +3,12 @@ Contrôleur Vente - Logique métier des ventes
 """
 
 from models import VenteModel, ChargeModel, ChargeFixeModel, SalaireModel
-from decimal import Decimal
+from config.database import DatabaseConnection
+from utils.cache import MonthCache, DayCache
+from utils.formatters import format_date
+from utils.money import Money, ZERO
+from .services import ServiceContainer
+from .vente_buffer import VenteWriteBuffer
 from datetime import date, timedelta
 from calendar import monthrange
 
@@ -11,44 +16,101 @@ from calendar import monthrange
 class VenteController:
     """Gestion de la logique métier des ventes"""
     
+    # Charges fixes + salaires du mois ramenés à un jour
+    _charges_mensuelles_cache = MonthCache(tables=('charges_fixes_mensuelles', 'salaires_mensuels'))
+    # Dépenses de chaque jour du mois {date: total}
+    _charges_jours_cache = MonthCache(tables=('charges',))
+    # Feuilles de saisie des derniers jours consultés {'feuille', 'charges'}
+    _jours_cache = DayCache(tables=('ventes', 'articles', 'charges'), maxsize=7)
+    
     def __init__(self):
-        self.vente_model = VenteModel()
-        self.charge_model = ChargeModel()
-        self.charge_fixe_model = ChargeFixeModel()
-        self.salaire_model = SalaireModel()
+        services = ServiceContainer()
+        self.vente_model = services.get(VenteModel)
+        self.charge_model = services.get(ChargeModel)
+        self.charge_fixe_model = services.get(ChargeFixeModel)
+        self.salaire_model = services.get(SalaireModel)
+        self.buffer = VenteWriteBuffer()
+        self.db = DatabaseConnection()
     
     def save_vente(self, date_vente, article_id, quantite):
-        """Enregistrer une vente"""
+        """Enregistrer une vente (écriture différée et groupée)"""
         if quantite < 0:
             quantite = 0
-        return self.vente_model.save(date_vente, article_id, quantite)
+        self.buffer.add(date_vente, article_id, quantite)
+    
+    def flush_ventes(self):
+        """Écrire immédiatement les ventes en attente"""
+        return self.buffer.flush()
+    
+    def prendre_ventes_rejetees(self):
+        """Saisies refusées par la base depuis le dernier appel (à signaler à l'utilisateur)"""
+        return self.buffer.prendre_rejetees()
     
     def get_ventes_jour(self, date_vente):
         """Récupérer les ventes d'un jour"""
+        self.buffer.flush()
         return self.vente_model.get_by_date(date_vente)
     
+    def get_feuille_jour(self, date_vente):
+        """Articles à saisir avec leur quantité du jour (saisies en attente incluses)"""
+        feuille = [dict(article) for article in self._get_jour(date_vente)['feuille']]
+        en_attente = self.buffer.pending_for(date_vente)
+        if en_attente:
+            for article in feuille:
+                if article['id'] in en_attente:
+                    article['quantite'] = en_attente[article['id']]
+        return feuille
+    
+    def get_charges_jour(self, date_vente):
+        """Dépenses saisies pour un jour"""
+        return self._get_jour(date_vente)['charges']
+    
+    def prefetch_jours(self, *jours):
+        """Charger à l'avance des jours (feuille, dépenses et charges du mois)
+        
+        Appelé hors du thread de l'interface pour les jours voisins : y
+        naviguer ensuite se fait sans requête.
+        """
+        for jour in jours:
+            self._get_jour(jour)
+            self._get_total_charges_jour(jour)
+            self._calculate_charges_journalieres_mensuelles(jour)
+    
+    def _get_jour(self, date_vente):
+        """Feuille et dépenses d'un jour (en cache jusqu'à la prochaine écriture du jour)"""
+        jour = self._jours_cache.get(date_vente)
+        if jour is None:
+            generation = self._jours_cache.generation()
+            jour = {
+                'feuille': self.vente_model.get_feuille_jour(date_vente),
+                'charges': self.charge_model.get_by_date(date_vente),
+            }
+            self._jours_cache.put(date_vente, jour, generation)
+        return jour
+    
     def get_quantite(self, date_vente, article_id):
         """Récupérer la quantité vendue"""
+        quantite = self.buffer.get(date_vente, article_id)
+        if quantite is not None:
+            return quantite
         return self.vente_model.get_quantite(date_vente, article_id)
     
     def calculate_totaux_jour(self, date_vente, quantites_dict):
         """Calculer les totaux d'un jour"""
-        recette_brute = Decimal('0')
-        cout_achat = Decimal('0')
+        # Sommes en millimes (entiers) : un seul Money par total
+        recette_brute = 0
+        cout_achat = 0
         
         for article_id, data in quantites_dict.items():
             quantite = int(data['quantite'] or 0)
-            prix_achat = Decimal(str(data['prix_achat']))
-            prix_vente = Decimal(str(data['prix_vente']))
-            
-            recette_brute += prix_vente * quantite
-            cout_achat += prix_achat * quantite
+            recette_brute += Money.from_dinars(data['prix_vente']).millimes * quantite
+            cout_achat += Money.from_dinars(data['prix_achat']).millimes * quantite
         
+        recette_brute, cout_achat = Money(recette_brute), Money(cout_achat)
         benefice_brut = recette_brute - cout_achat
         
         # Charges journalières (dépenses du jour)
-        total_charges = self.charge_model.get_total_by_date(date_vente)
-        total_charges = Decimal(str(total_charges))
+        total_charges = self._get_total_charges_jour(date_vente)
         
         # Charges journalières mensuelles (salaires + charges fixes du mois / nb jours)
         charges_journalieres_mensuelles = self._calculate_charges_journalieres_mensuelles(date_vente)
@@ -65,49 +127,97 @@ class VenteController:
             'benefice_net': benefice_net
         }
     
+    def _get_total_charges_jour(self, date_vente):
+        """Dépenses du jour (totaux du mois lus une fois puis gardés en cache)"""
+        mois = date_vente.replace(day=1)
+        totaux = self._charges_jours_cache.get(mois)
+        if totaux is None:
+            generation = self._charges_jours_cache.generation()
+            dernier_jour = mois.replace(day=monthrange(mois.year, mois.month)[1])
+            totaux = self.charge_model.get_totaux_par_jour(mois, dernier_jour)
+            self._charges_jours_cache.put(mois, totaux, generation)
+        return totaux.get(date_vente, ZERO)
+    
     def _calculate_charges_journalieres_mensuelles(self, date_vente):
-        """Calculer les charges journalières mensuelles (salaires + charges fixes / nb jours du mois)"""
-        # Récupérer le premier jour du mois
+        """Charges journalières mensuelles, en cache jusqu'à la prochaine modification
+        des charges fixes ou des salaires du mois"""
         mois = date_vente.replace(day=1)
-        
+        charges = self._charges_mensuelles_cache.get(mois)
+        if charges is None:
+            generation = self._charges_mensuelles_cache.generation()
+            charges = self._charger_charges_journalieres_mensuelles(mois)
+            self._charges_mensuelles_cache.put(mois, charges, generation)
+        return charges
+    
+    def _charger_charges_journalieres_mensuelles(self, mois):
+        """Calculer les charges journalières mensuelles (salaires + charges fixes / nb jours du mois)"""
         # Nombre de jours dans le mois
-        nb_jours_mois = monthrange(date_vente.year, date_vente.month)[1]
+        nb_jours_mois = monthrange(mois.year, mois.month)[1]
         
         # Charges fixes du mois
         charges_fixes = self.charge_fixe_model.get_by_month(mois)
-        total_charges_fixes = Decimal('0')
+        total_charges_fixes = ZERO
         if charges_fixes:
             champs_charges = ['loyer', 'electricite', 'eau', 'impot', 'municipalite', 'terrasse', 'internet', 'autres']
             total_charges_fixes = sum(
-                Decimal(str(charges_fixes.get(champ, 0) or 0))
-                for champ in champs_charges
+                (charges_fixes.get(champ) or ZERO for champ in champs_charges), ZERO
             )
         
         # Salaires du mois
-        total_salaires = Decimal(str(self.salaire_model.get_total_by_month(mois) or 0))
+        total_salaires = self.salaire_model.get_total_by_month(mois)
         
-        # Charges journalières = (charges fixes + salaires) / nb jours
+        # Charges journalières = (charges fixes + salaires) / nb jours, arrondies au millime
         if nb_jours_mois > 0:
-            charges_journalieres = (total_charges_fixes + total_salaires) / Decimal(str(nb_jours_mois))
+            charges_journalieres = (total_charges_fixes + total_salaires) / nb_jours_mois
         else:
-            charges_journalieres = Decimal('0')
+            charges_journalieres = ZERO
         
         return charges_journalieres
     
     def delete_jour(self, date_vente):
-        """Supprimer toutes les ventes et charges d'un jour"""
-        ventes_suppr = self.vente_model.delete_by_date(date_vente)
-        charges_suppr = self.charge_model.delete_by_date(date_vente)
+        """Supprimer toutes les ventes et charges d'un jour (tout ou rien)"""
+        self.buffer.discard_date(date_vente)
+        with self.db.transaction():
+            ventes_suppr = self.vente_model.delete_by_date(date_vente)
+            charges_suppr = self.charge_model.delete_by_date(date_vente)
         return {'ventes': ventes_suppr, 'charges': charges_suppr}
     
+    def reinitialiser_jour(self, date_vente):
+        """Remettre les quantités à 0 et supprimer les charges d'un jour (tout ou rien)"""
+        self.buffer.discard_date(date_vente)
+        with self.db.transaction():
+            ventes = self.vente_model.reset_quantites(date_vente)
+            charges = self.charge_model.delete_by_date(date_vente)
+        return {'ventes': ventes, 'charges': charges}
+    
     def get_historique(self, limit=30):
         """Récupérer l'historique avec charges"""
-        historique = self.vente_model.get_historique(limit)
-        
-        # Ajouter les charges pour chaque jour
-        for jour in historique:
-            total_charges = self.charge_model.get_total_by_date(jour['date_vente'])
-            jour['total_charges'] = total_charges
-            jour['benefice_net'] = jour['benefice_brut'] - Decimal(str(total_charges))
-        
-        return historique
\ No newline at end of file
+        self.buffer.flush()
+        return self.vente_model.get_historique(limit)
+    
+    def get_historique_periode(self, debut, fin, limit=100):
+        """Nombre de jours d'une période et première page de son historique"""
+        if fin < debut:
+            raise ValueError("La date de fin précède la date de début")
+        self.buffer.flush()
+        return {
+            'total': self.vente_model.count_historique(debut, fin),
+            'lignes': self.vente_model.get_historique_page(debut, fin, None, limit)
+        }
+    
+    def get_historique_page(self, debut, fin, avant, limit=100):
+        """Page suivante de l'historique d'une période (jours antérieurs à avant)"""
+        self.buffer.flush()
+        return self.vente_model.get_historique_page(debut, fin, avant, limit)
+    
+    def count_historique(self, debut, fin):
+        """Nombre de jours de l'historique d'une période"""
+        self.buffer.flush()
+        return self.vente_model.count_historique(debut, fin)
+    
+    def iter_historique_lots(self, debut, fin, taille_lot=500):
+        """Lignes d'export de l'historique d'une période, produites en flux par lots"""
+        self.buffer.flush()
+        for lot in self.vente_model.iter_historique(debut, fin, batch_size=taille_lot, batches=True):
+            # (date, recette, coût, bénéfice brut, dépenses, bénéfice net)
+            yield [(format_date(jour[0]),) + jour[1:] for jour in lot]
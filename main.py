@@ -5,7 +5,12 @@ Sultan Ahmed - Application de Gestion Professionnelle
 Point d'entrée principal
 """
 
+import time
+_LANCEMENT = time.perf_counter()
+
 import sys
+import atexit
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 from pathlib import Path
@@ -17,24 +22,116 @@ sys.path.insert(0, str(ROOT_DIR))
 from config.database import DatabaseConnection
 from views.main_window import MainWindow
 from utils.logger import setup_logger
+from utils.profiling import StartupProfiler
+
+_IMPORTS = time.perf_counter()
+
+
+def parse_args():
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Sultan Ahmed - Gestion Salon de Thé")
+    parser.add_argument('--rebuild-resume', action='store_true',
+                        help="Reconstruire la table de synthèse resume_journalier puis quitter")
+    parser.add_argument('--check-index', action='store_true',
+                        help="Vérifier par EXPLAIN que les requêtes des modèles utilisent un index, puis quitter")
+    parser.add_argument('--backtest-previsions', type=int, nargs='?', const=6, metavar='MOIS',
+                        help="Mesurer l'erreur des prévisions sur les MOIS derniers mois (6 par défaut), puis quitter")
+    parser.add_argument('--query-stats', action='store_true',
+                        help="Afficher les statistiques des requêtes SQL en fin d'exécution")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Afficher la durée de chaque étape du démarrage une fois la fenêtre prête")
+    return parser.parse_args()
+
+
+def rebuild_resume(logger):
+    """Reconstruire la synthèse journalière depuis les ventes et les charges"""
+    from models import ResumeJournalierModel
+    
+    nb_jours = ResumeJournalierModel().rebuild()
+    logger.info(f"✅ resume_journalier reconstruite ({nb_jours} jour(s))")
+
+
+def check_index():
+    """Afficher le plan d'index des requêtes ; code de sortie 1 si une grande table est lue en entier"""
+    from utils.index_check import verifier_index, rapport_index
+    
+    resultats = verifier_index()
+    print(rapport_index(resultats))
+    return 1 if any(resultat['problemes'] for resultat in resultats) else 0
+
+
+def backtest_previsions(nb_mois):
+    """Comparer les prévisions de chaque méthode aux ventes des derniers mois"""
+    from datetime import date, timedelta
+    from controllers import PrevisionController
+    from utils.formatters import format_date
+    from utils.prevision import rapport_backtest
+    
+    if nb_mois < 1:
+        raise ValueError("Le nombre de mois doit être positif")
+    
+    fin = date.today() - timedelta(days=1)
+    debut = fin.replace(day=1)
+    for _ in range(nb_mois - 1):
+        debut = (debut - timedelta(days=1)).replace(day=1)
+    
+    print(f"Prévisions du {format_date(debut)} au {format_date(fin)}")
+    print(rapport_backtest(PrevisionController().backtest(debut, fin)))
+
+
+def rapport_demarrage(profiler, logger):
+    """Afficher le temps passé dans chaque étape du démarrage"""
+    rapport = profiler.report()
+    print(rapport)
+    logger.info(f"⏱️ Démarrage en {profiler.depuis_lancement_ms():.0f} ms")
 
 
 def main():
     """Point d'entrée de l'application"""
+    args = parse_args()
     logger = setup_logger()
+    
+    profiler = StartupProfiler()
+    profiler.demarrer(_LANCEMENT)
+    profiler.ajouter("Imports", (_IMPORTS - _LANCEMENT) * 1000)
+    
+    if args.query_stats:
+        from utils.instrumentation import QueryStats
+        atexit.register(lambda: print(QueryStats().report()))
+    
+    if args.rebuild_resume:
+        rebuild_resume(logger)
+        return
+    
+    if args.check_index:
+        sys.exit(check_index())
+    
+    if args.backtest_previsions is not None:
+        backtest_previsions(args.backtest_previsions)
+        return
+    
     logger.info("🚀 Démarrage de Sultan Ahmed")
     
     try:
-        # Test connexion DB
+        # Test connexion DB (connexion et migrations chronométrées par DatabaseConnection)
         db = DatabaseConnection()
-        if not db.test_connection():
-            raise Exception("MySQL n'est pas accessible!\n\nVérifiez que XAMPP est lancé.")
+        with profiler.etape("Test de connexion"):
+            accessible = db.test_connection()
+        if not accessible:
+            if db.engine.name == 'mysql':
+                raise Exception("MySQL n'est pas accessible!\n\nVérifiez que XAMPP est lancé.")
+            raise Exception(f"La base {db.engine.label} n'est pas accessible!")
         
-        logger.info("✅ Connexion MySQL OK")
+        logger.info(f"✅ Connexion {db.engine.label} OK")
         
         # Lancer l'interface
-        root = tk.Tk()
+        with profiler.etape("Initialisation Tk"):
+            root = tk.Tk()
         app = MainWindow(root)
+        
+        if args.profile_startup:
+            # Première fenêtre prête : plus rien en attente dans la boucle Tk
+            root.after_idle(lambda: rapport_demarrage(profiler, logger))
         root.mainloop()
         
     except Exception as e:
@@ -5,11 +5,15 @@ from .vente import VenteModel
 from .charge import ChargeModel
 from .charge_fixe import ChargeFixeModel
 from .salaire import SalaireModel
+from .resume_journalier import ResumeJournalierModel
+from .bilan import BilanModel
 
 __all__ = [
     'ArticleModel',
     'VenteModel',
     'ChargeModel',
     'ChargeFixeModel',
-    'SalaireModel'
+    'SalaireModel',
+    'ResumeJournalierModel',
+    'BilanModel'
 ]
\ No newline at end of file
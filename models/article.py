@@ -2,29 +2,137 @@
 Modèle Article - Gestion des articles
 """
 
+import threading
+from collections import namedtuple
+
 from .base_model import BaseModel
+from .resume_journalier import ResumeJournalierModel
+from utils.money import Money
+
+
+class Article(namedtuple('Article', 'id nom prix_achat prix_vente actif date_creation')):
+    """Article du catalogue (immuable), lisible aussi comme un dict : article['nom']"""
+    
+    __slots__ = ()
+    
+    def __getitem__(self, cle):
+        if isinstance(cle, str):
+            try:
+                return getattr(self, cle)
+            except AttributeError:
+                raise KeyError(cle)
+        return super().__getitem__(cle)
+    
+    def get(self, cle, defaut=None):
+        return getattr(self, cle, defaut)
+    
+    @classmethod
+    def from_row(cls, row):
+        return cls(*(row[champ] for champ in cls._fields))
+
+
+class CatalogueArticles:
+    """Singleton : catalogue des articles en mémoire (id -> Article)
+    
+    Chargé une fois par processus puis tenu à jour par ArticleModel après
+    chaque écriture validée. version change à chaque modification : une vue
+    compare la version affichée pour savoir si elle doit se redessiner.
+    """
+    
+    _instance = None
+    _lock = threading.Lock()
+    
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._articles = None
+                    instance.version = 0
+                    cls._instance = instance
+        return cls._instance
+    
+    def articles(self, charger):
+        """Articles par id (charger() lit la table au premier appel)"""
+        articles = self._articles
+        if articles is None:
+            with self._lock:
+                if self._articles is None:
+                    self._articles = {row['id']: Article.from_row(row) for row in charger()}
+                articles = self._articles
+        return articles
+    
+    def put(self, article):
+        self._modifier(lambda articles: articles.__setitem__(article.id, article))
+    
+    def remove(self, article_id):
+        self._modifier(lambda articles: articles.pop(article_id, None))
+    
+    def clear(self):
+        self._modifier(lambda articles: articles.clear())
+    
+    def invalidate(self):
+        """Oublier le catalogue (relu à la prochaine demande)"""
+        with self._lock:
+            self._articles = None
+            self.version += 1
+    
+    def _modifier(self, modification):
+        # Copie puis remplacement : les lecteurs ne voient jamais un dict en cours de modification
+        with self._lock:
+            if self._articles is not None:
+                articles = dict(self._articles)
+                modification(articles)
+                self._articles = articles
+            self.version += 1
 
 
 class ArticleModel(BaseModel):
     """Gestion des articles"""
     
+    MONTANTS = ('prix_achat', 'prix_vente')
+    
+    def __init__(self):
+        super().__init__()
+        self.resume = ResumeJournalierModel()
+        self.catalogue = CatalogueArticles()
+    
     def create(self, nom, prix_achat, prix_vente):
         """Créer un article"""
         query = "INSERT INTO articles (nom, prix_achat, prix_vente) VALUES (%s, %s, %s)"
-        return self._execute_query(query, (nom, prix_achat, prix_vente))
+        params = (nom, Money.from_dinars(prix_achat), Money.from_dinars(prix_vente))
+        article_id = self._execute_query(query, params)
+        self._invalidate('articles')
+        self._rafraichir_catalogue(article_id)
+        return article_id
     
     def get_all(self, actif_only=True):
-        """Récupérer tous les articles"""
-        query = "SELECT * FROM articles"
-        if actif_only:
-            query += " WHERE actif = TRUE"
-        query += " ORDER BY id ASC"
-        return self._execute_query(query, fetch_all=True)
+        """Récupérer tous les articles (catalogue en mémoire, trié par id)"""
+        articles = self.catalogue.articles(self._charger_catalogue)
+        return [
+            article for _, article in sorted(articles.items())
+            if article.actif or not actif_only
+        ]
     
     def get_by_id(self, article_id):
         """Récupérer un article par ID"""
-        query = "SELECT * FROM articles WHERE id = %s"
-        return self._execute_query(query, (article_id,), fetch_one=True)
+        return self.catalogue.articles(self._charger_catalogue).get(article_id)
+    
+    def get_catalogue_version(self):
+        """Version du catalogue (change à chaque modification d'article)"""
+        return self.catalogue.version
+    
+    def _charger_catalogue(self):
+        return self._execute_query("SELECT * FROM articles ORDER BY id ASC", fetch_all=True,
+                                   montants=self.MONTANTS)
+    
+    def _rafraichir_catalogue(self, article_id):
+        """Relire l'article écrit et le placer au catalogue une fois validé"""
+        row = self._execute_query("SELECT * FROM articles WHERE id = %s", (article_id,), fetch_one=True,
+                                  montants=self.MONTANTS)
+        if row:
+            article = Article.from_row(row)
+            self.db.after_commit(lambda: self.catalogue.put(article))
     
     def update(self, article_id, nom, prix_achat, prix_vente):
         """Modifier un article"""
@@ -33,21 +141,42 @@ class ArticleModel(BaseModel):
             SET nom = %s, prix_achat = %s, prix_vente = %s 
             WHERE id = %s
         """
-        return self._execute_query(query, (nom, prix_achat, prix_vente, article_id))
+        # Les ventes passées gardent leurs prix figés : rien à recalculer
+        params = (nom, Money.from_dinars(prix_achat), Money.from_dinars(prix_vente), article_id)
+        result = self._execute_query(query, params)
+        self._invalidate('articles')
+        self._rafraichir_catalogue(article_id)
+        return result
     
     def delete(self, article_id):
         """Supprimer un article"""
         query = "DELETE FROM articles WHERE id = %s"
-        return self._execute_query(query, (article_id,))
+        with self.db.transaction():
+            jours = self._execute_query(
+                "SELECT DISTINCT date_vente FROM ventes WHERE article_id = %s",
+                (article_id,), fetch_all=True
+            )
+            result = self._execute_query(query, (article_id,))
+            # Les ventes de l'article sont supprimées en cascade
+            jours = [jour['date_vente'] for jour in jours]
+            self.resume.refresh_jours(jours)
+            self._invalidate('articles')
+            self._invalidate('ventes', *jours)
+            self.db.after_commit(lambda: self.catalogue.remove(article_id))
+        return result
     
     def delete_all(self):
         """Supprimer tous les articles"""
         # Supprimer les ventes d'abord (CASCADE devrait le faire automatiquement)
-        self._execute_query("DELETE FROM ventes")
-        return self._execute_query("DELETE FROM articles")
+        with self.db.transaction():
+            self._execute_query("DELETE FROM ventes")
+            result = self._execute_query("DELETE FROM articles")
+            self.resume.rebuild()
+            self._invalidate('articles')
+            self._invalidate('ventes')
+            self.db.after_commit(self.catalogue.clear)
+        return result
     
     def get_count(self):
         """Compter les articles"""
-        query = "SELECT COUNT(*) as count FROM articles WHERE actif = TRUE"
-        result = self._execute_query(query, fetch_one=True)
-        return result['count'] if result else 0
\ No newline at end of file
+        return len(self.get_all())
\ No newline at end of file
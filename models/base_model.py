@@ -3,36 +3,175 @@ Modèle de base pour tous les modèles
 Pattern Repository
 """
 
+import sys
+from collections import namedtuple
+
 from config.database import DatabaseConnection
+from utils.cache import invalidate
+from utils.instrumentation import mesurer, arreter_chrono
+from utils.money import Money, ZERO
 
 
 class BaseModel:
-    """Classe de base pour tous les modèles"""
+    """Classe de base pour tous les modèles
+    
+    Les montants sont stockés en millimes (entiers). Chaque lecture déclare
+    ses colonnes de montant (argument montants) : elles sont lues en Money,
+    les autres colonnes restent telles que la base les renvoie.
+    """
     
     def __init__(self):
         self.db = DatabaseConnection()
-        self.connection = self.db.get_connection()
     
-    def _execute_query(self, query, params=None, fetch_one=False, fetch_all=False):
-        """Exécuter une requête SQL de manière sécurisée"""
-        cursor = self.connection.cursor(dictionary=True)
-        cursor.execute(query, params or ())
-        
-        if fetch_one:
-            result = cursor.fetchone()
-        elif fetch_all:
-            result = cursor.fetchall()
-        else:
-            self.connection.commit()
-            result = cursor.lastrowid if cursor.lastrowid else cursor.rowcount
+    @property
+    def connection(self):
+        """Connexion du thread courant (empruntée au pool)"""
+        return self.db.get_connection()
+    
+    def _execute_query(self, query, params=None, fetch_one=False, fetch_all=False, montants=()):
+        """Exécuter une requête SQL de manière sécurisée
         
-        cursor.close()
+        Args:
+            montants: Colonnes du résultat à lire en Money
+        """
+        connection = self.connection
+        with mesurer(self._methode_appelante(), query, params) as mesure:
+            cursor = self.db.engine.cursor(connection, dictionary=True)
+            cursor.execute(query, self._parametres(params))
+            
+            if fetch_one:
+                result = cursor.fetchone()
+                mesure['lignes'] = 1 if result else 0
+                if result:
+                    self._montants([result], montants)
+            elif fetch_all:
+                result = self._montants(cursor.fetchall(), montants)
+                mesure['lignes'] = len(result)
+            else:
+                if not self.db.in_transaction():
+                    connection.commit()
+                mesure['lignes'] = max(cursor.rowcount, 0)
+                result = cursor.lastrowid if cursor.lastrowid else cursor.rowcount
+            
+            cursor.close()
         return result
     
     def _execute_many(self, query, data_list):
         """Exécuter plusieurs insertions"""
-        cursor = self.connection.cursor()
-        cursor.executemany(query, data_list)
-        self.connection.commit()
-        cursor.close()
-        return cursor.rowcount
\ No newline at end of file
+        connection = self.connection
+        with mesurer(self._methode_appelante(), query, data_list[0] if data_list else ()) as mesure:
+            cursor = self.db.engine.cursor(connection)
+            cursor.executemany(query, data_list)
+            if not self.db.in_transaction():
+                connection.commit()
+            cursor.close()
+            mesure['lignes'] = max(cursor.rowcount, 0)
+        return cursor.rowcount
+    
+    def _stream_query(self, query, params=None, row_type='dict', batch_size=500, batches=False, montants=()):
+        """Lire un résultat en flux, sans le charger entièrement en mémoire
+        
+        La requête s'exécute sur une connexion dédiée empruntée au pool,
+        rendue quand le générateur est épuisé ou fermé.
+        
+        Args:
+            row_type: 'dict', 'tuple' ou 'namedtuple'
+            batch_size: Lignes lues par aller-retour (fetchmany)
+            batches: Produire des listes de lignes plutôt que des lignes
+            montants: Colonnes du résultat à lire en Money
+        """
+        if row_type not in ('dict', 'tuple', 'namedtuple'):
+            raise ValueError(f"Type de ligne inconnu: {row_type}")
+        return self._flux(self._methode_appelante(), query, params, row_type, batch_size, batches, montants)
+    
+    def _flux(self, methode, query, params, row_type, batch_size, batches, montants):
+        """Générateur de _stream_query"""
+        engine = self.db.engine
+        with self.db.dedicated_connection() as connection:
+            with mesurer(methode, query, params) as mesure:
+                cursor = engine.stream_cursor(connection)
+                try:
+                    cursor.execute(query, self._parametres(params))
+                    colonnes = [col[0] for col in cursor.description]
+                    if row_type == 'dict':
+                        convertir = lambda ligne: dict(zip(colonnes, ligne))
+                    elif row_type == 'namedtuple':
+                        convertir = namedtuple('Ligne', colonnes)._make
+                    else:
+                        convertir = tuple
+                    
+                    if montants:
+                        positions = [colonnes.index(colonne) for colonne in montants]
+                        convertir = self._convertir_montants(convertir, positions)
+                    
+                    lot = cursor.fetchmany(batch_size)
+                    # Durée de requête : exécution et premier lot ; la lecture
+                    # au rythme du consommateur (écriture CSV, interface) n'en fait pas partie
+                    arreter_chrono(mesure)
+                    while lot:
+                        mesure['lignes'] += len(lot)
+                        lot = [convertir(ligne) for ligne in lot]
+                        if batches:
+                            yield lot
+                        else:
+                            yield from lot
+                        lot = cursor.fetchmany(batch_size)
+                finally:
+                    engine.close_stream(connection, cursor)
+    
+    def _execute_batch(self, requetes):
+        """Exécuter plusieurs SELECT en un seul aller-retour
+        
+        Args:
+            requetes: Liste de tuples (requête, paramètres, colonnes de montant)
+        """
+        montants = [colonnes for _, _, colonnes in requetes]
+        requetes = [(query, self._parametres(params)) for query, params, _ in requetes]
+        query = ';\n'.join(query for query, _ in requetes)
+        params = tuple(param for _, params in requetes for param in params)
+        with mesurer(self._methode_appelante(), query, params) as mesure:
+            resultats = self.db.engine.execute_batch(self.connection, requetes)
+            mesure['lignes'] = sum(len(lignes) for lignes in resultats)
+        return [self._montants(lignes, colonnes) for lignes, colonnes in zip(resultats, montants)]
+    
+    @staticmethod
+    def _parametres(params):
+        """Paramètres passés au moteur : les Money en millimes"""
+        if not params:
+            return ()
+        return tuple(param.millimes if isinstance(param, Money) else param for param in params)
+    
+    @staticmethod
+    def _montants(rows, montants):
+        """Convertir en Money les colonnes de montant de lignes dict (modifiées sur place)"""
+        if montants:
+            for row in rows:
+                for champ in montants:
+                    valeur = row[champ]
+                    row[champ] = Money(valeur) if valeur is not None else ZERO
+        return rows
+    
+    @staticmethod
+    def _convertir_montants(convertir, positions):
+        """Conversion de ligne de flux précédée de la lecture des montants en Money"""
+        def convertir_ligne(ligne):
+            ligne = list(ligne)
+            for position in positions:
+                valeur = ligne[position]
+                ligne[position] = Money(valeur) if valeur is not None else ZERO
+            return convertir(ligne)
+        return convertir_ligne
+    
+    def _invalidate(self, table, *jours):
+        """Invalider les caches dépendant de la table (dates touchées, ou toutes)
+        
+        Refait après le commit : une lecture concurrente ne doit pas remettre
+        en cache l'état d'avant l'écriture.
+        """
+        invalidate(table, *jours)
+        if self.db.in_transaction():
+            self.db.after_commit(lambda: invalidate(table, *jours))
+    
+    def _methode_appelante(self):
+        """Nom de la méthode de modèle qui exécute la requête (ex. VenteModel.save_many)"""
+        return f"{type(self).__name__}.{sys._getframe(2).f_code.co_name}"
@@ -0,0 +1,66 @@
+"""
+Modèle Bilan - Données d'un bilan mensuel
+Toutes les lectures du mois partent en un seul aller-retour
+"""
+
+from .base_model import BaseModel
+from .charge_fixe import ChargeFixeModel
+
+
+class BilanModel(BaseModel):
+    """Lecture groupée des données d'un mois"""
+    
+    TOTAUX_QUERY = """
+        SELECT 
+            SUM(recette_brute) as recette_brute,
+            SUM(cout_achat) as cout_achat,
+            SUM(benefice_brut) as benefice_brut,
+            SUM(total_charges) as total_charges_journalieres
+        FROM resume_journalier
+        WHERE date_jour BETWEEN %s AND %s
+    """
+    
+    CHARGES_FIXES_QUERY = "SELECT * FROM charges_fixes_mensuelles WHERE mois = %s"
+    
+    SALAIRES_QUERY = "SELECT * FROM salaires_mensuels WHERE mois = %s ORDER BY nom_employe"
+    
+    QUANTITES_QUERY = """
+        SELECT a.nom, q.quantite_totale, q.total_vente
+        FROM (
+            SELECT 
+                article_id,
+                SUM(quantite) as quantite_totale,
+                SUM(quantite * prix_vente) as total_vente
+            FROM ventes
+            WHERE date_vente BETWEEN %s AND %s
+            GROUP BY article_id
+        ) q
+        JOIN articles a ON q.article_id = a.id
+        ORDER BY q.quantite_totale DESC
+    """
+    
+    DEPENSES_QUERY = """
+        SELECT date_charge, description, montant
+        FROM charges
+        WHERE date_charge BETWEEN %s AND %s
+        ORDER BY date_charge DESC
+    """
+    
+    def get_mois(self, premier_jour, dernier_jour):
+        """Récupérer toutes les données d'un mois en une requête groupée"""
+        periode = (premier_jour, dernier_jour)
+        totaux, charges_fixes, salaires, quantites, depenses = self._execute_batch([
+            (self.TOTAUX_QUERY, periode,
+             ('recette_brute', 'cout_achat', 'benefice_brut', 'total_charges_journalieres')),
+            (self.CHARGES_FIXES_QUERY, (premier_jour,), ChargeFixeModel.MONTANTS),
+            (self.SALAIRES_QUERY, (premier_jour,), ('montant',)),
+            (self.QUANTITES_QUERY, periode, ('total_vente',)),
+            (self.DEPENSES_QUERY, periode, ('montant',)),
+        ])
+        return {
+            'totaux': totaux[0] if totaux else {},
+            'charges_fixes': charges_fixes[0] if charges_fixes else None,
+            'salaires': salaires,
+            'quantites_articles': quantites,
+            'depenses_journalieres': depenses,
+        }
@@ -3,36 +3,68 @@ Modèle Charge - Gestion des charges journalières
 """
 
 from .base_model import BaseModel
+from .resume_journalier import ResumeJournalierModel
+from utils.money import Money, ZERO
 
 
 class ChargeModel(BaseModel):
     """Gestion des charges journalières"""
     
+    def __init__(self):
+        super().__init__()
+        self.resume = ResumeJournalierModel()
+    
     def create(self, date_charge, description, montant):
         """Ajouter une charge"""
         query = "INSERT INTO charges (date_charge, description, montant) VALUES (%s, %s, %s)"
-        return self._execute_query(query, (date_charge, description, montant))
+        with self.db.transaction():
+            charge_id = self._execute_query(query, (date_charge, description, Money.from_dinars(montant)))
+            self.resume.refresh_jour(date_charge)
+            self._invalidate('charges', date_charge)
+        return charge_id
     
     def get_by_date(self, date_charge):
         """Récupérer les charges d'une date"""
         query = "SELECT * FROM charges WHERE date_charge = %s ORDER BY date_creation"
-        return self._execute_query(query, (date_charge,), fetch_all=True)
+        return self._execute_query(query, (date_charge,), fetch_all=True, montants=('montant',))
     
     def delete(self, charge_id):
         """Supprimer une charge"""
-        query = "DELETE FROM charges WHERE id = %s"
-        return self._execute_query(query, (charge_id,))
+        with self.db.transaction():
+            charge = self._execute_query(
+                "SELECT date_charge FROM charges WHERE id = %s", (charge_id,), fetch_one=True
+            )
+            result = self._execute_query("DELETE FROM charges WHERE id = %s", (charge_id,))
+            if charge:
+                self.resume.refresh_jour(charge['date_charge'])
+                self._invalidate('charges', charge['date_charge'])
+        return result
     
     def delete_by_date(self, date_charge):
         """Supprimer toutes les charges d'une date"""
         query = "DELETE FROM charges WHERE date_charge = %s"
-        return self._execute_query(query, (date_charge,))
+        with self.db.transaction():
+            result = self._execute_query(query, (date_charge,))
+            self.resume.refresh_jour(date_charge)
+            self._invalidate('charges', date_charge)
+        return result
     
     def get_total_by_date(self, date_charge):
         """Total des charges d'une date"""
         query = "SELECT SUM(montant) as total FROM charges WHERE date_charge = %s"
-        result = self._execute_query(query, (date_charge,), fetch_one=True)
-        return result['total'] if result and result['total'] else 0
+        result = self._execute_query(query, (date_charge,), fetch_one=True, montants=('total',))
+        return result['total'] if result else ZERO
+    
+    def get_totaux_par_jour(self, premier_jour, dernier_jour):
+        """Total des charges de chaque jour d'une période {date: total}"""
+        query = """
+            SELECT date_charge, SUM(montant) as total
+            FROM charges
+            WHERE date_charge BETWEEN %s AND %s
+            GROUP BY date_charge
+        """
+        rows = self._execute_query(query, (premier_jour, dernier_jour), fetch_all=True, montants=('total',))
+        return {row['date_charge']: row['total'] for row in rows}
     
     def get_charges_mois(self, premier_jour, dernier_jour):
         """Charges d'un mois"""
@@ -41,8 +73,9 @@ class ChargeModel(BaseModel):
             FROM charges
             WHERE date_charge BETWEEN %s AND %s
         """
-        result = self._execute_query(query, (premier_jour, dernier_jour), fetch_one=True)
-        return result if result else {'total_charges_journalieres': 0}
+        result = self._execute_query(query, (premier_jour, dernier_jour), fetch_one=True,
+                                     montants=('total_charges_journalieres',))
+        return result if result else {'total_charges_journalieres': ZERO}
     
     def get_liste_charges_mois(self, premier_jour, dernier_jour):
         """Liste détaillée des charges d'un mois"""
@@ -52,4 +85,4 @@ class ChargeModel(BaseModel):
             WHERE date_charge BETWEEN %s AND %s
             ORDER BY date_charge DESC
         """
-        return self._execute_query(query, (premier_jour, dernier_jour), fetch_all=True)
\ No newline at end of file
+        return self._execute_query(query, (premier_jour, dernier_jour), fetch_all=True, montants=('montant',))
\ No newline at end of file
@@ -3,28 +3,30 @@ Modèle ChargeFixe - Gestion des charges fixes mensuelles
 """
 
 from .base_model import BaseModel
+from utils.money import Money
 
 
 class ChargeFixeModel(BaseModel):
     """Gestion des charges fixes mensuelles"""
     
+    MONTANTS = ('loyer', 'electricite', 'eau', 'impot', 'municipalite', 'terrasse', 'internet', 'autres')
+    
     def save(self, mois, loyer, electricite, eau, impot, municipalite, terrasse, internet, autres, autres_desc):
         """Enregistrer ou mettre à jour les charges fixes"""
-        query = """
-            INSERT INTO charges_fixes_mensuelles 
-            (mois, loyer, electricite, eau, impot, municipalite, terrasse, internet, autres, autres_description)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            loyer = %s, electricite = %s, eau = %s, impot = %s, 
-            municipalite = %s, terrasse = %s, internet = %s, autres = %s, autres_description = %s
-        """
-        params = (
-            mois, loyer, electricite, eau, impot, municipalite, terrasse, internet, autres, autres_desc,
-            loyer, electricite, eau, impot, municipalite, terrasse, internet, autres, autres_desc
+        colonnes = self.MONTANTS + ('autres_description',)
+        query = self.db.engine.upsert_query(
+            'charges_fixes_mensuelles',
+            ('mois',) + colonnes,
+            keys=('mois',),
+            updates=colonnes
         )
-        return self._execute_query(query, params)
+        montants = (loyer, electricite, eau, impot, municipalite, terrasse, internet, autres)
+        params = (mois,) + tuple(Money.from_dinars(montant) for montant in montants) + (autres_desc,)
+        result = self._execute_query(query, params)
+        self._invalidate('charges_fixes_mensuelles', mois)
+        return result
     
     def get_by_month(self, mois):
         """Récupérer les charges fixes d'un mois"""
         query = "SELECT * FROM charges_fixes_mensuelles WHERE mois = %s"
-        return self._execute_query(query, (mois,), fetch_one=True)
\ No newline at end of file
+        return self._execute_query(query, (mois,), fetch_one=True, montants=self.MONTANTS)
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Modèle ResumeJournalier - Table de synthèse par jour
+Maintenue à chaque écriture sur les ventes et les charges
+"""
+
+from .base_model import BaseModel
+
+
+class ResumeJournalierModel(BaseModel):
+    """Synthèse journalière (recette, coût, bénéfice brut, charges, quantités)"""
+    
+    COLONNES = "date_jour, recette_brute, cout_achat, benefice_brut, total_charges, quantite_totale"
+    
+    def refresh_jour(self, date_jour):
+        """Recalculer la synthèse d'un jour"""
+        return self.refresh_jours([date_jour])
+    
+    def refresh_jours(self, dates):
+        """Recalculer la synthèse de plusieurs jours"""
+        dates = list(dict.fromkeys(dates))
+        if not dates:
+            return 0
+        placeholders = ', '.join(['%s'] * len(dates))
+        return self._recalculer("{col} IN (" + placeholders + ")", tuple(dates))
+    
+    def rebuild(self):
+        """Reconstruire entièrement la table de synthèse"""
+        with self.db.transaction():
+            self._execute_query("DELETE FROM resume_journalier")
+            return self._execute_query(self._insert_query("", "", ""))
+    
+    def _recalculer(self, condition, params):
+        """Supprimer puis recalculer les jours vérifiant la condition
+        
+        Args:
+            condition: Prédicat SQL sur une colonne date, écrit avec {col}
+            params: Paramètres du prédicat
+        """
+        with self.db.transaction():
+            self._execute_query(
+                "DELETE FROM resume_journalier WHERE " + condition.format(col='date_jour'),
+                params
+            )
+            return self._execute_query(self.recalcul_query(condition), params * 4)
+    
+    def recalcul_query(self, condition):
+        """INSERT ... SELECT des jours vérifiant la condition (paramètres répétés 4 fois)"""
+        return self._insert_query(
+            "WHERE " + condition.format(col='date_vente'),
+            "WHERE " + condition.format(col='v.date_vente'),
+            "WHERE " + condition.format(col='date_charge')
+        )
+    
+    def _insert_query(self, filtre_union, filtre_ventes, filtre_charges):
+        """INSERT ... SELECT agrégeant ventes et charges des jours filtrés"""
+        return f"""
+            INSERT INTO resume_journalier ({self.COLONNES})
+            SELECT
+                j.date_jour,
+                COALESCE(v.recette_brute, 0),
+                COALESCE(v.cout_achat, 0),
+                COALESCE(v.benefice_brut, 0),
+                COALESCE(c.total_charges, 0),
+                COALESCE(v.quantite_totale, 0)
+            FROM (
+                SELECT date_vente as date_jour FROM ventes {filtre_union}
+                UNION
+                SELECT date_charge FROM charges {filtre_charges}
+            ) j
+            LEFT JOIN (
+                SELECT
+                    v.date_vente,
+                    SUM(v.quantite * v.prix_vente) as recette_brute,
+                    SUM(v.quantite * v.prix_achat) as cout_achat,
+                    SUM(v.quantite * (v.prix_vente - v.prix_achat)) as benefice_brut,
+                    SUM(v.quantite) as quantite_totale
+                FROM ventes v
+                {filtre_ventes}
+                GROUP BY v.date_vente
+            ) v ON v.date_vente = j.date_jour
+            LEFT JOIN (
+                SELECT date_charge, SUM(montant) as total_charges
+                FROM charges
+                {filtre_charges}
+                GROUP BY date_charge
+            ) c ON c.date_charge = j.date_jour
+        """
\ No newline at end of file
@@ -3,7 +3,7 @@ Modèle Salaire - Gestion des salaires mensuels
 """
 
 from .base_model import BaseModel
-from decimal import Decimal
+from utils.money import Money, ZERO
 
 
 class SalaireModel(BaseModel):
@@ -12,19 +12,25 @@ class SalaireModel(BaseModel):
     def create(self, mois, nom_employe, montant):
         """Ajouter un salaire"""
         query = "INSERT INTO salaires_mensuels (mois, nom_employe, montant) VALUES (%s, %s, %s)"
-        return self._execute_query(query, (mois, nom_employe, montant))
+        salaire_id = self._execute_query(query, (mois, nom_employe, Money.from_dinars(montant)))
+        self._invalidate('salaires_mensuels', mois)
+        return salaire_id
     
     def get_by_month(self, mois):
         """Récupérer les salaires d'un mois"""
         query = "SELECT * FROM salaires_mensuels WHERE mois = %s ORDER BY nom_employe"
-        return self._execute_query(query, (mois,), fetch_all=True)
+        return self._execute_query(query, (mois,), fetch_all=True, montants=('montant',))
     
     def delete(self, salaire_id):
         """Supprimer un salaire"""
         query = "DELETE FROM salaires_mensuels WHERE id = %s"
-        return self._execute_query(query, (salaire_id,))
+        result = self._execute_query(query, (salaire_id,))
+        # Le mois du salaire supprimé n'est pas connu : tous les mois sont invalidés
+        self._invalidate('salaires_mensuels')
+        return result
     
     def get_total_by_month(self, mois):
         """Total des salaires d'un mois"""
-        salaires = self.get_by_month(mois)
-        return sum(Decimal(str(s['montant'])) for s in salaires)
\ No newline at end of file
+        query = "SELECT SUM(montant) as total FROM salaires_mensuels WHERE mois = %s"
+        result = self._execute_query(query, (mois,), fetch_one=True, montants=('total',))
+        return result['total'] if result else ZERO
\ No newline at end of file
@@ -3,30 +3,92 @@ Modèle Vente - Gestion des ventes quotidiennes
 """
 
 from .base_model import BaseModel
+from .article import ArticleModel
+from .resume_journalier import ResumeJournalierModel
 from datetime import date, timedelta
 
 
 class VenteModel(BaseModel):
     """Gestion des ventes"""
     
+    HISTORIQUE_MONTANTS = ('recette_brute', 'cout_achat', 'benefice_brut', 'total_charges', 'benefice_net')
+    
+    def __init__(self):
+        super().__init__()
+        self.resume = ResumeJournalierModel()
+        self.articles = ArticleModel()
+    
     def save(self, date_vente, article_id, quantite):
         """Enregistrer ou mettre à jour une vente"""
-        query = """
-            INSERT INTO ventes (date_vente, article_id, quantite) 
-            VALUES (%s, %s, %s)
-            ON DUPLICATE KEY UPDATE quantite = %s
+        return self.save_many([(date_vente, article_id, quantite)])
+    
+    def save_many(self, lignes):
+        """Enregistrer plusieurs ventes en une seule requête (une seule transaction)
+        
+        Les prix d'achat et de vente de l'article sont figés sur la ligne à sa
+        création : une modification de prix ne réécrit pas les jours passés.
+        
+        Args:
+            lignes: Liste de tuples (date_vente, article_id, quantite)
         """
-        return self._execute_query(query, (date_vente, article_id, quantite, quantite))
+        if not lignes:
+            return 0
+        query = self.db.engine.upsert_query(
+            'ventes',
+            ('date_vente', 'article_id', 'quantite', 'prix_achat', 'prix_vente'),
+            keys=('date_vente', 'article_id'),
+            updates=('quantite',),
+            nb_lignes=len(lignes),
+            ligne="""(%s, %s, %s,
+                (SELECT prix_achat FROM articles WHERE id = %s),
+                (SELECT prix_vente FROM articles WHERE id = %s))"""
+        )
+        params = tuple(
+            valeur
+            for date_vente, article_id, quantite in lignes
+            for valeur in (date_vente, article_id, quantite, article_id, article_id)
+        )
+        jours = [ligne[0] for ligne in lignes]
+        with self.db.transaction():
+            result = self._execute_query(query, params)
+            self.resume.refresh_jours(jours)
+            self._invalidate('ventes', *jours)
+        return result
     
     def get_by_date(self, date_vente):
         """Récupérer les ventes d'une date"""
         query = """
-            SELECT v.*, a.nom, a.prix_achat, a.prix_vente
+            SELECT v.*, a.nom
             FROM ventes v
             JOIN articles a ON v.article_id = a.id
             WHERE v.date_vente = %s
         """
-        return self._execute_query(query, (date_vente,), fetch_all=True)
+        return self._execute_query(query, (date_vente,), fetch_all=True, montants=ArticleModel.MONTANTS)
+    
+    def get_feuille_jour(self, date_vente):
+        """Catalogue des articles actifs avec la quantité vendue ce jour
+        
+        Les articles viennent du catalogue en mémoire : seule la table ventes est lue.
+        Les prix sont ceux figés sur la vente du jour, sinon ceux du catalogue.
+        """
+        query = "SELECT article_id, quantite, prix_achat, prix_vente FROM ventes WHERE date_vente = %s"
+        ventes = {
+            row['article_id']: row
+            for row in self._execute_query(query, (date_vente,), fetch_all=True, montants=ArticleModel.MONTANTS)
+        }
+        
+        feuille = []
+        for article in self.articles.get_all():
+            vente = ventes.get(article.id)
+            feuille.append({
+                'id': article.id,
+                'nom': article.nom,
+                'actif': article.actif,
+                'prix_achat': vente['prix_achat'] if vente and vente['prix_achat'] is not None else article.prix_achat,
+                'prix_vente': vente['prix_vente'] if vente and vente['prix_vente'] is not None else article.prix_vente,
+                'quantite': vente['quantite'] if vente else 0,
+            })
+        return feuille
     
     def get_quantite(self, date_vente, article_id):
         """Récupérer la quantité vendue"""
@@ -37,45 +99,156 @@ class VenteModel(BaseModel):
     def delete_by_date(self, date_vente):
         """Supprimer toutes les ventes d'une date"""
         query = "DELETE FROM ventes WHERE date_vente = %s"
-        return self._execute_query(query, (date_vente,))
+        with self.db.transaction():
+            result = self._execute_query(query, (date_vente,))
+            self.resume.refresh_jour(date_vente)
+            self._invalidate('ventes', date_vente)
+        return result
+    
+    def reset_quantites(self, date_vente):
+        """Remettre à 0 toutes les quantités d'une date"""
+        query = "UPDATE ventes SET quantite = 0 WHERE date_vente = %s"
+        with self.db.transaction():
+            result = self._execute_query(query, (date_vente,))
+            self.resume.refresh_jour(date_vente)
+            self._invalidate('ventes', date_vente)
+        return result
     
     def get_historique(self, limit=30):
-        """Récupérer l'historique des ventes"""
+        """Historique journalier : ventes, charges et bénéfice net (table de synthèse)"""
         query = """
             SELECT 
-                v.date_vente,
-                SUM(v.quantite * a.prix_vente) as recette_brute,
-                SUM(v.quantite * a.prix_achat) as cout_achat,
-                SUM(v.quantite * (a.prix_vente - a.prix_achat)) as benefice_brut
-            FROM ventes v
-            JOIN articles a ON v.article_id = a.id
-            GROUP BY v.date_vente
-            ORDER BY v.date_vente DESC
+                date_jour as date_vente,
+                recette_brute,
+                cout_achat,
+                benefice_brut,
+                total_charges,
+                benefice_brut - total_charges as benefice_net
+            FROM resume_journalier
+            ORDER BY date_jour DESC
+            LIMIT %s
+        """
+        return self._execute_query(query, (limit,), fetch_all=True, montants=self.HISTORIQUE_MONTANTS)
+    
+    def get_historique_page(self, debut, fin, avant=None, limit=100):
+        """Page de l'historique d'une période, jours décroissants
+        
+        Pagination par clé : la page suivante commence après le dernier jour
+        de la précédente (lecture de l'index, quelle que soit la profondeur).
+        
+        Args:
+            avant: Dernier jour de la page précédente (None pour la première page)
+            limit: Jours par page
+        """
+        params = (debut, fin) if avant is None else (debut, min(fin, avant - timedelta(days=1)))
+        query = """
+            SELECT
+                date_jour as date_vente,
+                recette_brute,
+                cout_achat,
+                benefice_brut,
+                total_charges,
+                benefice_brut - total_charges as benefice_net
+            FROM resume_journalier
+            WHERE date_jour BETWEEN %s AND %s
+            ORDER BY date_jour DESC
             LIMIT %s
         """
-        return self._execute_query(query, (limit,), fetch_all=True)
+        return self._execute_query(query, params + (limit,), fetch_all=True, montants=self.HISTORIQUE_MONTANTS)
+    
+    def count_historique(self, debut, fin):
+        """Nombre de jours de l'historique d'une période"""
+        query = "SELECT COUNT(*) as nb_jours FROM resume_journalier WHERE date_jour BETWEEN %s AND %s"
+        result = self._execute_query(query, (debut, fin), fetch_one=True)
+        return result['nb_jours'] if result else 0
+    
+    def iter_historique(self, debut, fin, row_type='tuple', batch_size=500, batches=False):
+        """Historique journalier d'une période, lu en flux (jours croissants)
+        
+        Args:
+            batches: Produire des lots de batch_size lignes plutôt que des lignes
+        """
+        query = """
+            SELECT 
+                date_jour as date_vente,
+                recette_brute,
+                cout_achat,
+                benefice_brut,
+                total_charges,
+                benefice_brut - total_charges as benefice_net
+            FROM resume_journalier
+            WHERE date_jour BETWEEN %s AND %s
+            ORDER BY date_jour ASC
+        """
+        return self._stream_query(query, (debut, fin), row_type=row_type,
+                                  batch_size=batch_size, batches=batches,
+                                  montants=self.HISTORIQUE_MONTANTS)
+    
+    def iter_quantites_articles(self, premier_jour, dernier_jour, row_type='namedtuple'):
+        """Quantités et montants vendus par article sur une période, lus en flux"""
+        query = """
+            SELECT a.nom, q.quantite_totale, q.total_vente
+            FROM (
+                SELECT 
+                    article_id,
+                    SUM(quantite) as quantite_totale,
+                    SUM(quantite * prix_vente) as total_vente
+                FROM ventes
+                WHERE date_vente BETWEEN %s AND %s AND quantite > 0
+                GROUP BY article_id
+            ) q
+            JOIN articles a ON q.article_id = a.id
+            ORDER BY q.quantite_totale DESC
+        """
+        return self._stream_query(query, (premier_jour, dernier_jour), row_type=row_type,
+                                  montants=('total_vente',))
+    
+    def iter_lignes_periode(self, debut, fin, batch_size=5000):
+        """Lignes de vente d'une période, lues en flux par lots de tuples
+        
+        (date_vente, article_id, quantite, prix_vente, prix_achat) : les prix
+        restent en millimes (int) pour être chargés tels quels dans des tableaux.
+        """
+        query = """
+            SELECT
+                date_vente,
+                article_id,
+                quantite,
+                prix_vente,
+                prix_achat
+            FROM ventes
+            WHERE date_vente BETWEEN %s AND %s AND quantite > 0
+        """
+        return self._stream_query(query, (debut, fin), row_type='tuple', batch_size=batch_size, batches=True)
     
     def get_ventes_mois(self, premier_jour, dernier_jour):
         """Récupérer les ventes d'un mois"""
         query = """
             SELECT 
-                SUM(v.quantite * a.prix_vente) as recette_brute,
-                SUM(v.quantite * a.prix_achat) as cout_achat,
-                SUM(v.quantite * (a.prix_vente - a.prix_achat)) as benefice_brut
-            FROM ventes v
-            JOIN articles a ON v.article_id = a.id
-            WHERE v.date_vente BETWEEN %s AND %s
+                SUM(recette_brute) as recette_brute,
+                SUM(cout_achat) as cout_achat,
+                SUM(benefice_brut) as benefice_brut
+            FROM resume_journalier
+            WHERE date_jour BETWEEN %s AND %s
         """
-        return self._execute_query(query, (premier_jour, dernier_jour), fetch_one=True)
+        return self._execute_query(query, (premier_jour, dernier_jour), fetch_one=True,
+                                   montants=('recette_brute', 'cout_achat', 'benefice_brut'))
     
     def get_quantites_articles_mois(self, premier_jour, dernier_jour):
         """Quantités vendues par article pour un mois"""
         query = """
-            SELECT a.nom, SUM(v.quantite) as quantite_totale, a.prix_vente
-            FROM ventes v
-            JOIN articles a ON v.article_id = a.id
-            WHERE v.date_vente BETWEEN %s AND %s
-            GROUP BY a.id, a.nom, a.prix_vente
-            ORDER BY quantite_totale DESC
+            SELECT a.nom, q.quantite_totale, q.total_vente
+            FROM (
+                SELECT 
+                    article_id,
+                    SUM(quantite) as quantite_totale,
+                    SUM(quantite * prix_vente) as total_vente
+                FROM ventes
+                WHERE date_vente BETWEEN %s AND %s
+                GROUP BY article_id
+            ) q
+            JOIN articles a ON q.article_id = a.id
+            ORDER BY q.quantite_totale DESC
         """
-        return self._execute_query(query, (premier_jour, dernier_jour), fetch_all=True)
\ No newline at end of file
+        return self._execute_query(query, (premier_jour, dernier_jour), fetch_all=True,
+                                   montants=('total_vente',))
\ No newline at end of file
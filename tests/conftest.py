@@ -0,0 +1,48 @@
+"""
+Configuration des tests : base SQLite temporaire remplie par le générateur
+Les variables SULTAN_* sont fixées avant le premier import de config.settings
+"""
+
+import os
+import tempfile
+from datetime import date
+
+import pytest
+
+
+DOSSIER = tempfile.mkdtemp(prefix='sultan_tests_')
+os.environ['SULTAN_DB_ENGINE'] = 'sqlite'
+os.environ['SULTAN_DATA_DIR'] = DOSSIER
+
+from config import settings
+# Journaux écrits dans le dossier temporaire (avant le premier import de utils.logger)
+settings.LOG_FOLDER = os.path.join(DOSSIER, 'logs')
+
+# Dernier jour de l'historique généré
+FIN = date(2024, 6, 30)
+
+
+@pytest.fixture(scope='session')
+def db():
+    """Connexion à la base de test (migrations appliquées)"""
+    from config.database import DatabaseConnection
+    return DatabaseConnection()
+
+
+@pytest.fixture(scope='session')
+def donnees(db):
+    """Six mois d'historique synthétique, générés une fois pour toute la session"""
+    from benchmarks.generateur import generer
+    return generer(annees=0.5, articles=12, charges_par_jour=1, salaries=2, fin=FIN)
+
+
+@pytest.fixture
+def lire(db):
+    """Exécuter une requête brute (montants en millimes) et renvoyer les lignes"""
+    def lire(query, params=()):
+        cursor = db.engine.cursor(db.get_connection())
+        cursor.execute(query, params)
+        lignes = cursor.fetchall()
+        cursor.close()
+        return lignes
+    return lire
@@ -0,0 +1,22 @@
+"""
+Tests du contrôleur de bilan mensuel
+"""
+
+from conftest import FIN
+from controllers import BilanController
+from utils.money import Money, ZERO
+
+
+def test_charges_fixes_mois(donnees, capsys):
+    controleur = BilanController()
+    mois = FIN.replace(day=1)
+    financier = controleur.calculate_bilan_financier(controleur.get_bilan_complet(mois))
+    
+    charges = controleur.get_charges_fixes_mois(mois)
+    
+    assert charges
+    assert all(isinstance(charge['montant'], Money) and charge['montant'] > 0 for charge in charges)
+    assert all(charge['date'] == mois for charge in charges)
+    total = sum((charge['montant'] for charge in charges), ZERO)
+    assert total == financier['charges_fixes'] + financier['total_salaires']
+    assert capsys.readouterr().out == ''
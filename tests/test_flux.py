@@ -0,0 +1,56 @@
+"""
+Tests des lectures en flux (_stream_query) et de leur mesure
+"""
+
+import time
+from datetime import timedelta
+
+from conftest import FIN
+from models import VenteModel
+from utils.instrumentation import QueryStats
+from utils.money import Money
+
+
+DEBUT = FIN - timedelta(days=59)
+
+
+def test_flux_sans_instrumentation(donnees, monkeypatch):
+    monkeypatch.setattr(QueryStats(), 'enabled', False)
+    modele = VenteModel()
+    
+    jours = list(modele.iter_historique(DEBUT, FIN))
+    assert len(jours) == 60
+    assert [jour[0] for jour in jours] == sorted(jour[0] for jour in jours)
+    
+    lots = list(modele.iter_historique(DEBUT, FIN, batch_size=25, batches=True))
+    assert [len(lot) for lot in lots] == [25, 25, 10]
+    assert sum(1 for _ in modele.iter_quantites_articles(DEBUT, FIN)) > 0
+    assert sum(len(lot) for lot in modele.iter_lignes_periode(DEBUT, FIN)) > 0
+
+
+def test_flux_duree_sans_le_consommateur(donnees):
+    stats = QueryStats()
+    with stats.capture() as requetes:
+        for lot in VenteModel().iter_historique(DEBUT, FIN, batch_size=20, batches=True):
+            time.sleep(0.05)    # Écriture lente côté consommateur
+    
+    (methode, _, duree_ms, lignes, _, _), = requetes
+    assert methode == 'VenteModel.iter_historique'
+    assert lignes == 60
+    assert duree_ms < 50
+
+
+def test_montants_declares_par_requete(donnees):
+    modele = VenteModel()
+    
+    jour = next(modele.iter_historique(DEBUT, FIN, row_type='dict'))
+    assert isinstance(jour['recette_brute'], Money)
+    assert isinstance(jour['benefice_net'], Money)
+    
+    # Prix non déclarés : millimes bruts, prêts pour les tableaux numpy
+    ligne = next(iter(next(modele.iter_lignes_periode(DEBUT, FIN))))
+    assert type(ligne[3]) is int and type(ligne[4]) is int
+    
+    # Un alias qui porte un nom de montant n'est pas converti s'il n'est pas déclaré
+    compte = modele._execute_query("SELECT COUNT(*) as total FROM ventes", fetch_one=True)
+    assert type(compte['total']) is int
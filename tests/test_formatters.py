@@ -0,0 +1,22 @@
+"""
+Tests des formateurs d'affichage
+"""
+
+from decimal import Decimal
+
+from utils.formatters import format_currency, format_number
+from utils.money import Money
+
+
+def test_format_number_distingue_montants_et_nombres():
+    assert format_number(Money(1234567)) == '1 234.567'
+    assert format_number(12345) == '12 345'
+    assert format_number(1234.5) == '1 234.50'
+    assert format_number(Decimal('0.25')) == '0.25'
+    assert format_number(None) == '0'
+
+
+def test_format_currency_au_millime():
+    assert format_currency(Money(1500)).startswith('1.500 ')
+    assert format_currency(2.5).startswith('2.500 ')
+    assert format_currency(None).startswith('0.000 ')
@@ -0,0 +1,169 @@
+"""
+Tests des migrations : conversion des montants en millimes (migration 5)
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from config import migrations
+from config.engines import SQLiteEngine
+from config.migrations import MONTANTS_MILLIMES, get_schema_version, run_migrations
+
+
+def migrer_jusqua(engine, connection, version, monkeypatch):
+    """Appliquer les migrations en attente jusqu'à la version donnée"""
+    toutes = migrations.MIGRATIONS
+    monkeypatch.setattr(migrations, 'MIGRATIONS', [m for m in toutes if m[0] <= version])
+    try:
+        return run_migrations(engine, connection)
+    finally:
+        monkeypatch.setattr(migrations, 'MIGRATIONS', toutes)
+
+
+@pytest.fixture
+def base_neuve(tmp_path):
+    engine = SQLiteEngine({'path': str(tmp_path / 'migration.db'), 'pragmas': {'foreign_keys': 'ON'}})
+    connection = engine.connect()
+    yield engine, connection
+    connection.close()
+
+
+@pytest.fixture
+def base_v4(base_neuve, monkeypatch):
+    """Base SQLite neuve arrêtée à la version 4 (montants décimaux)"""
+    migrer_jusqua(*base_neuve, 4, monkeypatch)
+    return base_neuve
+
+
+def executer(connection, query, params=()):
+    return connection.execute(query.replace('%s', '?'), params).fetchall()
+
+
+def test_migration_2_relancee_apres_remplissage(base_neuve, monkeypatch):
+    engine, connection = base_neuve
+    migrer_jusqua(engine, connection, 1, monkeypatch)
+    executer(connection, "INSERT INTO articles (nom, prix_achat, prix_vente) VALUES ('Thé', 0.5, 1.5)")
+    executer(connection, "INSERT INTO ventes (date_vente, article_id, quantite) VALUES ('2024-03-01', 1, 4)")
+    executer(connection, "INSERT INTO charges (date_charge, description, montant) VALUES ('2024-03-02', 'Gaz', 10)")
+    assert migrer_jusqua(engine, connection, 2, monkeypatch) == [2]
+    
+    # Interruption simulée : synthèse remplie, version 2 non enregistrée
+    executer(connection, "DELETE FROM schema_version WHERE version = 2")
+    assert get_schema_version(engine, connection) == 1
+    
+    assert migrer_jusqua(engine, connection, 2, monkeypatch) == [2]
+    assert executer(connection,
+        "SELECT date_jour, recette_brute, cout_achat, total_charges, quantite_totale "
+        "FROM resume_journalier ORDER BY date_jour"
+    ) == [(date(2024, 3, 1), 6, 2, 0, 4), (date(2024, 3, 2), 0, 0, 10, 0)]
+
+
+def test_conversion_en_millimes(base_v4):
+    engine, connection = base_v4
+    assert get_schema_version(engine, connection) == 4
+    
+    executer(connection, "INSERT INTO articles (nom, prix_achat, prix_vente) VALUES ('Thé', 0.45, 1.2)")
+    executer(connection, "INSERT INTO articles (nom, prix_achat, prix_vente) VALUES ('Café', 1, 2.35)")
+    executer(connection,
+        "INSERT INTO ventes (date_vente, article_id, quantite, prix_achat, prix_vente) "
+        "VALUES ('2024-03-01', 1, 10, 0.4, 1.1), ('2024-03-01', 2, 3, 1, 2.35)")
+    executer(connection, "INSERT INTO charges (date_charge, description, montant) VALUES ('2024-03-01', 'Gaz', 12.75)")
+    executer(connection,
+        "INSERT INTO charges_fixes_mensuelles (mois, loyer, electricite, eau, impot, municipalite, "
+        "terrasse, internet, autres) VALUES ('2024-03-01', 900, 120.5, 35.25, 50, 30, 100, 45, 0)")
+    executer(connection, "INSERT INTO salaires_mensuels (mois, nom_employe, montant) VALUES ('2024-03-01', 'Ali', 650.5)")
+    executer(connection,
+        "INSERT INTO resume_journalier (date_jour, recette_brute, cout_achat, benefice_brut, total_charges, "
+        "quantite_totale) VALUES ('2024-03-01', 18.05, 7, 11.05, 12.75, 13)")
+    
+    assert run_migrations(engine, connection) == [5]
+    
+    assert executer(connection, "SELECT prix_achat, prix_vente FROM articles ORDER BY id") == [(450, 1200), (1000, 2350)]
+    assert executer(connection, "SELECT prix_achat, prix_vente FROM ventes ORDER BY article_id") == [(400, 1100), (1000, 2350)]
+    assert executer(connection, "SELECT montant FROM charges") == [(12750,)]
+    assert executer(connection, "SELECT loyer, electricite, eau FROM charges_fixes_mensuelles") == [(900000, 120500, 35250)]
+    assert executer(connection, "SELECT montant FROM salaires_mensuels") == [(650500,)]
+    assert executer(connection,
+        "SELECT recette_brute, cout_achat, benefice_brut, total_charges, quantite_totale FROM resume_journalier"
+    ) == [(18050, 7000, 11050, 12750, 13)]
+    
+    # Colonnes entières, index et clés étrangères reconstruits
+    for table, colonnes in MONTANTS_MILLIMES.items():
+        types = {ligne[1]: ligne[2] for ligne in executer(connection, f"PRAGMA table_info({table})")}
+        assert all(types[colonne] == 'INTEGER' for colonne, _ in colonnes), table
+    index = {ligne[0] for ligne in executer(connection, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_ventes_periode', 'idx_ventes_article', 'idx_charges_date_montant', 'idx_mois'} <= index
+    assert executer(connection, "PRAGMA foreign_key_check") == []
+    
+    # Une seule application
+    assert run_migrations(engine, connection) == []
+    assert executer(connection, "SELECT montant FROM charges") == [(12750,)]
+
+
+class CurseurMySQLSimule:
+    """Curseur imitant MySQL pour la migration 5 : chaque ALTER TABLE valide
+    la transaction en cours, et l'instruction numéro `panne` échoue"""
+    
+    def __init__(self, panne=None):
+        self.types = {(table, colonne): 'decimal' for table, colonnes in MONTANTS_MILLIMES.items() for colonne, _ in colonnes}
+        self.valeurs = {table: Decimal('1.5') for table in MONTANTS_MILLIMES}
+        self.etapes = set()
+        self.sauvegarde = None
+        self.panne = panne
+        self.nb = 0
+        self.resultat = []
+    
+    def execute(self, query, params=()):
+        query = ' '.join(query.split())
+        self.nb += 1
+        if self.nb == self.panne:
+            raise Exception("Lock wait timeout exceeded")
+        self.resultat = []
+        if 'information_schema.COLUMNS' in query:
+            self.resultat = [(self.types[params].encode(),)]
+        elif query.startswith('SELECT etape'):
+            self.resultat = [(etape,) for _, etape in self.etapes]
+        elif query == 'START TRANSACTION':
+            self.sauvegarde = (dict(self.valeurs), set(self.etapes))
+        elif query == 'COMMIT':
+            self.sauvegarde = None
+        elif query.startswith('INSERT INTO migration_etapes'):
+            self.etapes.add(params)
+        elif query.startswith('UPDATE'):
+            table = query.split()[1]
+            self.valeurs[table] = self.valeurs[table] * 1000
+        elif query.startswith('ALTER TABLE'):
+            self.sauvegarde = None
+            table = query.split()[2]
+            if 'BIGINT' in query:
+                for colonne, _ in MONTANTS_MILLIMES[table]:
+                    self.types[(table, colonne)] = 'bigint'
+    
+    def fetchall(self):
+        return self.resultat
+    
+    def rollback(self):
+        if self.sauvegarde is not None:
+            self.valeurs, self.etapes = self.sauvegarde
+            self.sauvegarde = None
+
+
+def test_migration_mysql_reprise_sans_double_conversion():
+    # Nombre d'instructions d'une migration complète
+    complet = CurseurMySQLSimule()
+    migrations._montants_millimes_mysql(complet)
+    assert set(complet.valeurs.values()) == {1500}
+    
+    for panne in range(1, complet.nb + 1):
+        curseur = CurseurMySQLSimule(panne)
+        with pytest.raises(Exception):
+            migrations._montants_millimes_mysql(curseur)
+        curseur.rollback()
+        
+        # Redémarrage : la migration reprend là où elle s'est arrêtée
+        curseur.panne = None
+        migrations._montants_millimes_mysql(curseur)
+        assert set(curseur.valeurs.values()) == {1500}, panne
+        assert set(curseur.types.values()) == {'bigint'}, panne
@@ -0,0 +1,81 @@
+"""
+Tests du type Money (montants en millimes)
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from utils.money import Money, ZERO
+
+
+@pytest.mark.parametrize('dinars, millimes', [
+    (2, 2000),
+    (1.5, 1500),
+    (0.1, 100),
+    ('2.345', 2345),
+    (Decimal('0.0005'), 1),     # Demi-millime arrondi vers le haut
+    (None, 0),
+    ('', 0),
+])
+def test_from_dinars(dinars, millimes):
+    assert Money.from_dinars(dinars).millimes == millimes
+
+
+def test_addition_exacte():
+    total = sum([Money.from_dinars(0.1)] * 10, ZERO)
+    assert total == Money(1000)
+    assert sum(Money(250) for _ in range(4)) == Money(1000)
+
+
+def test_operations_avec_des_nombres():
+    assert Money.from_dinars(2) + 0.5 == Money(2500)
+    assert 3 - Money(500) == Money(2500)
+    assert Money(1500) - Decimal('0.25') == Money(1250)
+    assert -Money(1500) == Money(-1500)
+    assert abs(Money(-1500)) == Money(1500)
+
+
+def test_multiplication_par_une_quantite():
+    assert Money(1250) * 3 == Money(3750)
+    assert 4 * Money(1250) == Money(5000)
+    with pytest.raises(TypeError):
+        Money(1250) * 1.5
+
+
+def test_division():
+    # Répartition d'un total mensuel sur les jours, arrondie au millime
+    assert Money(1000) / 3 == Money(333)
+    assert Money(2000) / 3 == Money(667)
+    assert Money(1) / 2 == Money(1)
+    # Rapport entre deux montants
+    assert Money(500) / Money(2000) == 0.25
+
+
+def test_comparaisons():
+    assert Money(1500) < Money(2000)
+    assert Money(1500) <= 1.5 <= Money(1500)
+    assert Money(1500) > 1.4999
+    assert not Money(1500) < 1.5
+    assert not ZERO
+    assert Money(1)
+
+
+def test_egalite_et_hachage_avec_des_nombres():
+    for montant, nombre in [(Money(1500), 1.5), (Money(2000), 2), (Money(1250), Decimal('1.25'))]:
+        assert montant == nombre
+        assert hash(montant) == hash(nombre)
+    # Comparaison exacte : le flottant 0.1 n'est pas exactement 0.1 dinar
+    assert Money(100) != 0.1
+    assert Money(100) == Decimal('0.1')
+    assert len({Money(1500), 1.5, Money(1500)}) == 1
+    assert {2: 'x'}[Money(2000)] == 'x'
+
+
+def test_conversions():
+    assert str(Money(1500)) == '1.500'
+    assert str(Money(-5)) == '-0.005'
+    assert repr(Money(1234)) == "Money('1.234')"
+    assert f"{Money(1234567):,.3f}" == '1,234.567'
+    assert float(Money(1500)) == 1.5
+    assert Money(1234).to_decimal() == Decimal('1.234')
@@ -0,0 +1,94 @@
+"""
+Tests de la synthèse journalière : save_many / refresh_jours gardent
+resume_journalier égale aux agrégats calculés depuis ventes et charges
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from conftest import FIN
+from models import ArticleModel, ChargeModel, VenteModel
+
+
+def resume_attendu(lire):
+    """Synthèse recalculée en Python à partir des tables sources (millimes)"""
+    jours = defaultdict(lambda: [0, 0, 0, 0])     # recette, coût, charges, quantité
+    for jour, quantite, prix_vente, prix_achat in lire(
+        "SELECT date_vente, quantite, prix_vente, prix_achat FROM ventes"
+    ):
+        jours[jour][0] += quantite * prix_vente
+        jours[jour][1] += quantite * prix_achat
+        jours[jour][3] += quantite
+    for jour, montant in lire("SELECT date_charge, montant FROM charges"):
+        jours[jour][2] += montant
+    return {
+        jour: (recette, cout, recette - cout, charges, quantite)
+        for jour, (recette, cout, charges, quantite) in jours.items()
+    }
+
+
+def resume_stocke(lire):
+    return {
+        ligne[0]: tuple(ligne[1:])
+        for ligne in lire(
+            "SELECT date_jour, recette_brute, cout_achat, benefice_brut, total_charges, quantite_totale "
+            "FROM resume_journalier"
+        )
+    }
+
+
+def test_generation_coherente(donnees, lire):
+    stocke = resume_stocke(lire)
+    assert len(stocke) == donnees['jours']
+    assert stocke == resume_attendu(lire)
+
+
+def test_save_many_met_a_jour_les_jours_touches(donnees, lire):
+    articles = [article.id for article in ArticleModel().get_all()]
+    veille, jour = FIN - timedelta(days=1), FIN
+    
+    VenteModel().save_many([
+        (veille, articles[0], 7),
+        (jour, articles[0], 0),
+        (jour, articles[1], 25),
+        (jour, articles[2], 3),
+    ])
+    
+    assert resume_stocke(lire) == resume_attendu(lire)
+
+
+def test_jour_nouveau_et_charges(donnees, lire):
+    articles = [article.id for article in ArticleModel().get_all()]
+    jour = FIN + timedelta(days=5)
+    
+    ChargeModel().create(jour, 'Gaz', 12.5)
+    assert resume_stocke(lire)[jour] == (0, 0, 0, 12500, 0)
+    
+    VenteModel().save_many([(jour, articles[0], 2), (jour, articles[3], 1)])
+    assert resume_stocke(lire) == resume_attendu(lire)
+
+
+def test_prix_figes_sur_les_ventes_passees(donnees, lire):
+    article_model = ArticleModel()
+    article = article_model.get_all()[0]
+    jour = FIN - timedelta(days=10)
+    VenteModel().save_many([(jour, article.id, 4)])
+    avant = resume_stocke(lire)[jour]
+    
+    article_model.update(article.id, article.nom, article.prix_achat * 2, article.prix_vente * 2)
+    VenteModel().save_many([(jour, article.id, 5)])
+    
+    # Quantité modifiée, prix de la ligne inchangés
+    prix_vente = article.prix_vente.millimes
+    assert resume_stocke(lire)[jour][0] == avant[0] + prix_vente
+    assert resume_stocke(lire) == resume_attendu(lire)
+
+
+def test_refresh_jours_repare_une_synthese_faussee(donnees, lire, db):
+    jour = FIN - timedelta(days=20)
+    with db.transaction():
+        lire("UPDATE resume_journalier SET recette_brute = 0, quantite_totale = 0 WHERE date_jour = %s", (jour,))
+    assert resume_stocke(lire) != resume_attendu(lire)
+    
+    VenteModel().resume.refresh_jours([jour, jour])
+    assert resume_stocke(lire) == resume_attendu(lire)
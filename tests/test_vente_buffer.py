@@ -0,0 +1,167 @@
+"""
+Tests du tampon d'écriture différée des ventes : écriture groupée,
+rejeu du journal au démarrage et mise à l'écart des saisies refusées
+"""
+
+import json
+import threading
+from datetime import timedelta
+
+import pytest
+
+from conftest import FIN
+from config.settings import WRITE_BUFFER_CONFIG
+from controllers.vente_buffer import VenteWriteBuffer
+from models import ArticleModel, VenteModel
+
+
+JOUR = FIN + timedelta(days=30)
+
+
+@pytest.fixture
+def nouveau_buffer(donnees, tmp_path, monkeypatch):
+    """Fabrique d'instances neuves du singleton, avec un journal propre au test"""
+    monkeypatch.setitem(WRITE_BUFFER_CONFIG, 'journal', str(tmp_path / 'ventes_en_attente.jsonl'))
+    # Pas d'écriture par le minuteur pendant le test
+    monkeypatch.setitem(WRITE_BUFFER_CONFIG, 'flush_interval', 60)
+    
+    def creer():
+        monkeypatch.setattr(VenteWriteBuffer, '_instance', None)
+        return VenteWriteBuffer()
+    return creer
+
+
+@pytest.fixture
+def articles(donnees):
+    return [article.id for article in ArticleModel().get_all()]
+
+
+def lire_journal(buffer):
+    if not buffer.journal_path.exists():
+        return []
+    with open(buffer.journal_path, encoding='utf-8') as f:
+        return [json.loads(ligne) for ligne in f]
+
+
+def test_flush_ecrit_les_saisies_et_vide_le_journal(nouveau_buffer, articles):
+    buffer = nouveau_buffer()
+    buffer.add(JOUR, articles[0], 3)
+    buffer.add(JOUR, articles[1], 4)
+    buffer.add(JOUR, articles[0], 5)        # La dernière saisie l'emporte
+    
+    assert buffer.get(JOUR, articles[0]) == 5
+    assert buffer.pending_for(JOUR) == {articles[0]: 5, articles[1]: 4}
+    assert len(lire_journal(buffer)) == 3
+    
+    assert buffer.flush() is True
+    assert buffer.pending_for(JOUR) == {}
+    assert not buffer.journal_path.exists()
+    
+    modele = VenteModel()
+    assert modele.get_quantite(JOUR, articles[0]) == 5
+    assert modele.get_quantite(JOUR, articles[1]) == 4
+
+
+def test_journal_rejoue_au_demarrage(nouveau_buffer, articles):
+    jour = JOUR + timedelta(days=1)
+    buffer = nouveau_buffer()
+    with open(buffer.journal_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'date_vente': jour.isoformat(), 'article_id': articles[2], 'quantite': 9}) + '\n')
+        f.write(json.dumps({'date_vente': jour.isoformat(), 'article_id': articles[2], 'quantite': 11}) + '\n')
+        f.write('{"date_vente": "2024-')       # Dernière ligne tronquée par une coupure
+    
+    # Nouvelle session : le journal est relu puis écrit en base
+    buffer = nouveau_buffer()
+    assert VenteModel().get_quantite(jour, articles[2]) == 11
+    assert buffer.pending_for(jour) == {}
+    assert not buffer.journal_path.exists()
+
+
+def test_echec_passager_garde_les_saisies(nouveau_buffer, articles):
+    jour = JOUR + timedelta(days=2)
+    buffer = nouveau_buffer()
+    buffer.add(jour, articles[0], 6)
+    
+    def panne(lignes):
+        raise Exception("Aucune connexion disponible")
+    buffer.model.save_many = panne
+    try:
+        assert buffer.flush() is False
+    finally:
+        del buffer.model.save_many
+    assert buffer.pending_for(jour) == {articles[0]: 6}
+    assert lire_journal(buffer) == [{'date_vente': jour.isoformat(), 'article_id': articles[0], 'quantite': 6}]
+    assert buffer.prendre_rejetees() == []
+    
+    assert buffer.flush() is True
+    assert VenteModel().get_quantite(jour, articles[0]) == 6
+
+
+def test_saisie_refusee_ne_bloque_pas_les_autres(nouveau_buffer, articles):
+    jour = JOUR + timedelta(days=3)
+    article_model = ArticleModel()
+    supprime = article_model.create('Article supprimé', 1, 2)
+    
+    buffer = nouveau_buffer()
+    buffer.add(jour, articles[0], 2)
+    buffer.add(jour, supprime, 5)
+    buffer.add(jour, articles[1], 1)
+    # Article supprimé pendant que sa quantité attendait
+    article_model.delete(supprime)
+    
+    assert buffer.flush() is False
+    modele = VenteModel()
+    assert modele.get_quantite(jour, articles[0]) == 2
+    assert modele.get_quantite(jour, articles[1]) == 1
+    
+    rejetees = buffer.prendre_rejetees()
+    assert [(r['date_vente'], r['article_id'], r['quantite']) for r in rejetees] == [(jour, supprime, 5)]
+    assert buffer.prendre_rejetees() == []
+    
+    # Écartée du journal (pas de rejeu) et conservée en quarantaine
+    assert buffer.pending_for(jour) == {}
+    assert not buffer.journal_path.exists()
+    with open(buffer.quarantaine_path, encoding='utf-8') as f:
+        assert json.loads(f.readline())['article_id'] == supprime
+    assert buffer.flush() is True
+
+
+def test_lot_visible_pendant_l_ecriture(nouveau_buffer, articles):
+    jour = JOUR + timedelta(days=4)
+    buffer = nouveau_buffer()
+    buffer.add(jour, articles[0], 12)
+    
+    commence, liberer = threading.Event(), threading.Event()
+    save_many = buffer.model.save_many
+    
+    def ecriture_lente(lignes):
+        commence.set()
+        assert liberer.wait(5)
+        return save_many(lignes)
+    buffer.model.save_many = ecriture_lente
+    try:
+        ecriture = threading.Thread(target=buffer.flush)
+        ecriture.start()
+        assert commence.wait(5)
+        
+        # Pas encore en base, toujours visible dans le tampon
+        assert VenteModel().get_quantite(jour, articles[0]) == 0
+        assert buffer.get(jour, articles[0]) == 12
+        assert buffer.pending_for(jour) == {articles[0]: 12}
+        
+        # Une saisie faite pendant l'écriture l'emporte sur le lot en cours
+        buffer.add(jour, articles[0], 13)
+        assert buffer.get(jour, articles[0]) == 13
+        assert buffer.pending_for(jour) == {articles[0]: 13}
+        
+        liberer.set()
+        ecriture.join(5)
+    finally:
+        liberer.set()
+        del buffer.model.save_many
+    
+    assert VenteModel().get_quantite(jour, articles[0]) == 12
+    assert buffer.pending_for(jour) == {articles[0]: 13}
+    assert buffer.flush() is True
+    assert buffer.pending_for(jour) == {}
+    assert VenteModel().get_quantite(jour, articles[0]) == 13
@@ -3,7 +3,7 @@
 from .validators import validate_price, validate_non_empty
 from .formatters import format_currency, format_date, format_month
 from .logger import setup_logger, get_logger
-from .export import export_historique_csv, exporter_bilan_pdf
+from .export import exporter_historique_csv, exporter_bilan_pdf
 
 __all__ = [
     'validate_price',
@@ -13,6 +13,6 @@ __all__ = [
     'format_month',
     'setup_logger',
     'get_logger',
-    'export_historique_csv',
+    'exporter_historique_csv',
     'export_bilan_pdf'
 ]
\ No newline at end of file
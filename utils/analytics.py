@@ -0,0 +1,162 @@
+"""
+Analyses des ventes par tableaux NumPy
+Les ventes d'une période sont chargées une fois dans une matrice jour x article ;
+recettes, marges, moyennes mobiles et variations sont calculées sur les
+tableaux entiers, sans boucle Python par ligne ni par article
+"""
+
+from datetime import timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    # Optionnel : seules les analyses en dépendent (pip install numpy)
+    np = None
+
+
+NUMPY_DISPONIBLE = np is not None
+
+# Décalages de comparaison en jours (364 = 52 semaines : même jour de la semaine)
+SEMAINE = 7
+ANNEE = 364
+
+
+def exiger_numpy():
+    """Lever une erreur explicite si numpy n'est pas installé"""
+    if np is None:
+        raise Exception(
+            "Le module numpy n'est pas installé!\n\n"
+            "Installez-le avec:\npip install numpy")
+
+
+class MatriceVentes:
+    """Ventes d'une période : une ligne par jour (jours sans vente compris),
+    une colonne par article du catalogue (triés par id)
+
+    Tableaux (int64, montants en millimes) :
+        quantites, recettes, couts: jours x articles, aux prix figés des ventes
+        prix_vente, prix_achat: prix actuels du catalogue, un par article
+
+    Une matrice mise en cache est partagée : ses tableaux sont en lecture seule.
+    """
+
+    def __init__(self, debut, fin, articles):
+        exiger_numpy()
+        if fin < debut:
+            raise ValueError("La date de fin précède la date de début")
+
+        self.debut = debut
+        self.fin = fin
+        articles = sorted(articles, key=lambda article: article['id'])
+        self.article_ids = np.array([article['id'] for article in articles], dtype=np.int64)
+        self.noms = [article['nom'] for article in articles]
+        self.prix_vente = np.array([article['prix_vente'].millimes for article in articles], dtype=np.int64)
+        self.prix_achat = np.array([article['prix_achat'].millimes for article in articles], dtype=np.int64)
+
+        forme = ((fin - debut).days + 1, len(articles))
+        self.quantites = np.zeros(forme, dtype=np.int64)
+        self.recettes = np.zeros(forme, dtype=np.int64)
+        self.couts = np.zeros(forme, dtype=np.int64)
+
+    @property
+    def nb_jours(self):
+        return self.quantites.shape[0]
+
+    @property
+    def jours(self):
+        """Dates des lignes, consécutives de debut à fin"""
+        return [self.debut + timedelta(days=i) for i in range(self.nb_jours)]
+
+    @property
+    def marges(self):
+        """Marge brute en millimes (jours x articles)"""
+        return self.recettes - self.couts
+
+    def index_jour(self, jour):
+        """Ligne d'une date"""
+        return (jour - self.debut).days
+
+    def ajouter(self, lignes):
+        """Reporter un lot de lignes (date_vente, article_id, quantite, prix_vente, prix_achat)"""
+        if not lignes or not len(self.article_ids):
+            return
+
+        dates, ids, quantites, prix_vente, prix_achat = zip(*lignes)
+        origine = self.debut.toordinal()
+        i = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates)) - origine
+        ids = np.array(ids, dtype=np.int64)
+        j = np.searchsorted(self.article_ids, ids)
+
+        # Article créé après la lecture du catalogue : ignoré
+        connus = self.article_ids[np.minimum(j, len(self.article_ids) - 1)] == ids
+        if not connus.all():
+            i, j = i[connus], j[connus]
+            quantites, prix_vente, prix_achat = (
+                np.array(valeurs, dtype=np.int64)[connus] for valeurs in (quantites, prix_vente, prix_achat)
+            )
+
+        q = np.asarray(quantites, dtype=np.int64)
+        # (date_vente, article_id) est unique : une seule ligne par case
+        self.quantites[i, j] = q
+        self.recettes[i, j] = q * np.asarray(prix_vente, dtype=np.int64)
+        self.couts[i, j] = q * np.asarray(prix_achat, dtype=np.int64)
+
+    def figer(self):
+        """Passer les tableaux en lecture seule (avant mise en cache)"""
+        for tableau in (self.quantites, self.recettes, self.couts, self.prix_vente, self.prix_achat):
+            tableau.flags.writeable = False
+        return self
+
+
+def sommes_glissantes(valeurs, fenetre):
+    """Somme des `fenetre` derniers jours, pour chaque jour (axe 0) et chaque colonne
+
+    NaN tant que la fenêtre n'est pas complète.
+    """
+    exiger_numpy()
+    # Cumul entier : exact, puis différence des cumuls aux bornes de la fenêtre
+    cumul = np.cumsum(valeurs, axis=0)
+    sommes = np.full(valeurs.shape, np.nan)
+    if 0 < fenetre <= len(valeurs):
+        sommes[fenetre - 1] = cumul[fenetre - 1]
+        sommes[fenetre:] = cumul[fenetre:] - cumul[:-fenetre]
+    return sommes
+
+
+def moyenne_mobile(valeurs, fenetre):
+    """Moyenne journalière sur les `fenetre` derniers jours (NaN avant le premier jour complet)"""
+    return sommes_glissantes(valeurs, fenetre) / fenetre
+
+
+def variations(valeurs, decalage, fenetre=SEMAINE):
+    """Écart entre la somme des `fenetre` jours finissant à chaque jour et
+    la même somme `decalage` jours plus tôt
+
+    Returns:
+        (ecart, taux) : écart absolu et relatif (NaN sans période de référence
+        ou si la référence est nulle)
+    """
+    sommes = sommes_glissantes(valeurs, fenetre)
+    precedentes = np.full(sommes.shape, np.nan)
+    if 0 < decalage < len(sommes):
+        precedentes[decalage:] = sommes[:-decalage]
+    ecart = sommes - precedentes
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taux = np.where(precedentes > 0, ecart / precedentes, np.nan)
+    return ecart, taux
+
+
+def totaux_mensuels(matrice, valeurs):
+    """Sommes par mois civil (une ligne par mois de la période)
+
+    Returns:
+        (mois, sommes) : premiers jours des mois et tableau mois x colonnes
+    """
+    exiger_numpy()
+    mois, debuts = [], []
+    jour = matrice.debut
+    while jour <= matrice.fin:
+        mois.append(jour.replace(day=1))
+        debuts.append(matrice.index_jour(jour))
+        jour = (jour.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return mois, np.add.reduceat(valeurs, debuts, axis=0)
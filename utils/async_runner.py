@@ -0,0 +1,142 @@
+"""
+Exécution des accès base de données hors du thread de l'interface
+Un thread de travail exécute les appels ; les résultats sont remis à Tk
+par after() (seul le thread principal touche aux widgets). Les traitements
+longs (exports) ont leur propre thread pour ne pas retarder l'interface.
+"""
+
+import queue
+import threading
+
+from config.database import DatabaseConnection
+from .instrumentation import QueryStats
+from .logger import get_logger
+
+
+class AsyncRunner:
+    """Singleton : file de travaux exécutés par un thread dédié
+
+    Chaque travail porte une clé ; soumettre un nouveau travail avec la même
+    clé rend le précédent obsolète (non exécuté s'il attend encore, résultat
+    ignoré s'il est déjà en cours).
+
+    Les travaux longs passent par une seconde file et un second thread, créés
+    au premier besoin : les chargements de l'interface ne les attendent pas.
+    """
+
+    POLL_MS = 30
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._travaux = queue.Queue()
+                    instance._travaux_longs = None      # File du thread des traitements longs
+                    instance._resultats = queue.Queue()
+                    instance._generations = {}
+                    instance._gen_lock = threading.Lock()
+                    instance._en_cours = 0          # Travaux soumis non encore livrés
+                    instance._widget = None
+                    instance._polling = False
+                    instance.logger = get_logger()
+                    instance._demarrer_worker(instance._travaux, 'db-worker')
+                    cls._instance = instance
+        return cls._instance
+
+    def submit(self, widget, cle, fonction, args=(), on_success=None, on_error=None, longue=False):
+        """Soumettre un appel (depuis le thread Tk)
+
+        Args:
+            widget: Widget Tk servant à planifier la remise des résultats
+            cle: Identifiant de la demande (une nouvelle demande remplace l'ancienne)
+            fonction: Appel exécuté dans le thread de travail
+            args: Arguments de l'appel
+            on_success: Appelé dans le thread Tk avec le résultat
+            on_error: Appelé dans le thread Tk avec l'exception
+            longue: Traitement long (export), exécuté par le thread dédié
+        """
+        with self._gen_lock:
+            generation = self._generations.get(cle, 0) + 1
+            self._generations[cle] = generation
+
+        if longue and self._travaux_longs is None:
+            self._travaux_longs = queue.Queue()
+            self._demarrer_worker(self._travaux_longs, 'db-worker-long')
+
+        self._widget = widget
+        self._en_cours += 1
+        travaux = self._travaux_longs if longue else self._travaux
+        travaux.put((cle, generation, fonction, args, on_success, on_error))
+        self._demarrer_polling()
+
+    def cancel(self, cle):
+        """Abandonner la demande en cours pour une clé"""
+        with self._gen_lock:
+            if cle in self._generations:
+                self._generations[cle] += 1
+
+    def cancel_prefix(self, prefixe):
+        """Abandonner toutes les demandes dont la clé commence par prefixe"""
+        with self._gen_lock:
+            for cle in self._generations:
+                if cle.startswith(prefixe):
+                    self._generations[cle] += 1
+
+    def _est_courant(self, cle, generation):
+        with self._gen_lock:
+            return self._generations.get(cle) == generation
+
+    def _demarrer_worker(self, travaux, nom):
+        thread = threading.Thread(target=self._worker, args=(travaux,), name=nom, daemon=True)
+        thread.start()
+
+    def _worker(self, travaux):
+        """Boucle d'un thread de travail"""
+        db = DatabaseConnection()
+        while True:
+            cle, generation, fonction, args, on_success, on_error = travaux.get()
+
+            if not self._est_courant(cle, generation):
+                self._resultats.put((cle, generation, None, None, None))
+                continue
+
+            try:
+                with db.connection(), QueryStats().capture() as requetes:
+                    resultat = fonction(*args)
+                duree_ms = sum(mesure[2] for mesure in requetes)
+                self.logger.info(f"{cle}: {len(requetes)} requête(s), {duree_ms:.1f} ms")
+                self._resultats.put((cle, generation, on_success, resultat, None))
+            except Exception as e:
+                self.logger.error(f"Erreur pendant '{cle}': {e}")
+                self._resultats.put((cle, generation, on_error, None, e))
+
+    def _demarrer_polling(self):
+        if not self._polling:
+            self._polling = True
+            self._widget.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        """Remettre les résultats disponibles (thread Tk)"""
+        while True:
+            try:
+                cle, generation, callback, resultat, erreur = self._resultats.get_nowait()
+            except queue.Empty:
+                break
+
+            self._en_cours -= 1
+            if callback is None or not self._est_courant(cle, generation):
+                continue
+            try:
+                callback(erreur if erreur is not None else resultat)
+            except Exception as e:
+                self.logger.error(f"Erreur d'affichage après '{cle}': {e}")
+
+        # Plus rien en attente : inutile de réveiller Tk
+        if self._en_cours > 0:
+            self._widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
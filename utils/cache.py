@@ -0,0 +1,115 @@
+"""
+Cache de résultats en mémoire invalidé par les écritures
+Chaque cache déclare les tables dont il dépend ; les modèles signalent
+leurs écritures avec invalidate(table, jours...)
+"""
+
+import threading
+from collections import OrderedDict
+
+
+_caches = []
+_registry_lock = threading.Lock()
+
+
+class MonthCache:
+    """Résultats indexés par mois (premier jour du mois), thread-safe
+
+    Les valeurs mises en cache sont partagées : les appelants ne doivent
+    pas les modifier.
+    """
+
+    def __init__(self, tables, maxsize=12):
+        self.tables = frozenset(tables)
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        with _registry_lock:
+            _caches.append(self)
+
+    def cle(self, jour):
+        """Clé de la valeur qui couvre une date"""
+        return jour.replace(day=1)
+
+    def get(self, mois):
+        """Valeur en cache pour le mois (None si absente)"""
+        with self._lock:
+            valeur = self._data.get(mois)
+            if valeur is not None:
+                self._data.move_to_end(mois)
+            return valeur
+
+    def generation(self):
+        """Compteur d'invalidations, à relever avant de calculer une valeur"""
+        with self._lock:
+            return self._generation
+
+    def put(self, mois, valeur, generation):
+        """Mémoriser une valeur calculée
+
+        Ignorée si une écriture a invalidé le cache pendant le calcul :
+        la valeur risquerait d'être déjà périmée.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._data[mois] = valeur
+            self._data.move_to_end(mois)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, mois=None):
+        """Oublier un mois (ou tout le cache si mois est None)"""
+        with self._lock:
+            self._generation += 1
+            if mois is None:
+                self._data.clear()
+            else:
+                self._data.pop(mois, None)
+
+
+class DayCache(MonthCache):
+    """Résultats indexés par jour (mêmes règles que MonthCache)"""
+
+    def cle(self, jour):
+        return jour
+
+
+class PeriodCache(MonthCache):
+    """Résultats indexés par période (debut, fin, ...)
+
+    Une écriture datée n'oublie que les périodes qui contiennent ce jour ;
+    la clé peut porter d'autres éléments après les deux dates.
+    """
+
+    def cle(self, jour):
+        return jour
+
+    def invalidate(self, jour=None):
+        """Oublier les périodes contenant le jour (ou tout le cache si jour est None)"""
+        with self._lock:
+            self._generation += 1
+            if jour is None:
+                self._data.clear()
+            else:
+                for periode in [p for p in self._data if p[0] <= jour <= p[1]]:
+                    del self._data[periode]
+
+
+def invalidate(table, *jours):
+    """Signaler une écriture sur une table
+
+    Args:
+        table: Table modifiée
+        jours: Dates touchées par l'écriture (aucune = toutes les dates)
+    """
+    with _registry_lock:
+        caches = [cache for cache in _caches if table in cache.tables]
+
+    for cache in caches:
+        if not jours:
+            cache.invalidate()
+        for cle in {cache.cle(jour) for jour in jours}:
+            cache.invalidate(cle)
@@ -5,13 +5,16 @@ Formateurs pour l'affichage des données
 from datetime import date
 from decimal import Decimal
 from config.settings import CURRENCY
+from utils.money import Money
 
 
 def format_currency(amount):
-    """Formater un montant en devise"""
+    """Formater un montant en devise (3 décimales : millimes)"""
+    if isinstance(amount, Money):
+        return f"{amount} {CURRENCY}"
     if isinstance(amount, (int, float, Decimal)):
-        return f"{float(amount):.2f} {CURRENCY}"
-    return f"0.00 {CURRENCY}"
+        return f"{Money.from_dinars(amount)} {CURRENCY}"
+    return f"0.000 {CURRENCY}"
 
 
 def format_date(date_obj):
@@ -34,13 +37,21 @@ def format_month(date_obj):
 
 def format_percentage(value):
     """Formater un pourcentage"""
-    if isinstance(value, (int, float, Decimal)):
+    if isinstance(value, (int, float, Decimal, Money)):
         return f"{float(value):.1f}%"
     return "0.0%"
 
 
 def format_number(value):
-    """Formater un nombre avec séparateurs de milliers"""
-    if isinstance(value, (int, float, Decimal)):
+    """Formater un nombre avec séparateurs de milliers
+    
+    Un Money s'affiche au millime ; un nombre (quantité, compte) reste un
+    nombre : entier sans décimales, sinon 2 décimales.
+    """
+    if isinstance(value, Money):
+        return f"{value:,.3f}".replace(',', ' ')
+    if isinstance(value, int):
+        return f"{value:,d}".replace(',', ' ')
+    if isinstance(value, (float, Decimal)):
         return f"{float(value):,.2f}".replace(',', ' ')
     return "0"
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Vérification des index par EXPLAIN
+Chaque requête de lecture des modèles est capturée puis expliquée : une
+lecture complète d'une grande table est signalée
+"""
+
+import re
+from datetime import date, timedelta
+
+from config.database import DatabaseConnection
+from .instrumentation import QueryStats
+
+
+# Tables qui grossissent avec le temps (les autres restent petites : catalogue, mois)
+GRANDES_TABLES = ('ventes', 'charges', 'resume_journalier')
+
+_TABLE_ALIAS = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_MOTS_SQL = {'where', 'on', 'join', 'left', 'inner', 'group', 'order', 'limit', 'set', 'using'}
+
+
+def _tables_par_alias(query):
+    """Alias (et noms) utilisés dans la requête -> table"""
+    tables = {}
+    for table, alias in _TABLE_ALIAS.findall(query):
+        tables[table] = table
+        if alias and alias.lower() not in _MOTS_SQL:
+            tables[alias] = table
+    return tables
+
+
+def _requetes_modeles(jour):
+    """Exécuter les lectures des modèles et capturer leurs requêtes"""
+    from models import (ArticleModel, VenteModel, ChargeModel, ChargeFixeModel,
+                        SalaireModel, ResumeJournalierModel, BilanModel)
+
+    premier_jour = jour.replace(day=1)
+    dernier_jour = (premier_jour + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    vente, charge = VenteModel(), ChargeModel()
+    salaire, article = SalaireModel(), ArticleModel()
+
+    with QueryStats().capture() as requetes:
+        vente.get_by_date(jour)
+        vente.get_feuille_jour(jour)
+        vente.get_quantite(jour, 0)
+        vente.get_historique(30)
+        vente.get_historique_page(premier_jour, dernier_jour)
+        vente.get_historique_page(premier_jour, dernier_jour, avant=jour)
+        vente.count_historique(premier_jour, dernier_jour)
+        vente.get_ventes_mois(premier_jour, dernier_jour)
+        vente.get_quantites_articles_mois(premier_jour, dernier_jour)
+        list(vente.iter_historique(premier_jour, dernier_jour))
+        list(vente.iter_quantites_articles(premier_jour, dernier_jour))
+        list(vente.iter_lignes_periode(premier_jour, dernier_jour))
+        charge.get_by_date(jour)
+        charge.get_total_by_date(jour)
+        charge.get_charges_mois(premier_jour, dernier_jour)
+        charge.get_liste_charges_mois(premier_jour, dernier_jour)
+        charge.get_totaux_par_jour(premier_jour, dernier_jour)
+        ChargeFixeModel().get_by_month(premier_jour)
+        salaire.get_by_month(premier_jour)
+        salaire.get_total_by_month(premier_jour)
+        article.get_all()
+        article.get_by_id(0)
+        article.get_count()
+
+    # Requêtes groupées ou d'écriture : expliquées sans être exécutées
+    periode = (premier_jour, dernier_jour)
+    extra = [
+        ('BilanModel.get_mois', BilanModel.TOTAUX_QUERY, periode),
+        ('BilanModel.get_mois', BilanModel.QUANTITES_QUERY, periode),
+        ('BilanModel.get_mois', BilanModel.DEPENSES_QUERY, periode),
+        ('BilanModel.get_mois', BilanModel.SALAIRES_QUERY, (premier_jour,)),
+        ('ResumeJournalierModel.refresh_jour',
+         ResumeJournalierModel().recalcul_query("{col} IN (%s)"), (jour,) * 4),
+    ]
+
+    vues = {}
+    for methode, _, _, _, query, params in requetes:
+        vues.setdefault((methode, query), params or ())
+    return [(methode, query, params) for (methode, query), params in vues.items()] + extra
+
+
+def verifier_index(jour=None):
+    """Expliquer les requêtes des modèles
+
+    Une lecture complète dans l'ordre d'un index est admise si la requête
+    est bornée par LIMIT (historique des derniers jours).
+
+    Returns:
+        Liste de dict {'methode', 'requete', 'problemes', 'notes'} : problemes
+        liste les lectures complètes de grandes tables
+    """
+    jour = jour or date.today()
+    db = DatabaseConnection()
+    resultats = []
+
+    for methode, query, params in _requetes_modeles(jour):
+        tables = _tables_par_alias(query)
+        borne = re.search(r'\bLIMIT\b', query, re.IGNORECASE) is not None
+        with db.connection() as connection:
+            plan = db.engine.explain(connection, query, params)
+
+        problemes, notes = [], []
+        for etape in plan:
+            table = tables.get(etape['table'])
+            if etape['scan'] and table in GRANDES_TABLES and not (borne and etape['index']):
+                problemes.append(f"lecture complète de {table} ({etape['detail']})")
+            elif etape['table'] is None or etape['scan']:
+                notes.append(etape['detail'])
+
+        resultats.append({
+            'methode': methode,
+            'requete': ' '.join(query.split()),
+            'problemes': problemes,
+            'notes': notes,
+        })
+    return resultats
+
+
+def rapport_index(resultats):
+    """Rapport texte de verifier_index()"""
+    lignes = []
+    for resultat in sorted(resultats, key=lambda r: (not r['problemes'], r['methode'])):
+        statut = "❌" if resultat['problemes'] else "✅"
+        lignes.append(f"{statut} {resultat['methode']}: {resultat['requete'][:90]}")
+        for probleme in resultat['problemes']:
+            lignes.append(f"     ⚠️  {probleme}")
+        for note in resultat['notes']:
+            lignes.append(f"     ·  {note}")
+    nb = sum(1 for resultat in resultats if resultat['problemes'])
+    lignes.append(f"\n{len(resultats)} requête(s) vérifiée(s), {nb} sans index adapté")
+    return '\n'.join(lignes)
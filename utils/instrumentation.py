@@ -0,0 +1,204 @@
+"""
+Instrumentation des requêtes SQL
+Latences par requête, appels par méthode de modèle, lignes renvoyées,
+journal des requêtes lentes (paramètres masqués)
+"""
+
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from config.settings import INSTRUMENTATION_CONFIG
+from .logger import get_logger
+
+
+# Bornes supérieures (ms) des classes de l'histogramme des latences
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def normalize_query(query):
+    """Forme canonique d'une requête (espaces réduits, listes de %s regroupées)"""
+    query = ' '.join(query.split())
+    # Les requêtes multi-lignes (IN (...), VALUES (...), (...)) ne forment qu'une entrée
+    query = re.sub(r'\(\s*%s(\s*,\s*%s)*\s*\)', '(%s…)', query)
+    query = re.sub(r'(\([^()]*(\([^()]*\)[^()]*)*\))(\s*,\s*\1)+', r'\1, …', query)
+    return query
+
+
+def redact_params(params):
+    """Paramètres remplacés par leur type (jamais de montants ni de noms dans les logs)"""
+    if not params:
+        return '()'
+    types = [type(param).__name__ for param in params[:10]]
+    if len(params) > 10:
+        types.append(f"… ({len(params)} paramètres)")
+    return '(' + ', '.join(types) + ')'
+
+
+class _Statistique:
+    """Mesures cumulées d'une clé (requête ou méthode)"""
+    
+    __slots__ = ('appels', 'total_ms', 'max_ms', 'lignes', 'histogramme')
+    
+    def __init__(self):
+        self.appels = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.lignes = 0
+        self.histogramme = [0] * (len(BUCKETS_MS) + 1)
+    
+    def ajouter(self, duree_ms, lignes):
+        self.appels += 1
+        self.total_ms += duree_ms
+        self.max_ms = max(self.max_ms, duree_ms)
+        self.lignes += lignes
+        self.histogramme[bisect_left(BUCKETS_MS, duree_ms)] += 1
+    
+    def percentile(self, p):
+        """Borne supérieure (ms) de la classe contenant le p-ième percentile"""
+        seuil = self.appels * p / 100
+        cumul = 0
+        for index, nombre in enumerate(self.histogramme):
+            cumul += nombre
+            if cumul >= seuil and nombre:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return 0
+
+
+class QueryStats:
+    """Singleton collectant les mesures de toutes les requêtes"""
+    
+    _instance = None
+    _lock = threading.Lock()
+    
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance.enabled = INSTRUMENTATION_CONFIG['enabled']
+                    instance.slow_query_ms = INSTRUMENTATION_CONFIG['slow_query_ms']
+                    instance._par_requete = {}
+                    instance._par_methode = {}
+                    instance._captures = []
+                    instance._stats_lock = threading.Lock()
+                    cls._instance = instance
+        return cls._instance
+    
+    def record(self, methode, query, params, duree_ms, lignes):
+        """Enregistrer une exécution
+        
+        Args:
+            methode: Méthode de modèle à l'origine de la requête (ex. VenteModel.save_many)
+            query: Requête SQL exécutée
+            params: Paramètres (masqués dans le journal des requêtes lentes)
+            duree_ms: Durée d'exécution en millisecondes
+            lignes: Lignes renvoyées ou modifiées
+        """
+        requete = normalize_query(query)
+        with self._stats_lock:
+            self._par_requete.setdefault(requete, _Statistique()).ajouter(duree_ms, lignes)
+            self._par_methode.setdefault(methode, _Statistique()).ajouter(duree_ms, lignes)
+            for capture in self._captures:
+                capture.append((methode, requete, duree_ms, lignes, query, params))
+        
+        if duree_ms >= self.slow_query_ms:
+            get_logger().warning(
+                f"Requête lente ({duree_ms:.0f} ms) dans {methode}: {requete[:300]} "
+                f"paramètres {redact_params(params)}"
+            )
+    
+    @contextmanager
+    def capture(self):
+        """Collecter les requêtes exécutées dans le bloc (tous threads confondus)
+        
+        Produit une liste de tuples (méthode, requête normalisée, durée ms,
+        lignes, requête exécutée, paramètres).
+        """
+        mesures = []
+        with self._stats_lock:
+            self._captures.append(mesures)
+        try:
+            yield mesures
+        finally:
+            with self._stats_lock:
+                self._captures.remove(mesures)
+    
+    def reset(self):
+        """Remettre les compteurs à zéro"""
+        with self._stats_lock:
+            self._par_requete.clear()
+            self._par_methode.clear()
+    
+    def snapshot(self):
+        """Copie des mesures {'requetes': {...}, 'methodes': {...}}"""
+        def exporter(statistiques):
+            return {
+                cle: {
+                    'appels': stat.appels,
+                    'total_ms': stat.total_ms,
+                    'moyenne_ms': stat.total_ms / stat.appels,
+                    'p95_ms': stat.percentile(95),
+                    'max_ms': stat.max_ms,
+                    'lignes': stat.lignes,
+                    'histogramme': dict(zip(BUCKETS_MS + ('+',), stat.histogramme)),
+                }
+                for cle, stat in statistiques.items()
+            }
+        
+        with self._stats_lock:
+            return {
+                'requetes': exporter(self._par_requete),
+                'methodes': exporter(self._par_methode),
+            }
+    
+    def report(self, limite=15):
+        """Rapport texte : méthodes par nombre d'appels, requêtes par temps cumulé"""
+        snapshot = self.snapshot()
+        lignes = ["=== Requêtes SQL par méthode (appels) ==="]
+        lignes.append(f"{'Méthode':<45} {'Appels':>7} {'Total ms':>10} {'Moy.':>7} {'p95':>6} {'Lignes':>8}")
+        methodes = sorted(snapshot['methodes'].items(), key=lambda item: -item[1]['appels'])
+        for methode, stat in methodes[:limite]:
+            lignes.append(
+                f"{methode[:45]:<45} {stat['appels']:>7} {stat['total_ms']:>10.1f} "
+                f"{stat['moyenne_ms']:>7.2f} {stat['p95_ms']:>6} {stat['lignes']:>8}"
+            )
+        
+        lignes.append("")
+        lignes.append("=== Requêtes SQL par temps cumulé ===")
+        requetes = sorted(snapshot['requetes'].items(), key=lambda item: -item[1]['total_ms'])
+        for requete, stat in requetes[:limite]:
+            lignes.append(
+                f"{stat['total_ms']:>10.1f} ms  {stat['appels']:>6}x  p95 {stat['p95_ms']:>5} ms  "
+                f"{requete[:100]}"
+            )
+        return '\n'.join(lignes)
+
+
+@contextmanager
+def mesurer(methode, query, params):
+    """Chronométrer une exécution ; le bloc renseigne mesure['lignes']
+    
+    Pour une lecture en flux, arreter_chrono(mesure) fixe la fin de la durée
+    mesurée avant la sortie du bloc : le temps passé par le consommateur
+    entre deux lots n'est pas compté comme temps de requête.
+    """
+    stats = QueryStats()
+    mesure = {'lignes': 0}
+    if not stats.enabled:
+        yield mesure
+        return
+    
+    debut = time.perf_counter()
+    try:
+        yield mesure
+    finally:
+        fin = mesure.get('fin') or time.perf_counter()
+        stats.record(methode, query, params, (fin - debut) * 1000, mesure['lignes'])
+
+
+def arreter_chrono(mesure):
+    """Arrêter la mesure de durée d'un bloc mesurer() (les lignes restent comptées)"""
+    mesure['fin'] = time.perf_counter()
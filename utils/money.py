@@ -0,0 +1,151 @@
+"""
+Montants en millimes (1 dinar = 1000 millimes)
+Les montants sont stockés en entiers dans la base et manipulés en Money
+jusqu'à l'affichage : les additions sont exactes et sans conversion texte
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+
+MILLIMES_PAR_DINAR = 1000
+
+
+class Money:
+    """Montant en dinars tunisiens, représenté par un nombre entier de millimes
+
+    Un nombre (int, float, Decimal) combiné à un Money est interprété en
+    dinars et arrondi au millime : Money.from_dinars(2) + 0.5 == Money(2500).
+    Comparé à un Money, il l'est exactement (sans arrondi), comme entre
+    nombres Python : Money(1500) == 1.5 et hash(Money(1500)) == hash(1.5).
+    """
+
+    __slots__ = ('millimes',)
+
+    def __init__(self, millimes=0):
+        self.millimes = int(millimes)
+
+    @classmethod
+    def from_dinars(cls, valeur):
+        """Convertir un montant en dinars (Money, nombre ou texte), arrondi au millime"""
+        if isinstance(valeur, Money):
+            return valeur
+        if valeur is None or valeur == '':
+            return cls(0)
+        if isinstance(valeur, int):
+            return cls(valeur * MILLIMES_PAR_DINAR)
+        if isinstance(valeur, float):
+            return cls(round(valeur * MILLIMES_PAR_DINAR))
+        millimes = (Decimal(str(valeur)) * MILLIMES_PAR_DINAR).quantize(Decimal(1), ROUND_HALF_UP)
+        return cls(millimes)
+
+    def to_decimal(self):
+        """Valeur exacte en dinars"""
+        return Decimal(self.millimes).scaleb(-3)
+
+    # ---- Arithmétique ----
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.millimes + other.millimes)
+        if isinstance(other, (int, float, Decimal)):
+            return Money(self.millimes + Money.from_dinars(other).millimes)
+        return NotImplemented
+
+    # sum() commence par 0
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.millimes - other.millimes)
+        if isinstance(other, (int, float, Decimal)):
+            return Money(self.millimes - Money.from_dinars(other).millimes)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (int, float, Decimal)):
+            return Money(Money.from_dinars(other).millimes - self.millimes)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.millimes)
+
+    def __abs__(self):
+        return Money(abs(self.millimes))
+
+    def __mul__(self, quantite):
+        """Montant x quantité entière (prix unitaire x quantité vendue)"""
+        if isinstance(quantite, int):
+            return Money(self.millimes * quantite)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """Répartition (arrondie au millime) ou rapport entre deux montants"""
+        if isinstance(other, Money):
+            return self.millimes / other.millimes
+        if isinstance(other, int):
+            # Arrondi au plus proche, demi-millime vers le haut
+            return Money((2 * self.millimes + other) // (2 * other))
+        return NotImplemented
+
+    # ---- Comparaisons ----
+
+    def _operandes(self, other):
+        """Valeurs comparables : millimes entre deux Money, dinars exacts avec un nombre"""
+        if isinstance(other, Money):
+            return self.millimes, other.millimes
+        if isinstance(other, (int, float, Decimal)):
+            return self.to_decimal(), other
+        return None
+
+    def __eq__(self, other):
+        operandes = self._operandes(other)
+        return NotImplemented if operandes is None else operandes[0] == operandes[1]
+
+    def __lt__(self, other):
+        operandes = self._operandes(other)
+        return NotImplemented if operandes is None else operandes[0] < operandes[1]
+
+    def __le__(self, other):
+        operandes = self._operandes(other)
+        return NotImplemented if operandes is None else operandes[0] <= operandes[1]
+
+    def __gt__(self, other):
+        operandes = self._operandes(other)
+        return NotImplemented if operandes is None else operandes[0] > operandes[1]
+
+    def __ge__(self, other):
+        operandes = self._operandes(other)
+        return NotImplemented if operandes is None else operandes[0] >= operandes[1]
+
+    def __hash__(self):
+        # Même hachage que le nombre égal (int, float ou Decimal en dinars)
+        if self.millimes % MILLIMES_PAR_DINAR == 0:
+            return hash(self.millimes // MILLIMES_PAR_DINAR)
+        return hash(self.to_decimal())
+
+    def __bool__(self):
+        return self.millimes != 0
+
+    # ---- Conversions ----
+
+    def __float__(self):
+        return self.millimes / MILLIMES_PAR_DINAR
+
+    def __str__(self):
+        # Exact tant que |millimes| < 2**50 (le double le plus proche s'arrondit
+        # toujours au bon millime), deux fois plus rapide que divmod + formatage
+        return f"{self.millimes / MILLIMES_PAR_DINAR:.3f}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        if not spec:
+            return str(self)
+        return format(self.to_decimal(), spec)
+
+
+ZERO = Money(0)
+
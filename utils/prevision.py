@@ -0,0 +1,120 @@
+"""
+Prévision de la demande par article
+Moyenne mobile ou lissage exponentiel des dernières semaines, corrigés de la
+saisonnalité du jour de la semaine ; les prévisions de tous les articles (et,
+pour le backtest, de tous les jours) sont calculées ensemble sur des
+fenêtres glissantes NumPy
+"""
+
+from .analytics import np, exiger_numpy
+
+
+# lissage : lissage exponentiel ; moyenne : moyenne mobile ;
+# semaine : même jour de la semaine précédente (référence naïve)
+METHODES = ('lissage', 'moyenne', 'semaine')
+
+HISTORIQUE = 56         # Jours servant à prévoir (nombre entier de semaines)
+FENETRE_MOYENNE = 28    # Jours de la moyenne mobile
+ALPHA = 0.2             # Poids du dernier jour dans le lissage exponentiel
+
+
+def fenetres(quantites, historique=HISTORIQUE):
+    """Fenêtres glissantes de `historique` jours (vue, sans copie)
+
+    Returns:
+        Tableau fenêtres x historique x articles : la fenêtre i couvre les
+        lignes i à i + historique - 1 et sert à prévoir la ligne i + historique
+    """
+    exiger_numpy()
+    if historique <= 0 or historique % 7:
+        raise ValueError("L'historique de prévision doit couvrir un nombre entier de semaines")
+    if len(quantites) < historique:
+        raise ValueError(f"Historique insuffisant : {len(quantites)} jour(s) pour {historique} demandés")
+    return np.lib.stride_tricks.sliding_window_view(quantites, historique, axis=0).transpose(0, 2, 1)
+
+
+def poids_niveau(historique, methode, alpha=ALPHA, fenetre_moyenne=FENETRE_MOYENNE):
+    """Poids de chaque jour de la fenêtre dans le niveau (somme 1, jour le plus récent en dernier)"""
+    if methode == 'moyenne':
+        poids = np.zeros(historique)
+        poids[-min(fenetre_moyenne, historique):] = 1
+    else:
+        poids = alpha * (1 - alpha) ** np.arange(historique - 1, -1, -1)
+    return poids / poids.sum()
+
+
+def prevoir_fenetres(fenetres, methode='lissage', horizon=1, alpha=ALPHA, fenetre_moyenne=FENETRE_MOYENNE):
+    """Quantités prévues pour les `horizon` jours qui suivent chaque fenêtre
+
+    Une fenêtre couvre un nombre entier de semaines : la position d'un jour
+    modulo 7 donne son jour de la semaine, la position 0 étant celle du
+    premier jour prévu.
+
+    Returns:
+        Tableau fenêtres x horizon x articles (float)
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode de prévision inconnue: {methode} (choix: {', '.join(METHODES)})")
+
+    nb, historique, nb_articles = fenetres.shape
+    semaines = np.asarray(fenetres, dtype=np.float64).reshape(nb, historique // 7, 7, nb_articles)
+    positions = np.arange(horizon) % 7
+
+    if methode == 'semaine':
+        return semaines[:, -1, positions, :]
+
+    # Indice de chaque jour de la semaine : sa moyenne / la moyenne générale
+    moyenne = semaines.mean(axis=(1, 2))[:, None, :]
+    par_jour = semaines.mean(axis=1)
+    indices = np.divide(par_jour, moyenne, out=np.ones_like(par_jour), where=moyenne > 0)
+
+    # Série désaisonnalisée (un jour de la semaine jamais vendu reste à 0)
+    corrigee = np.divide(semaines, indices[:, None], out=np.zeros_like(semaines), where=indices[:, None] > 0)
+    niveau = np.einsum(
+        'h,nha->na',
+        poids_niveau(historique, methode, alpha, fenetre_moyenne),
+        corrigee.reshape(nb, historique, nb_articles)
+    )
+    return niveau[:, None, :] * indices[:, positions, :]
+
+
+def prevoir(quantites, methode='lissage', horizon=1, historique=HISTORIQUE):
+    """Prévisions des jours qui suivent la dernière ligne de quantites
+
+    Returns:
+        Tableau horizon x articles
+    """
+    return prevoir_fenetres(fenetres(quantites[-historique:], historique), methode, horizon)[0]
+
+
+def erreurs(previsions, reels):
+    """Erreurs de prévision sur des tableaux de même forme (jours x articles)
+
+    Returns:
+        dict : mae (erreur absolue moyenne par article et par jour),
+        wape (erreur absolue / quantités vendues, en %), biais (en %,
+        positif si la prévision est trop haute), quantite (vendue)
+    """
+    ecarts = previsions - reels
+    total = float(reels.sum())
+    return {
+        'mae': float(np.abs(ecarts).mean()) if ecarts.size else 0.0,
+        'wape': float(np.abs(ecarts).sum() / total * 100) if total else None,
+        'biais': float(ecarts.sum() / total * 100) if total else None,
+        'quantite': int(total),
+    }
+
+
+def rapport_backtest(resultats):
+    """Rapport texte d'un backtest (PrevisionController.backtest)"""
+    def pourcentage(valeur):
+        return f"{valeur:>7.1f}%" if valeur is not None else f"{'-':>8}"
+
+    lignes = [f"{'Mois':<9} {'Méthode':<9} {'Vendu':>8} {'MAE':>7} {'WAPE':>8} {'Biais':>8}"]
+    for ligne in resultats['mois'] + [resultats['global']]:
+        for methode, erreur in ligne['methodes'].items():
+            lignes.append(
+                f"{ligne['libelle']:<9} {methode:<9} {erreur['quantite']:>8} {erreur['mae']:>7.2f} "
+                f"{pourcentage(erreur['wape'])} {pourcentage(erreur['biais'])}"
+            )
+    return '\n'.join(lignes)
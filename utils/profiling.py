@@ -0,0 +1,62 @@
+"""
+Mesure du temps de démarrage
+Les étapes (imports, connexion, migrations, construction des vues) sont
+chronométrées à chaque lancement ; main.py --profile-startup affiche le rapport
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Singleton : durée des étapes du démarrage, dans l'ordre d'exécution"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._etapes = []
+                    instance._debut = time.perf_counter()
+                    cls._instance = instance
+        return cls._instance
+
+    def demarrer(self, debut):
+        """Fixer l'origine des temps (perf_counter relevé au lancement du processus)"""
+        self._debut = debut
+
+    def ajouter(self, nom, duree_ms):
+        """Enregistrer une étape déjà chronométrée"""
+        with self._lock:
+            self._etapes.append((nom, duree_ms))
+
+    @contextmanager
+    def etape(self, nom):
+        """Chronométrer le bloc comme une étape du démarrage"""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter(nom, (time.perf_counter() - debut) * 1000)
+
+    def depuis_lancement_ms(self):
+        """Temps écoulé depuis le lancement"""
+        return (time.perf_counter() - self._debut) * 1000
+
+    def report(self):
+        """Rapport texte des étapes"""
+        with self._lock:
+            etapes = list(self._etapes)
+
+        total_ms = self.depuis_lancement_ms()
+        lignes = [f"{'Étape':<40} {'Durée (ms)':>12} {'Part':>7}"]
+        for nom, duree_ms in etapes:
+            part = duree_ms / total_ms * 100 if total_ms else 0
+            lignes.append(f"{nom:<40} {duree_ms:>12.1f} {part:>6.1f}%")
+        total = "Total jusqu'à la première fenêtre"
+        lignes.append(f"{total:<40} {total_ms:>12.1f}")
+        return '\n'.join(lignes)
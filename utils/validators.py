@@ -37,4 +37,12 @@ def validate_date(date_obj):
     from datetime import date
     if not isinstance(date_obj, date):
         raise ValueError("Date invalide!")
-    return True
\ No newline at end of file
+    return True
+
+def parse_date(value, field_name):
+    """Lire une date saisie (jj/mm/aaaa)"""
+    from datetime import datetime
+    try:
+        return datetime.strptime(value.strip(), '%d/%m/%Y').date()
+    except (ValueError, AttributeError):
+        raise ValueError(f"{field_name} doit être une date valide (jj/mm/aaaa)!")
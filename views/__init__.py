@@ -5,11 +5,13 @@ from .ventes_view import VentesView
 from .articles_view import ArticlesView
 from .bilan_view import BilanView
 from .historique_view import HistoriqueView
+from .tendances_view import TendancesView
 
 __all__ = [
     'MainWindow',
     'VentesView',
     'ArticlesView',
     'BilanView',
-    'HistoriqueView'
+    'HistoriqueView',
+    'TendancesView'
 ]
\ No newline at end of file
@@ -5,7 +5,7 @@ Vue Articles - Gestion des articles
 import tkinter as tk
 from tkinter import ttk
 from .base_view import BaseView
-from controllers import ArticleController
+from controllers import ArticleController, ServiceContainer
 from utils.formatters import format_currency
 from config.settings import COLORS
 
@@ -14,8 +14,9 @@ class ArticlesView(BaseView):
     """Vue pour la gestion des articles"""
     
     def __init__(self, parent):
-        self.controller = ArticleController()
+        self.controller = ServiceContainer().get(ArticleController)
         self.article_id_modif = None
+        self.version_affichee = None
         super().__init__(parent)
     
     def setup_ui(self):
@@ -92,23 +93,28 @@ class ArticlesView(BaseView):
         
         self.charger_articles()
     
-    def charger_articles(self):
-        """Charger la liste"""
+    def charger_articles(self, force=False):
+        """Charger la liste (rien à faire si le catalogue n'a pas changé)"""
+        version = self.controller.get_catalogue_version()
+        if version == self.version_affichee and not force:
+            return
+        self.version_affichee = version
+        
         for item in self.articles_tree.get_children():
             self.articles_tree.delete(item)
         
         articles = self.controller.get_all_articles()
         for article in articles:
-            prix_achat = float(article['prix_achat'])
-            prix_vente = float(article['prix_vente'])
+            prix_achat = article['prix_achat']
+            prix_vente = article['prix_vente']
             marge, marge_pct = self.controller.calculate_margin(prix_achat, prix_vente)
             
             self.articles_tree.insert('', 'end', values=(
                 article['id'],
                 article['nom'],
-                f"{prix_achat:.2f}",
-                f"{prix_vente:.2f}",
-                f"{marge:.2f}",
+                str(prix_achat),
+                str(prix_vente),
+                str(marge),
                 f"{marge_pct:.1f}%"
             ))
     
@@ -210,4 +216,8 @@ class ArticlesView(BaseView):
         self.article_id_modif = None
         self.article_nom_var.set('')
         self.article_achat_var.set('')
-        self.article_vente_var.set('')
\ No newline at end of file
+        self.article_vente_var.set('')
+    
+    def refresh(self):
+        """Rafraîchir la vue"""
+        self.charger_articles()
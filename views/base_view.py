@@ -5,6 +5,7 @@ Vue de base abstraite pour tous les onglets
 import tkinter as tk
 from tkinter import ttk
 from abc import ABC, abstractmethod
+from utils.async_runner import AsyncRunner
 
 
 class BaseView(ABC):
@@ -24,6 +25,30 @@ class BaseView(ABC):
         """Retourner le frame principal"""
         return self.frame
     
+    def run_async(self, cle, fonction, *args, on_success=None, on_error=None, longue=False):
+        """Exécuter un appel de contrôleur hors du thread de l'interface
+        
+        Le résultat est remis à on_success dans le thread Tk. Une nouvelle
+        demande avec la même clé remplace la précédente (résultat ignoré).
+        Un traitement long (longue=True) s'exécute sur son propre thread.
+        """
+        AsyncRunner().submit(
+            self.frame,
+            f"{type(self).__name__}.{cle}",
+            fonction,
+            args,
+            on_success=on_success,
+            on_error=on_error or self._on_async_error,
+            longue=longue
+        )
+    
+    def cancel_async(self):
+        """Abandonner les demandes en cours de la vue (l'utilisateur l'a quittée)"""
+        AsyncRunner().cancel_prefix(f"{type(self).__name__}.")
+    
+    def _on_async_error(self, erreur):
+        self.show_error("Erreur", str(erreur))
+    
     def show_error(self, title, message):
         """Afficher un message d'erreur"""
         from tkinter import messagebox
@@ -6,7 +6,7 @@ import tkinter as tk
 from tkinter import ttk
 from datetime import date, timedelta
 from .base_view import BaseView
-from controllers import BilanController, ChargeController
+from controllers import BilanController, ChargeController, ServiceContainer
 from utils.formatters import format_currency, format_date, format_month
 from utils.export import exporter_bilan_pdf
 from config.settings import COLORS
@@ -16,10 +16,12 @@ class BilanView(BaseView):
     """Vue pour le bilan mensuel"""
     
     def __init__(self, parent):
-        self.bilan_controller = BilanController()
-        self.charge_controller = ChargeController()
+        services = ServiceContainer()
+        self.bilan_controller = services.get(BilanController)
+        self.charge_controller = services.get(ChargeController)
         self.mois_selectionne = date.today().replace(day=1)
         self.charges_fixes_vars = {}
+        self.financier = None       # Bilan financier affiché (montants en Money)
         super().__init__(parent)
     
     def setup_ui(self):
@@ -166,14 +168,14 @@ class BilanView(BaseView):
         resume_frame = ttk.LabelFrame(parent, text="💵 Résumé financier du mois", padding=20)
         resume_frame.pack(fill='x', pady=(0, 15))
         
-        self.mois_recette_var = tk.StringVar(value="0.00 DT")
-        self.mois_cout_var = tk.StringVar(value="0.00 DT")
-        self.mois_benefice_brut_var = tk.StringVar(value="0.00 DT")
-        self.mois_charges_jour_var = tk.StringVar(value="0.00 DT")
-        self.mois_charges_fixes_var = tk.StringVar(value="0.00 DT")
-        self.mois_salaires_var = tk.StringVar(value="0.00 DT")
-        self.mois_total_depenses_var = tk.StringVar(value="0.00 DT")
-        self.mois_benefice_net_var = tk.StringVar(value="0.00 DT")
+        self.mois_recette_var = tk.StringVar(value="0.000 DT")
+        self.mois_cout_var = tk.StringVar(value="0.000 DT")
+        self.mois_benefice_brut_var = tk.StringVar(value="0.000 DT")
+        self.mois_charges_jour_var = tk.StringVar(value="0.000 DT")
+        self.mois_charges_fixes_var = tk.StringVar(value="0.000 DT")
+        self.mois_salaires_var = tk.StringVar(value="0.000 DT")
+        self.mois_total_depenses_var = tk.StringVar(value="0.000 DT")
+        self.mois_benefice_net_var = tk.StringVar(value="0.000 DT")
         
         resume_grid = ttk.Frame(resume_frame)
         resume_grid.pack(fill='x')
@@ -272,20 +274,31 @@ class BilanView(BaseView):
                 style='Big.TButton').pack(pady=20)
     
     def charger_bilan(self):
-        """Charger le bilan complet"""
-        charges_fixes = self.charge_controller.get_charges_fixes(self.mois_selectionne)
+        """Charger le bilan complet (en arrière-plan)"""
+        self.run_async('bilan', self._lire_bilan, self.mois_selectionne,
+                       on_success=self._afficher_bilan)
+    
+    def _lire_bilan(self, mois):
+        """Lecture du bilan (thread de travail)"""
+        bilan = self.bilan_controller.get_bilan_complet(mois)
+        return bilan, self.bilan_controller.calculate_bilan_financier(bilan)
+    
+    def _afficher_bilan(self, resultat):
+        """Afficher le bilan lu (thread Tk)"""
+        bilan, financier = resultat
+        self.financier = financier
+        
+        charges_fixes = bilan['charges_fixes']
         if charges_fixes:
             for key in self.charges_fixes_vars:
-                self.charges_fixes_vars[key].set(str(float(charges_fixes[key])))
+                self.charges_fixes_vars[key].set(str(charges_fixes[key]))
             self.autres_description_var.set(charges_fixes.get('autres_description', ''))
         else:
             for key in self.charges_fixes_vars:
                 self.charges_fixes_vars[key].set('0')
             self.autres_description_var.set('')
         
-        self.charger_salaires()
-        bilan = self.bilan_controller.get_bilan_complet(self.mois_selectionne)
-        financier = self.bilan_controller.calculate_bilan_financier(bilan)
+        self.charger_salaires(bilan['salaires'])
         
         self.mois_recette_var.set(format_currency(financier['recette_brute']))
         self.mois_cout_var.set(format_currency(financier['cout_achat']))
@@ -301,8 +314,9 @@ class BilanView(BaseView):
         
         for article in bilan['quantites_articles']:
             quantite = int(article['quantite_totale'])
-            prix = float(article['prix_vente'])
-            total = quantite * prix
+            total = article['total_vente']
+            # Prix moyen réellement pratiqué sur le mois (prix figés des ventes)
+            prix = total / quantite if quantite else 0
             self.quantites_tree.insert('', 'end', values=(
                 article['nom'],
                 quantite,
@@ -317,13 +331,14 @@ class BilanView(BaseView):
             self.depenses_tree.insert('', 'end', values=(
                 format_date(depense['date_charge']),
                 depense['description'],
-                f"{float(depense['montant']):.2f}"
+                str(depense['montant'])
             ))
     
-    def charger_salaires(self):
-        """Charger les salaires"""
+    def charger_salaires(self, salaires=None):
+        """Charger les salaires (ceux du bilan déjà lu s'ils sont fournis)"""
         self.salaires_listbox.delete(0, tk.END)
-        salaires = self.charge_controller.get_salaires(self.mois_selectionne)
+        if salaires is None:
+            salaires = self.charge_controller.get_salaires(self.mois_selectionne)
         
         for salaire in salaires:
             self.salaires_listbox.insert(tk.END, 
@@ -356,7 +371,6 @@ class BilanView(BaseView):
             self.charge_controller.add_salaire(self.mois_selectionne, nom, montant)
             self.salaire_nom_var.set('')
             self.salaire_montant_var.set('')
-            self.charger_salaires()
             self.charger_bilan()
         except Exception as e:
             self.show_error("Erreur", str(e))
@@ -373,7 +387,6 @@ class BilanView(BaseView):
         
         if self.confirm("Confirmation", "Supprimer ce salaire?"):
             self.charge_controller.delete_salaire(salaire_id)
-            self.charger_salaires()
             self.charger_bilan()
     
     def mois_precedent(self):
@@ -404,6 +417,10 @@ class BilanView(BaseView):
         """Exporter le bilan en PDF"""
         from utils.export import exporter_bilan_pdf
         
+        if self.financier is None:
+            self.show_warning("Attention", "Le bilan n'est pas encore chargé!")
+            return
+        
         # Récupérer les données des quantités vendues
         quantites_data = []
         for item in self.quantites_tree.get_children():
@@ -416,25 +433,23 @@ class BilanView(BaseView):
             values = self.depenses_tree.item(item)['values']
             depenses_data.append(values)
         
-        # Récupérer les totaux depuis les variables
-        totaux = {
-            'recette_totale': float(self.mois_recette_var.get().replace(' DT', '').replace(',', '')),
-            'cout_achat': float(self.mois_cout_var.get().replace(' DT', '').replace(',', '')),
-            'benefice_brut': float(self.mois_benefice_brut_var.get().replace(' DT', '').replace(',', '')),
-            'charges_jour': float(self.mois_charges_jour_var.get().replace(' DT', '').replace(',', '')),
-            'charges_fixes': float(self.mois_charges_fixes_var.get().replace(' DT', '').replace(',', '')),
-            'salaires': float(self.mois_salaires_var.get().replace(' DT', '').replace(',', '')),
-            'total_charges': float(self.mois_total_depenses_var.get().replace(' DT', '').replace(',', '')),
-            'benefice_net': float(self.mois_benefice_net_var.get().replace(' DT', '').replace(',', ''))
-        }
-        
-        # Appeler la fonction d'export PDF
-        exporter_bilan_pdf(
-            self.bilan_controller,
-            self.mois_selectionne,
-            quantites_data,
-            depenses_data,
-            totaux
+        # Totaux du bilan affiché, en Money (pas relus depuis le texte affiché)
+        totaux = self.financier
+        
+        # Lire les charges fixes en arrière-plan puis générer le PDF
+        mois = self.mois_selectionne
+        self.run_async(
+            'export',
+            self.bilan_controller.get_charges_fixes_mois,
+            mois,
+            on_success=lambda charges_fixes: exporter_bilan_pdf(
+                self.bilan_controller,
+                mois,
+                quantites_data,
+                depenses_data,
+                totaux,
+                charges_fixes=charges_fixes
+            )
         )
 
     def refresh(self):
@@ -4,19 +4,37 @@ Vue Historique - Historique des ventes
 
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
+from datetime import date, timedelta
 from .base_view import BaseView
-from controllers import VenteController
+from .virtual_treeview import VirtualTreeview
+from controllers import VenteController, ServiceContainer
 from utils.formatters import format_currency, format_date
-from utils.export import export_historique_csv
+from utils.async_runner import AsyncRunner
+from utils.export import demander_fichier_historique, exporter_historique_csv, ProgressionExport
+from utils.validators import parse_date
 from config.settings import COLORS
 
 
 class HistoriqueView(BaseView):
     """Vue pour l'historique des ventes"""
     
+    # Jours lus par page pendant le défilement
+    PAGE_SIZE = 100
+    # Intervalle de mise à jour de la barre de progression de l'export
+    PROGRESSION_MS = 100
+    
     def __init__(self, parent):
-        self.controller = VenteController()
+        self.controller = ServiceContainer().get(VenteController)
+        
+        # Période affichée (une année par défaut)
+        self.fin = date.today()
+        self.debut = self.fin - timedelta(days=364)
+        self.debut_var = tk.StringVar(value=format_date(self.debut))
+        self.fin_var = tk.StringVar(value=format_date(self.fin))
+        self.nb_jours_var = tk.StringVar()
+        self.export_var = tk.StringVar()
+        self.progression = None     # Export en cours
+        
         super().__init__(parent)
     
     def setup_ui(self):
@@ -25,75 +43,117 @@ class HistoriqueView(BaseView):
         btn_frame = ttk.Frame(self.frame)
         btn_frame.pack(fill='x', padx=10, pady=10)
         
+        ttk.Label(btn_frame, text="Du", font=('Arial', 11)).pack(side='left', padx=(5, 2))
+        ttk.Entry(btn_frame, textvariable=self.debut_var, width=11, 
+                 font=('Arial', 11), justify='center').pack(side='left', padx=2)
+        ttk.Label(btn_frame, text="au", font=('Arial', 11)).pack(side='left', padx=2)
+        fin_entry = ttk.Entry(btn_frame, textvariable=self.fin_var, width=11, 
+                             font=('Arial', 11), justify='center')
+        fin_entry.pack(side='left', padx=(2, 5))
+        fin_entry.bind('<Return>', lambda e: self.charger_historique())
+        
         ttk.Button(btn_frame, text="🔄 Actualiser", command=self.charger_historique, 
                   style='Big.TButton').pack(side='left', padx=5)
-        ttk.Button(btn_frame, text="📄 Exporter CSV", command=self.exporter_historique, 
-                  style='Big.TButton').pack(side='left', padx=5)
+        self.export_btn = ttk.Button(btn_frame, text="📄 Exporter CSV", command=self.exporter_historique, 
+                                    style='Big.TButton')
+        self.export_btn.pack(side='left', padx=5)
         ttk.Button(btn_frame, text="🗑️ Supprimer jour sélectionné", command=self.supprimer_jour,
                   style='Big.TButton').pack(side='left', padx=5)
         
-        # TreeView
-        columns = ('Date', 'Recette Brute', 'Coût Achat', 'Bénéfice Brut', 'Charges', 'Bénéfice Net')
-        self.historique_tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=25)
-        
-        for col in columns:
-            self.historique_tree.heading(col, text=col)
-            self.historique_tree.column(col, width=180, anchor='center')
+        ttk.Label(btn_frame, textvariable=self.nb_jours_var, font=('Arial', 11),
+                 foreground=COLORS['secondary']).pack(side='right', padx=5)
         
-        scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.historique_tree.yview)
-        self.historique_tree.configure(yscrollcommand=scrollbar.set)
+        # Progression de l'export (affichée pendant l'écriture du fichier)
+        self.export_frame = ttk.Frame(self.frame)
+        self.export_bar = ttk.Progressbar(self.export_frame, mode='determinate', length=300)
+        self.export_bar.pack(side='left', padx=5)
+        ttk.Label(self.export_frame, textvariable=self.export_var, font=('Arial', 10)).pack(side='left', padx=5)
+        ttk.Button(self.export_frame, text="Annuler", command=self.annuler_export).pack(side='left', padx=5)
         
-        self.historique_tree.pack(side='left', fill='both', expand=True, padx=10)
-        scrollbar.pack(side='right', fill='y')
-        
-        self.historique_tree.bind('<Double-1>', self.voir_details_jour)
+        # TreeView virtuel : seules les lignes visibles sont créées, les jours
+        # suivants sont lus page par page pendant le défilement
+        columns = ('Date', 'Recette Brute', 'Coût Achat', 'Bénéfice Brut', 'Charges', 'Bénéfice Net')
+        self.historique = VirtualTreeview(
+            self.frame, columns,
+            valeurs=self._valeurs_jour,
+            cle=lambda jour: jour['date_vente'],
+            charger_page=self._charger_page,
+            page_size=self.PAGE_SIZE
+        )
+        self.historique.pack(fill='both', expand=True, padx=10)
+        self.historique.tree.bind('<Double-1>', self.voir_details_jour)
         
         self.charger_historique()
     
+    def lire_periode(self):
+        """Période saisie (debut, fin), None après un avertissement si elle est invalide"""
+        try:
+            debut = parse_date(self.debut_var.get(), "La date de début")
+            fin = parse_date(self.fin_var.get(), "La date de fin")
+            if fin < debut:
+                raise ValueError("La date de fin précède la date de début!")
+        except ValueError as e:
+            self.show_warning("Attention", str(e))
+            return None
+        return debut, fin
+    
     def charger_historique(self):
-        """Charger l'historique"""
-        for item in self.historique_tree.get_children():
-            self.historique_tree.delete(item)
-        
-        historique = self.controller.get_historique(limit=90)
-        
-        for jour in historique:
-            self.historique_tree.insert('', 'end', values=(
-                format_date(jour['date_vente']),
-                format_currency(jour['recette_brute']),
-                format_currency(jour['cout_achat']),
-                format_currency(jour['benefice_brut']),
-                format_currency(jour['total_charges']),
-                format_currency(jour['benefice_net'])
-            ))
+        """Charger la période saisie : nombre de jours et première page (en arrière-plan)"""
+        periode = self.lire_periode()
+        if periode is None:
+            return
+        
+        debut, fin = periode
+        self.debut, self.fin = debut, fin
+        self.run_async('historique', self.controller.get_historique_periode, debut, fin, self.PAGE_SIZE,
+                       on_success=self._afficher_historique)
+    
+    def _afficher_historique(self, resultat):
+        """Afficher la première page lue (thread Tk)"""
+        self.historique.charger(resultat['total'], resultat['lignes'])
+        self.nb_jours_var.set(f"{resultat['total']} jour(s)")
+    
+    def _charger_page(self, apres, limit, on_page, on_error):
+        """Lire la page suivant le jour apres (appelé par le TreeView au défilement)"""
+        def erreur(e):
+            on_error(e)
+            self._on_async_error(e)
+        
+        self.run_async('historique_page', self.controller.get_historique_page,
+                       self.debut, self.fin, apres, limit,
+                       on_success=on_page, on_error=erreur)
+    
+    @staticmethod
+    def _valeurs_jour(jour):
+        return (
+            format_date(jour['date_vente']),
+            format_currency(jour['recette_brute']),
+            format_currency(jour['cout_achat']),
+            format_currency(jour['benefice_brut']),
+            format_currency(jour['total_charges']),
+            format_currency(jour['benefice_net'])
+        )
     
     def voir_details_jour(self, event):
         """Double-clic pour voir les détails"""
-        selection = self.historique_tree.selection()
-        if not selection:
+        jour = self.historique.ligne_selectionnee()
+        if jour is None:
             return
         
-        item = self.historique_tree.item(selection[0])
-        date_str = item['values'][0]
+        date_str = format_date(jour['date_vente'])
         
         # TODO: Basculer vers l'onglet ventes avec cette date
         self.show_success("Navigation", f"Voir détails du {date_str}\n\n(Fonctionnalité à implémenter)")
     
     def supprimer_jour(self):
         """Supprimer un jour"""
-        selection = self.historique_tree.selection()
-        if not selection:
+        jour = self.historique.ligne_selectionnee()
+        if jour is None:
             self.show_warning("Attention", "Veuillez sélectionner un jour!")
             return
         
-        item = self.historique_tree.item(selection[0])
-        date_str = item['values'][0]
-        
-        try:
-            date_obj = datetime.strptime(date_str, '%d/%m/%Y').date()
-        except Exception:
-            self.show_error("Erreur", "Date invalide!")
-            return
+        date_obj = jour['date_vente']
+        date_str = format_date(date_obj)
         
         if not self.confirm("⚠️ CONFIRMATION", 
             f"Supprimer toutes les ventes et charges du {date_str}?\n\n" +
@@ -112,16 +172,74 @@ class HistoriqueView(BaseView):
                 f"Suppression terminée:\n{ventes_suppr} vente(s) et {charges_suppr} charge(s) supprimées.")
             
             self.charger_historique()
-            
+        
         except Exception as e:
             self.show_error("Erreur", str(e))
     
     def exporter_historique(self):
-        """Exporter l'historique"""
-        historique = self.controller.get_historique(limit=365)
-        filename = export_historique_csv(historique)
-        if filename:
-            self.show_success("Succès", f"Historique exporté:\n{filename}")
+        """Exporter la période saisie en CSV (écriture en arrière-plan, avec progression)"""
+        if self.progression is not None:
+            return
+        
+        periode = self.lire_periode()
+        if periode is None:
+            return
+        
+        debut, fin = periode
+        filename = demander_fichier_historique(debut, fin)
+        if not filename:
+            return
+        
+        self.progression = progression = ProgressionExport()
+        self.export_btn.state(['disabled'])
+        self.export_bar.configure(value=0, maximum=1)
+        self.export_var.set("Export en cours...")
+        self.export_frame.pack(fill='x', padx=10, pady=(0, 10), before=self.historique.frame)
+        
+        # Lignes lues en flux et écrites par lots, sur le thread des traitements longs
+        self.run_async('export', exporter_historique_csv, filename, debut, fin, self.controller, progression,
+                       on_success=lambda nb_jours: self._export_termine(filename, nb_jours),
+                       on_error=self._export_echoue, longue=True)
+        self.frame.after(self.PROGRESSION_MS, self._suivre_export)
+    
+    def annuler_export(self):
+        """Arrêter l'export en cours (le fichier partiel est supprimé)"""
+        if self.progression is not None:
+            self.progression.annuler()
+            self.export_var.set("Annulation...")
+    
+    def _suivre_export(self):
+        """Mettre à jour la barre de progression tant que l'export tourne"""
+        if self.progression is None:
+            return
+        lignes, total = self.progression.etat()
+        if total:
+            self.export_bar.configure(value=lignes, maximum=total)
+            if not self.progression.annule:
+                self.export_var.set(f"{lignes} / {total} jour(s)")
+        self.frame.after(self.PROGRESSION_MS, self._suivre_export)
+    
+    def _fin_export(self):
+        self.progression = None
+        self.export_frame.pack_forget()
+        self.export_btn.state(['!disabled'])
+    
+    def _export_termine(self, filename, nb_jours):
+        self._fin_export()
+        if nb_jours is None:
+            self.show_warning("Export annulé", "L'export a été annulé, aucun fichier n'a été conservé.")
+        else:
+            self.show_success("Succès", f"Historique exporté ({nb_jours} jour(s)):\n{filename}")
+    
+    def _export_echoue(self, erreur):
+        self._fin_export()
+        self.show_error("Erreur", f"Erreur lors de l'export:\n{erreur}")
+    
+    def cancel_async(self):
+        """Abandonner les chargements en cours (l'export lancé continue jusqu'au bout)"""
+        runner = AsyncRunner()
+        for cle in ('historique', 'historique_page'):
+            runner.cancel(f"{type(self).__name__}.{cle}")
     
     def refresh(self):
         """Rafraîchir la vue"""
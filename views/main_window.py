@@ -9,12 +9,24 @@ from views.ventes_view import VentesView
 from views.articles_view import ArticlesView
 from views.bilan_view import BilanView
 from views.historique_view import HistoriqueView
+from views.tendances_view import TendancesView
 from utils.logger import get_logger
+from utils.instrumentation import QueryStats
+from utils.profiling import StartupProfiler
 
 
 class MainWindow:
     """Fenêtre principale avec onglets"""
     
+    # Onglets dans l'ordre d'affichage : (clé, titre, classe de vue)
+    ONGLETS = (
+        ('ventes', '📅 Ventes du Jour', VentesView),
+        ('articles', '🛍️ Articles', ArticlesView),
+        ('bilan', '📊 Bilan Mensuel', BilanView),
+        ('historique', '📊 Historique', HistoriqueView),
+        ('tendances', '📈 Tendances', TendancesView),
+    )
+    
     def __init__(self, root):
         self.root = root
         self.logger = get_logger()
@@ -22,6 +34,8 @@ class MainWindow:
         self.create_header()
         self.create_notebook()
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        # Statistiques des requêtes SQL de la session
+        self.root.bind('<Control-F12>', self.afficher_stats_requetes)
     
     def setup_window(self):
         """Configuration de la fenêtre"""
@@ -53,39 +67,72 @@ class MainWindow:
         title.pack(pady=20)
     
     def create_notebook(self):
-        """Créer les onglets"""
+        """Créer les onglets (chaque vue est construite à sa première sélection)"""
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
         
-        # Créer les vues
-        self.ventes_view = VentesView(self.notebook)
-        self.articles_view = ArticlesView(self.notebook)
-        self.bilan_view = BilanView(self.notebook)
-        self.historique_view = HistoriqueView(self.notebook)
+        self.views = {}
+        self._onglets = {}      # nom du cadre Tk -> (clé, titre, classe de vue)
+        for cle, titre, classe in self.ONGLETS:
+            cadre = ttk.Frame(self.notebook)
+            self.notebook.add(cadre, text=titre)
+            self._onglets[str(cadre)] = (cle, titre, classe)
         
-        # Ajouter les onglets
-        self.notebook.add(self.ventes_view.get_frame(), text='📅 Ventes du Jour')
-        self.notebook.add(self.articles_view.get_frame(), text='🛍️ Articles')
-        self.notebook.add(self.bilan_view.get_frame(), text='📊 Bilan Mensuel')
-        self.notebook.add(self.historique_view.get_frame(), text='📊 Historique')
+        # L'onglet affiché au démarrage ; les ventes en attente y sont gérées
+        self.construire_vue(str(self.notebook.tabs()[0]))
         
         # Observer les changements d'onglets
         self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
     
+    @property
+    def ventes_view(self):
+        return self.views['ventes']
+    
+    def construire_vue(self, onglet):
+        """Construire la vue d'un onglet dans son cadre"""
+        cle, titre, classe = self._onglets[onglet]
+        with StartupProfiler().etape(f"Vue {titre}"):
+            view = classe(self.notebook.nametowidget(onglet))
+            view.get_frame().pack(fill='both', expand=True)
+        self.views[cle] = view
+        return view
+    
     def on_tab_changed(self, event):
         """Événement changement d'onglet"""
         current_tab = self.notebook.select()
         tab_text = self.notebook.tab(current_tab, "text")
+        cle = self._onglets[str(current_tab)][0]
+        
+        # Les chargements encore en cours des onglets quittés sont abandonnés
+        for autre, view in self.views.items():
+            if autre != cle and autre in ('historique', 'bilan', 'tendances'):
+                view.cancel_async()
+        
         self.logger.info(f"Changement d'onglet: {tab_text}")
         
-        # Rafraîchir la vue si nécessaire
-        if "Historique" in tab_text:
-            self.historique_view.refresh()
-        elif "Bilan" in tab_text:
-            self.bilan_view.refresh()
+        # Première visite : la vue se charge en se construisant
+        if cle not in self.views:
+            self.construire_vue(str(current_tab))
+            return
+        
+        # Rafraîchir la vue (les requêtes sont mesurées par AsyncRunner)
+        self.views[cle].refresh()
+    
+    def afficher_stats_requetes(self, event=None):
+        """Afficher les statistiques des requêtes SQL (Ctrl+F12)"""
+        fenetre = tk.Toplevel(self.root)
+        fenetre.title("Statistiques des requêtes SQL")
+        fenetre.geometry("1000x500")
+        
+        texte = tk.Text(fenetre, font=('Courier', 10), wrap='none')
+        texte.pack(fill='both', expand=True)
+        texte.insert('1.0', QueryStats().report())
+        texte.configure(state='disabled')
     
     def on_closing(self):
         """Fermeture de l'application"""
         if messagebox.askokcancel("Quitter", "Voulez-vous quitter Sultan Ahmed?"):
             self.logger.info("🛑 Fermeture de l'application")
+            if not self.ventes_view.enregistrer_en_attente():
+                self.logger.warning("Ventes en attente conservées dans le journal")
             self.root.destroy()
\ No newline at end of file
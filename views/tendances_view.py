@@ -0,0 +1,176 @@
+"""
+Vue Tendances - Tendances des ventes par article et évolution mensuelle
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from datetime import date, timedelta
+from .base_view import BaseView
+from controllers import AnalyticsController, ServiceContainer
+from utils.formatters import format_currency, format_date, format_month, format_number, format_percentage
+from utils.validators import parse_date
+from config.settings import COLORS
+
+
+class TendancesView(BaseView):
+    """Vue des tendances des ventes (analyses NumPy, si installé)"""
+    
+    def __init__(self, parent):
+        self.controller = ServiceContainer().get(AnalyticsController)
+        
+        # Période analysée (une année par défaut)
+        fin = date.today()
+        self.debut_var = tk.StringVar(value=format_date(fin - timedelta(days=364)))
+        self.fin_var = tk.StringVar(value=format_date(fin))
+        self.periode_var = tk.StringVar()
+        
+        super().__init__(parent)
+    
+    def setup_ui(self):
+        """Créer l'interface"""
+        if not self.controller.disponible():
+            ttk.Label(self.frame,
+                     text="Les tendances demandent le module numpy.\n\n"
+                          "Installez-le avec:\npip install numpy",
+                     font=('Arial', 12), justify='center',
+                     foreground=COLORS['danger']).pack(pady=40)
+            return
+        
+        # Période
+        btn_frame = ttk.Frame(self.frame)
+        btn_frame.pack(fill='x', padx=10, pady=10)
+        
+        ttk.Label(btn_frame, text="Du", font=('Arial', 11)).pack(side='left', padx=(5, 2))
+        ttk.Entry(btn_frame, textvariable=self.debut_var, width=11,
+                 font=('Arial', 11), justify='center').pack(side='left', padx=2)
+        ttk.Label(btn_frame, text="au", font=('Arial', 11)).pack(side='left', padx=2)
+        fin_entry = ttk.Entry(btn_frame, textvariable=self.fin_var, width=11,
+                             font=('Arial', 11), justify='center')
+        fin_entry.pack(side='left', padx=(2, 5))
+        fin_entry.bind('<Return>', lambda e: self.charger_tendances())
+        
+        ttk.Button(btn_frame, text="🔄 Analyser", command=self.charger_tendances,
+                  style='Big.TButton').pack(side='left', padx=5)
+        
+        ttk.Label(btn_frame, textvariable=self.periode_var, font=('Arial', 11),
+                 foreground=COLORS['secondary']).pack(side='right', padx=5)
+        
+        # Tendances par article
+        articles_frame = ttk.LabelFrame(self.frame, text="📈 Tendances par article (7 derniers jours)", padding=10)
+        articles_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        self.articles_tree = self._creer_tableau(articles_frame, (
+            ('Article', 220, 'w'),
+            ('Quantité', 90, 'center'),
+            ('Recette', 130, 'center'),
+            ('Marge', 130, 'center'),
+            ('Taux de marge', 100, 'center'),
+            ('Moyenne / jour', 110, 'center'),
+            ('Semaine précédente', 200, 'center'),
+            ('Année précédente', 200, 'center'),
+        ), height=12)
+        
+        # Évolution mensuelle
+        mois_frame = ttk.LabelFrame(self.frame, text="📅 Évolution mensuelle", padding=10)
+        mois_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+        self.mois_tree = self._creer_tableau(mois_frame, (
+            ('Mois', 160, 'w'),
+            ('Quantité', 110, 'center'),
+            ('Recette', 150, 'center'),
+            ('Marge', 150, 'center'),
+            ('Sur un an', 110, 'center'),
+        ), height=8)
+        
+        self.charger_tendances()
+    
+    @staticmethod
+    def _creer_tableau(parent, colonnes, height):
+        """TreeView avec barre de défilement ; colonnes : (titre, largeur, alignement)"""
+        tree = ttk.Treeview(parent, columns=[titre for titre, _, _ in colonnes], show='headings', height=height)
+        for titre, largeur, ancre in colonnes:
+            tree.heading(titre, text=titre)
+            tree.column(titre, width=largeur, anchor=ancre)
+        
+        scrollbar = ttk.Scrollbar(parent, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        return tree
+    
+    def lire_periode(self):
+        """Période saisie (debut, fin), None après un avertissement si elle est invalide"""
+        try:
+            debut = parse_date(self.debut_var.get(), "La date de début")
+            fin = parse_date(self.fin_var.get(), "La date de fin")
+            if fin < debut:
+                raise ValueError("La date de fin précède la date de début!")
+        except ValueError as e:
+            self.show_warning("Attention", str(e))
+            return None
+        return debut, fin
+    
+    def charger_tendances(self):
+        """Analyser la période saisie (calcul long, en arrière-plan)"""
+        periode = self.lire_periode()
+        if periode is None:
+            return
+        
+        self.periode_var.set("Analyse en cours...")
+        self.run_async('tendances', self._lire_tendances, *periode,
+                       on_success=self._afficher_tendances, longue=True)
+    
+    def _lire_tendances(self, debut, fin):
+        """Lecture des analyses (thread de travail)
+        
+        L'évolution mensuelle part un an plus tôt : chaque mois affiché a
+        son mois de comparaison de l'année précédente.
+        """
+        premier_mois = debut.replace(day=1)
+        evolution = self.controller.get_evolution_mensuelle(premier_mois.replace(year=premier_mois.year - 1), fin)
+        return (
+            debut, fin,
+            self.controller.get_tendances_articles(debut, fin),
+            [mois for mois in evolution if mois['mois'] >= premier_mois]
+        )
+    
+    def _afficher_tendances(self, resultat):
+        """Afficher les analyses lues (thread Tk)"""
+        debut, fin, tendances, evolution = resultat
+        self.periode_var.set(f"{format_date(debut)} - {format_date(fin)} : {len(tendances)} article(s) vendu(s)")
+        
+        self.articles_tree.delete(*self.articles_tree.get_children())
+        for article in tendances:
+            self.articles_tree.insert('', 'end', values=(
+                article['nom'],
+                format_number(article['quantite']),
+                format_currency(article['recette']),
+                format_currency(article['marge']),
+                format_percentage(article['taux_marge']),
+                format_number(article['moyenne_jour']) if article['moyenne_jour'] is not None else '—',
+                self._variation(article['semaine_ecart'], article['semaine_taux']),
+                self._variation(article['annee_ecart'], article['annee_taux']),
+            ))
+        
+        self.mois_tree.delete(*self.mois_tree.get_children())
+        for mois in evolution:
+            self.mois_tree.insert('', 'end', values=(
+                format_month(mois['mois']),
+                format_number(mois['quantite']),
+                format_currency(mois['recette']),
+                format_currency(mois['marge']),
+                f"{mois['annee_taux']:+.1f}%" if mois['annee_taux'] is not None else '—',
+            ))
+    
+    @staticmethod
+    def _variation(ecart, taux):
+        """Écart de recette et taux, '—' sans période de comparaison"""
+        if ecart is None:
+            return '—'
+        if taux is None:
+            return format_currency(ecart)
+        return f"{format_currency(ecart)} ({taux:+.1f}%)"
+    
+    def refresh(self):
+        """Rafraîchir la vue"""
+        if self.controller.disponible():
+            self.charger_tendances()
@@ -6,7 +6,7 @@ import tkinter as tk
 from tkinter import ttk
 from datetime import date, timedelta
 from .base_view import BaseView
-from controllers import VenteController, ArticleController, ChargeController
+from controllers import VenteController, ArticleController, ChargeController, PrevisionController, ServiceContainer
 from utils.formatters import format_currency, format_date
 from config.settings import COLORS
 
@@ -16,25 +16,28 @@ class VentesView(BaseView):
     
     def __init__(self, parent):
         # Contrôleurs
-        self.vente_controller = VenteController()
-        self.article_controller = ArticleController()
-        self.charge_controller = ChargeController()
+        services = ServiceContainer()
+        self.vente_controller = services.get(VenteController)
+        self.article_controller = services.get(ArticleController)
+        self.charge_controller = services.get(ChargeController)
+        self.prevision_controller = services.get(PrevisionController)
         
         # État
         self.date_selectionnee = date.today()
         self.quantite_entries = {}
+        self.version_catalogue = None
         
         # ✅ VARIABLES TKINTER (créées AVANT super().__init__)
         self.date_var = tk.StringVar(value=format_date(self.date_selectionnee))
         self.charge_desc_var = tk.StringVar()
         self.charge_montant_var = tk.StringVar()
         
-        self.recette_brute_var = tk.StringVar(value="0.00 DT")
-        self.cout_achat_var = tk.StringVar(value="0.00 DT")
-        self.benefice_brut_var = tk.StringVar(value="0.00 DT")
-        self.charges_var = tk.StringVar(value="0.00 DT")
-        self.charges_journalieres_var = tk.StringVar(value="0.00 DT")
-        self.benefice_net_var = tk.StringVar(value="0.00 DT")
+        self.recette_brute_var = tk.StringVar(value="0.000 DT")
+        self.cout_achat_var = tk.StringVar(value="0.000 DT")
+        self.benefice_brut_var = tk.StringVar(value="0.000 DT")
+        self.charges_var = tk.StringVar(value="0.000 DT")
+        self.charges_journalieres_var = tk.StringVar(value="0.000 DT")
+        self.benefice_net_var = tk.StringVar(value="0.000 DT")
         
         # Appeler le constructeur parent (qui appelle setup_ui)
         super().__init__(parent)
@@ -58,6 +61,8 @@ class VentesView(BaseView):
         right_column.pack(side='right', fill='both', padx=(10, 0))
         
         self.create_resume_financier(right_column)
+        
+        self.precharger_jours_voisins()
     
     def create_date_selector(self, parent):
         """Sélecteur de date"""
@@ -193,12 +198,36 @@ class VentesView(BaseView):
     # ... (le reste du code reste identique) ...
     
     def charger_articles_saisie(self):
-        """Charger les articles pour saisie"""
+        """Charger les articles pour saisie
+        
+        Les lignes de saisie sont créées une fois par catalogue : changer de
+        jour ne fait que mettre à jour les quantités et les prix affichés.
+        """
+        version = self.article_controller.get_catalogue_version()
+        articles = self.vente_controller.get_feuille_jour(self.date_selectionnee)
+        
+        if version != self.version_catalogue or [a['id'] for a in articles] != list(self.quantite_entries):
+            self.version_catalogue = version
+            self.construire_lignes_saisie(articles)
+        else:
+            for article in articles:
+                ligne = self.quantite_entries[article['id']]
+                ligne['var'].set(str(article['quantite']))
+                if article['prix_vente'] != ligne['article']['prix_vente']:
+                    ligne['prix_label'].configure(text=format_currency(article['prix_vente']))
+                if article['nom'] != ligne['article']['nom']:
+                    ligne['nom_label'].configure(text=article['nom'])
+                ligne['article'] = article
+        
+        self.calculer_totaux()
+        self.charger_previsions()
+    
+    def construire_lignes_saisie(self, articles):
+        """Créer une ligne de saisie par article (après un changement du catalogue)"""
         for widget in self.articles_saisie_frame.winfo_children():
             widget.destroy()
         
         self.quantite_entries.clear()
-        articles = self.article_controller.get_all_articles()
         
         if not articles:
             ttk.Label(self.articles_saisie_frame, 
@@ -214,6 +243,8 @@ class VentesView(BaseView):
         ttk.Label(header, text="Article", font=('Arial', 11, 'bold'), width=30).pack(side='left', padx=10)
         ttk.Label(header, text="Prix", font=('Arial', 11, 'bold'), width=12).pack(side='left', padx=10)
         ttk.Label(header, text="Quantité vendue", font=('Arial', 11, 'bold'), width=15).pack(side='left', padx=10)
+        if self.prevision_controller.disponible():
+            ttk.Label(header, text="Prévision", font=('Arial', 11, 'bold'), width=10).pack(side='left', padx=10)
         
         ttk.Separator(self.articles_saisie_frame, orient='horizontal').pack(fill='x', pady=5)
         
@@ -239,23 +270,55 @@ class VentesView(BaseView):
             prix_label.pack(side='left', padx=10)
             
             quantite_var = tk.StringVar()
-            quantite = self.vente_controller.get_quantite(self.date_selectionnee, article['id'])
-            quantite_var.set(str(quantite))
+            quantite_var.set(str(article['quantite']))
             
             entry = ttk.Entry(article_frame, textvariable=quantite_var, 
                             width=15, font=('Arial', 12), justify='center')
             entry.pack(side='left', padx=10)
             
+            prevision_label = tk.Label(article_frame, text='', 
+                                      font=('Arial', 10),
+                                      width=10,
+                                      fg=COLORS['secondary'],
+                                      bg=bg_color)
+            if self.prevision_controller.disponible():
+                prevision_label.pack(side='left', padx=10)
+            
             self.quantite_entries[article['id']] = {
                 'var': quantite_var,
                 'entry': entry,
+                'nom_label': nom_label,
+                'prix_label': prix_label,
+                'prevision_label': prevision_label,
                 'article': article
             }
             
             entry.bind('<FocusOut>', lambda e, aid=article['id']: self.enregistrer_quantite_auto(aid))
             entry.bind('<Return>', lambda e, aid=article['id']: self.enregistrer_quantite_auto(aid))
+    
+    def charger_previsions(self):
+        """Afficher la quantité prévue de chaque article (calculée en arrière-plan)"""
+        if not self.prevision_controller.disponible():
+            return
         
-        self.calculer_totaux()
+        jour = self.date_selectionnee
+        previsions = self.prevision_controller.get_previsions_jour(jour, charger=False)
+        self.afficher_previsions(previsions or {})
+        if previsions is None:
+            self.run_async('previsions', self.prevision_controller.get_previsions_jour, jour,
+                           on_success=lambda previsions: self.previsions_recues(jour, previsions),
+                           on_error=lambda erreur: None)  # Déjà journalisée ; la saisie reste possible
+    
+    def previsions_recues(self, jour, previsions):
+        """Prévisions calculées en arrière-plan (ignorées si le jour affiché a changé)"""
+        if jour == self.date_selectionnee:
+            self.afficher_previsions(previsions)
+    
+    def afficher_previsions(self, previsions):
+        """Mettre à jour la colonne Prévision"""
+        for article_id, ligne in self.quantite_entries.items():
+            quantite = previsions.get(article_id)
+            ligne['prevision_label'].configure(text=f"≈ {quantite:.0f}" if quantite is not None else '')
     
     def enregistrer_quantite_auto(self, article_id):
         """Enregistrer automatiquement"""
@@ -277,7 +340,7 @@ class VentesView(BaseView):
     def charger_charges(self):
         """Charger les charges"""
         self.charges_listbox.delete(0, tk.END)
-        charges = self.charge_controller.get_charges_jour(self.date_selectionnee)
+        charges = self.vente_controller.get_charges_jour(self.date_selectionnee)
         
         for charge in charges:
             self.charges_listbox.insert(tk.END, 
@@ -343,27 +406,70 @@ class VentesView(BaseView):
     
     def jour_precedent(self):
         """Jour précédent"""
+        self.vente_controller.flush_ventes()
         self.date_selectionnee -= timedelta(days=1)
         self.date_var.set(format_date(self.date_selectionnee))
         self.charger_articles_saisie()
         self.charger_charges()
+        self.precharger_jours_voisins()
     
     def jour_suivant(self):
         """Jour suivant"""
+        self.vente_controller.flush_ventes()
         self.date_selectionnee += timedelta(days=1)
         self.date_var.set(format_date(self.date_selectionnee))
         self.charger_articles_saisie()
         self.charger_charges()
+        self.precharger_jours_voisins()
     
     def aller_aujourdhui(self):
         """Aujourd'hui"""
+        self.vente_controller.flush_ventes()
         self.date_selectionnee = date.today()
         self.date_var.set(format_date(self.date_selectionnee))
         self.charger_articles_saisie()
         self.charger_charges()
+        self.precharger_jours_voisins()
+    
+    def precharger_jours_voisins(self):
+        """Préparer en arrière-plan la veille et le lendemain du jour affiché"""
+        jour = self.date_selectionnee
+        self.run_async('voisins', self.vente_controller.prefetch_jours,
+                       jour - timedelta(days=1), jour + timedelta(days=1),
+                       on_error=lambda erreur: None)  # Déjà journalisée ; la navigation relira la base
+        if self.prevision_controller.disponible():
+            self.run_async('previsions_voisins', self.prevision_controller.prefetch_jours,
+                           jour - timedelta(days=1), jour + timedelta(days=1),
+                           on_error=lambda erreur: None)
+    
+    def ecrire_ventes(self):
+        """Écrire les ventes en attente et signaler un échec
+        
+        Returns:
+            True si toutes les saisies sont en base
+        """
+        ecrites = self.vente_controller.flush_ventes()
+        rejetees = self.vente_controller.prendre_ventes_rejetees()
+        if rejetees:
+            details = '\n'.join(
+                f"- {format_date(rejet['date_vente'])} : article n°{rejet['article_id']}, quantité {rejet['quantite']}"
+                for rejet in rejetees[:10]
+            )
+            if len(rejetees) > 10:
+                details += f"\n... et {len(rejetees) - 10} autre(s)"
+            self.show_error("Erreur",
+                f"{len(rejetees)} vente(s) refusée(s) par la base de données et écartée(s):\n{details}\n\n"
+                "Article supprimé entre-temps ? Vérifiez et ressaisissez ces quantités.")
+        elif not ecrites:
+            self.show_warning("Attention",
+                "Les ventes n'ont pas pu être écrites en base.\n"
+                "Elles sont conservées et seront réessayées automatiquement.")
+        return ecrites and not rejetees
     
     def enregistrer_journee(self):
         """Enregistrer"""
+        if not self.ecrire_ventes():
+            return
         self.show_success("Succès", 
             f"Ventes du {format_date(self.date_selectionnee)} enregistrées!\n\n" +
             f"Bénéfice net : {self.benefice_net_var.get()}")
@@ -373,6 +479,9 @@ class VentesView(BaseView):
         if self.confirm("Confirmation", 
             f"Enregistrer les ventes du {format_date(self.date_selectionnee)} et passer au jour suivant?"):
             
+            if not self.ecrire_ventes():
+                return
+            
             self.show_success("Succès", 
                 f"Journée enregistrée!\nBénéfice net : {self.benefice_net_var.get()}")
             
@@ -383,14 +492,21 @@ class VentesView(BaseView):
         if self.confirm("Confirmation", 
             "Remettre toutes les quantités à 0 pour ce jour?"):
             
-            articles = self.article_controller.get_all_articles()
-            for article in articles:
-                self.vente_controller.save_vente(self.date_selectionnee, article['id'], 0)
-            
-            charges = self.charge_controller.get_charges_jour(self.date_selectionnee)
-            for charge in charges:
-                self.charge_controller.delete_charge(charge['id'])
+            try:
+                self.vente_controller.reinitialiser_jour(self.date_selectionnee)
+            except Exception as e:
+                self.show_error("Erreur", str(e))
+                return
             
             self.charger_articles_saisie()
             self.charger_charges()
-            self.show_success("Succès", "Quantités réinitialisées!")
\ No newline at end of file
+            self.show_success("Succès", "Quantités réinitialisées!")
+    
+    def refresh(self):
+        """Rafraîchir la saisie si des articles ont changé depuis l'affichage"""
+        if self.article_controller.get_catalogue_version() != self.version_catalogue:
+            self.charger_articles_saisie()
+    
+    def enregistrer_en_attente(self):
+        """Écrire les ventes en attente (fermeture de l'application)"""
+        return self.vente_controller.flush_ventes()
\ No newline at end of file
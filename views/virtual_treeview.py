@@ -0,0 +1,250 @@
+"""
+Treeview virtuel - Seules les lignes visibles existent dans le widget
+Les lignes sont lues page par page (pagination par clé) au fil du défilement
+"""
+
+from tkinter import ttk
+
+
+class VirtualTreeview:
+    """Tableau affichant une fenêtre d'une longue liste de lignes
+    
+    Le Treeview ne contient que les items visibles, réutilisés à chaque
+    défilement ; la barre de défilement représente la liste entière (nombre
+    total de lignes connu à l'avance). La page suivante est demandée quand la
+    fenêtre affichée approche de la fin des lignes déjà lues.
+    
+    Args:
+        parent: Conteneur Tk
+        columns: Titres des colonnes
+        valeurs: Ligne -> valeurs affichées
+        cle: Ligne -> clé de pagination (la page suivante commence après)
+        charger_page: charger_page(apres, limit, on_page, on_error) lit les
+            `limit` lignes suivant la clé `apres` et remet la liste à on_page
+        page_size: Lignes par page
+        height: Lignes visibles à la création
+    """
+    
+    # Une page est demandée quand il reste moins de cette part de page à afficher
+    ANTICIPATION = 0.5
+    
+    def __init__(self, parent, columns, valeurs, cle, charger_page, page_size=100, height=25):
+        self.valeurs = valeurs
+        self.cle = cle
+        self.charger_page = charger_page
+        self.page_size = page_size
+        self.vide = ('…',) + ('',) * (len(columns) - 1)
+        
+        self.lignes = []
+        self.total = 0
+        self.premier = 0            # Indice de la première ligne affichée
+        self.selection = None       # Indice de la ligne sélectionnée
+        self._complet = True
+        self._en_chargement = False
+        self._generation = 0
+        self._hauteur = None        # Hauteur du Treeview (dernier <Configure>)
+        
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show='headings',
+                                 height=height, selectmode='browse')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=180, anchor='center')
+        
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.yview)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+        
+        # Items réutilisés ; seuls les `affiches` premiers sont attachés
+        self.items = [self.tree.insert('', 'end') for _ in range(height)]
+        self.affiches = len(self.items)
+        
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._defiler(-3))
+        self.tree.bind('<Button-5>', lambda e: self._defiler(3))
+        self.tree.bind('<Up>', lambda e: self.deplacer_selection(-1))
+        self.tree.bind('<Down>', lambda e: self.deplacer_selection(1))
+        self.tree.bind('<Prior>', lambda e: self.deplacer_selection(-self.visibles))
+        self.tree.bind('<Next>', lambda e: self.deplacer_selection(self.visibles))
+        self.tree.bind('<Home>', lambda e: self.deplacer_selection(-self.total))
+        self.tree.bind('<End>', lambda e: self.deplacer_selection(self.total))
+        
+        self._afficher()
+    
+    @property
+    def visibles(self):
+        return len(self.items)
+    
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+    
+    def charger(self, total, lignes):
+        """Afficher une nouvelle liste : nombre total de lignes et première page"""
+        self._generation += 1
+        self.lignes = list(lignes)
+        self.total = total
+        self.premier = 0
+        self.selection = None
+        self._en_chargement = False
+        self._complet = len(self.lignes) < self.page_size
+        self._ajuster_total()
+        self._afficher()
+        self._charger_si_besoin()
+        # Hauteur des lignes connue une fois les items affichés
+        self.tree.after_idle(self._adapter)
+    
+    def ligne_selectionnee(self):
+        """Ligne sélectionnée (None si aucune ou pas encore lue)"""
+        if self.selection is None or self.selection >= len(self.lignes):
+            return None
+        return self.lignes[self.selection]
+    
+    # ---- Défilement ----
+    
+    def yview(self, *args):
+        """Commande de la barre de défilement (moveto / scroll)"""
+        if args[0] == 'moveto':
+            self.aller_a(int(float(args[1]) * self.total))
+        elif args[0] == 'scroll':
+            pas = self.visibles if args[2] == 'pages' else 1
+            self.aller_a(self.premier + int(args[1]) * pas)
+    
+    def aller_a(self, premier):
+        """Afficher les lignes à partir de l'indice premier"""
+        premier = max(0, min(premier, self.total - self.visibles))
+        if premier != self.premier:
+            self.premier = premier
+            self._afficher()
+        self._charger_si_besoin()
+    
+    def deplacer_selection(self, delta):
+        """Déplacer la sélection (clavier) en gardant la ligne visible"""
+        if not self.total:
+            return 'break'
+        depart = self.selection if self.selection is not None else self.premier - (1 if delta > 0 else -1)
+        self.selection = max(0, min(depart + delta, self.total - 1))
+        if self.selection < self.premier:
+            self.aller_a(self.selection)
+        elif self.selection >= self.premier + self.visibles:
+            self.aller_a(self.selection - self.visibles + 1)
+        self._afficher_selection()
+        return 'break'
+    
+    def _defiler(self, lignes):
+        self.aller_a(self.premier + lignes)
+        return 'break'
+    
+    def _on_mousewheel(self, event):
+        # Windows : multiples de 120 ; macOS : petites valeurs
+        return self._defiler(-3 if event.delta > 0 else 3)
+    
+    # ---- Affichage ----
+    
+    def _afficher(self):
+        """Remplir les items visibles avec les lignes de la fenêtre"""
+        nb = max(0, min(self.visibles, self.total - self.premier))
+        for position, item in enumerate(self.items[:nb]):
+            index = self.premier + position
+            self.tree.item(item, values=self.valeurs(self.lignes[index]) if index < len(self.lignes) else self.vide)
+        
+        # Items en trop détachés (fin de liste), rattachés quand la fenêtre se remplit
+        if nb < self.affiches:
+            self.tree.detach(*self.items[nb:self.affiches])
+        for position in range(self.affiches, nb):
+            self.tree.move(self.items[position], '', position)
+        self.affiches = nb
+        
+        self._afficher_selection()
+        self._mettre_a_jour_scrollbar()
+    
+    def _afficher_selection(self):
+        position = None if self.selection is None else self.selection - self.premier
+        if position is not None and 0 <= position < self.affiches:
+            item = self.items[position]
+            if self.tree.selection() != (item,):
+                self.tree.selection_set(item)
+            self.tree.focus(item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+    
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            self.selection = self.premier + self.items.index(selection[0])
+    
+    def _mettre_a_jour_scrollbar(self):
+        if self.total <= self.visibles:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.premier / self.total, (self.premier + self.visibles) / self.total)
+    
+    def _on_configure(self, event):
+        self._hauteur = event.height
+        self._adapter()
+    
+    def _adapter(self):
+        """Adapter le nombre d'items à la hauteur du widget"""
+        bbox = self.tree.bbox(self.items[0]) if self.affiches and self._hauteur else ''
+        if not bbox:
+            return
+        _, haut, _, hauteur_ligne = bbox
+        visibles = max(1, (self._hauteur - haut) // hauteur_ligne)
+        if visibles == self.visibles:
+            return
+        
+        if visibles > self.visibles:
+            for _ in range(visibles - self.visibles):
+                item = self.tree.insert('', 'end')
+                self.tree.detach(item)
+                self.items.append(item)
+        else:
+            self.tree.delete(*self.items[visibles:])
+            del self.items[visibles:]
+            self.affiches = min(self.affiches, visibles)
+        
+        self.premier = max(0, min(self.premier, self.total - self.visibles))
+        self._afficher()
+        self._charger_si_besoin()
+    
+    # ---- Pages ----
+    
+    def _charger_si_besoin(self):
+        """Demander la page suivante si la fenêtre affichée approche de la fin des lignes lues"""
+        besoin = min(self.total, self.premier + self.visibles + int(self.page_size * self.ANTICIPATION))
+        if self._complet or self._en_chargement or len(self.lignes) >= besoin:
+            return
+        
+        self._en_chargement = True
+        generation = self._generation
+        apres = self.cle(self.lignes[-1]) if self.lignes else None
+        self.charger_page(
+            apres, self.page_size,
+            lambda lignes: self._page_recue(generation, lignes),
+            lambda erreur: self._page_echouee(generation)
+        )
+    
+    def _page_recue(self, generation, lignes):
+        if generation != self._generation:
+            return
+        self._en_chargement = False
+        self.lignes.extend(lignes)
+        if len(lignes) < self.page_size:
+            self._complet = True
+        self._ajuster_total()
+        self._afficher()
+        # Saut de la barre de défilement loin des lignes lues : pages suivantes
+        self._charger_si_besoin()
+    
+    def _page_echouee(self, generation):
+        if generation == self._generation:
+            # Pas de nouvel essai automatique : le prochain défilement relancera la lecture
+            self._en_chargement = False
+    
+    def _ajuster_total(self):
+        """Aligner le total sur les lignes lues (jours ajoutés ou supprimés depuis le comptage)"""
+        if self._complet:
+            self.total = len(self.lignes)
+        else:
+            self.total = max(self.total, len(self.lignes) + 1)